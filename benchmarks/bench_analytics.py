@@ -0,0 +1,86 @@
+"""
+bench_analytics.py
+------------------
+Benchmark the vectorized analytics module against per-movie reporting.
+A set of showings is filled to random levels; the benchmark then computes fill ratio and stranded
+single seats for every showing, once movie by movie with movie_available_seats and count_stranded_seats,
+and once by stacking all showings with OccupancyStack and running the vectorized reports.
+Throughput is reported in showings per second.
+
+Requires NumPy. Run from the project root:
+
+    python -m benchmarks.bench_analytics [--showings 2000] [--rows 10] [--seats 20]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from src.analytics import (
+    OccupancyStack, fill_ratio, row_fill, stranded_singles, centrality_weighted_occupancy, revenue_summary,
+)
+from src.booking_advanced import count_stranded_seats
+from src.movie import movie_available_seats
+from src.movie_classes import Movie, Booking
+
+def make_showings(count, rows, seats_per_row, seed=0):
+    """Return showings with random seats booked (or reserved), filled to between 0% and 100%."""
+    rng = random.Random(seed)
+    labels = [f"{chr(ord('A') + r)}{n}" for r in range(rows) for n in range(1, seats_per_row + 1)]
+    showings = []
+    for i in range(count):
+        movie = Movie(f"Showing {i}", rows, seats_per_row)
+        taken = rng.sample(labels, rng.randint(0, len(labels)))
+        half = len(taken) // 2
+        movie.add_booking(Booking("GIC0001", "B", taken[:half]))
+        movie.add_booking(Booking("GIC0002", "R", taken[half:]))
+        showings.append(movie)
+    return showings
+
+def per_movie_report(showings):
+    """Fill ratio and stranded seats, one movie at a time."""
+    return [
+        (1 - movie_available_seats(m) / m.layout.capacity, count_stranded_seats(m))
+        for m in showings
+    ]
+
+def vectorized_report(showings):
+    """Fill ratio, stranded seats and the other reports for all showings at once."""
+    stack = OccupancyStack.from_movies(showings)
+    report = (fill_ratio(stack), stranded_singles(stack))
+    row_fill(stack)
+    centrality_weighted_occupancy(stack)
+    revenue_summary(stack, {"standard": 10.0})
+    return report
+
+def best_of(func, showings, repeat):
+    """Return the best wall-clock time of repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(showings)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--showings", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    # Per-call INFO logging would dominate the timings and flood the log file
+    logging.disable(logging.INFO)
+    showings = make_showings(args.showings, args.rows, args.seats)
+    for m in showings:
+        m.occupancy  # build the live indexes up front so both paths start warm
+    print(f"{args.showings} showings of {args.rows}x{args.seats}")
+    print(f"{'method':<12} {'seconds':>9} {'showings/s':>12}")
+    for name, func in (("per-movie", per_movie_report), ("vectorized", vectorized_report)):
+        seconds = best_of(func, showings, args.repeat)
+        print(f"{name:<12} {seconds:>9.4f} {args.showings / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+bench_centrality.py
+-------------------
+Compare the pure-Python and NumPy centrality engines.
+For several row widths, a random free-seat mask is ranked seat by seat (rank_seats) and searched for the
+most central block of each group size (best_block_start) with both engines; the benchmark reports
+microseconds per call and checks that both engines agree.
+
+Requires NumPy. Run from the project root:
+
+    python -m benchmarks.bench_centrality [--widths 10 26 50 200 1000] [--calls 2000]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from src.centrality import rank_seats, best_block_start
+from src.occupancy import block_starts
+
+def time_engine(engine, rows, width, calls):
+    """Return (us per rank_seats call, us per best_block_start call) for one engine."""
+    start = time.perf_counter()
+    for i in range(calls):
+        nums = rows[i % len(rows)][0]
+        rank_seats(nums, width, engine=engine)
+    rank_us = (time.perf_counter() - start) / calls * 1e6
+    start = time.perf_counter()
+    for i in range(calls):
+        starts = rows[i % len(rows)][1]
+        best_block_start(starts, width, 4, engine=engine)
+    block_us = (time.perf_counter() - start) / calls * 1e6
+    return rank_us, block_us
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--widths", type=int, nargs="+", default=[10, 26, 50, 200, 1000])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    rng = random.Random(0)
+    print(f"{'width':>6} {'engine':<8} {'rank us':>9} {'block us':>9}")
+    for width in args.widths:
+        rows = []
+        for _ in range(50):
+            free = rng.getrandbits(width) | rng.getrandbits(width)  # about 75% free
+            nums = [n for n in range(1, width + 1) if free >> (n - 1) & 1]
+            rows.append((nums, block_starts(free, 4)))
+        for nums, starts in rows:
+            assert rank_seats(nums, width, engine="numpy") == rank_seats(nums, width, engine="python")
+            assert best_block_start(starts, width, 4, engine="numpy") == best_block_start(starts, width, 4, engine="python")
+        for engine in ("python", "numpy"):
+            rank_us, block_us = time_engine(engine, rows, width, args.calls)
+            print(f"{width:>6} {engine:<8} {rank_us:>9.1f} {block_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+bench_fragmentation.py
+----------------------
+Benchmark the greedy advanced allocator against the fragmentation-aware optimiser.
+Both strategies seat the same random stream of groups (a busy evening) into an empty hall and every
+allocation is confirmed as booked. For each strategy the benchmark reports allocation latency,
+the number of seats stranded as isolated singles, and how many groups had to be split.
+
+Run from the project root:
+
+    python -m benchmarks.bench_fragmentation [--rows 10] [--seats 20] [--runs 20]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from src.booking_advanced import default_seating_advanced, default_seating_optimised, count_stranded_seats
+from src.movie_classes import Movie, Booking
+
+STRATEGIES = {
+    "greedy": default_seating_advanced,
+    "optimised": default_seating_optimised,
+}
+
+def group_stream(seed, capacity):
+    """Return a list of party sizes (1-6, weighted towards couples) that fits within capacity."""
+    rng = random.Random(seed)
+    sizes = []
+    total = 0
+    while True:
+        size = rng.choices([1, 2, 3, 4, 5, 6], weights=[10, 35, 15, 20, 10, 10])[0]
+        if total + size > capacity:
+            return sizes
+        sizes.append(size)
+        total += size
+
+def run_evening(allocate, rows, seats_per_row, sizes):
+    """Seat every group with the given allocator; return (latencies, stranded seats, split groups)."""
+    movie = Movie("Benchmark", rows, seats_per_row)
+    latencies = []
+    split = 0
+    for n, size in enumerate(sizes, start=1):
+        start = time.perf_counter()
+        seats = allocate(movie, size)
+        latencies.append(time.perf_counter() - start)
+        if len({s[0] for s in seats}) > 1 or len(seats) < size:
+            split += 1
+        movie.add_booking(Booking(f"GIC{n:04d}", "B", seats))
+    return latencies, count_stranded_seats(movie), split
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--fill", type=float, default=0.9, help="fraction of the hall requested per evening")
+    args = parser.parse_args()
+    # Per-call INFO logging would dominate the timings and flood the log file
+    logging.disable(logging.INFO)
+    capacity = int(args.rows * args.seats * args.fill)
+    print(f"Hall {args.rows}x{args.seats}, {args.runs} evenings filled to {args.fill:.0%}")
+    print(f"{'strategy':<10} {'mean us/alloc':>14} {'p95 us/alloc':>13} {'stranded':>9} {'split':>6}")
+    for name, allocate in STRATEGIES.items():
+        latencies = []
+        stranded = 0
+        split = 0
+        for seed in range(args.runs):
+            sizes = group_stream(seed, capacity)
+            run_latencies, run_stranded, run_split = run_evening(allocate, args.rows, args.seats, sizes)
+            latencies.extend(run_latencies)
+            stranded += run_stranded
+            split += run_split
+        latencies.sort()
+        mean_us = sum(latencies) / len(latencies) * 1e6
+        p95_us = latencies[int(len(latencies) * 0.95)] * 1e6
+        print(f"{name:<10} {mean_us:>14.1f} {p95_us:>13.1f} {stranded / args.runs:>9.1f} {split / args.runs:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_persistence.py
+--------------------
+Benchmark crash-safe movie saves with and without group commit.
+A burst of bookings is saved one by one to a snapshot file in a temporary directory: once with every save
+written atomically and fsynced before it returns, and once through the group commit writer, whose background
+thread commits the latest state once per window. The group commit time includes the final flush.
+Throughput is reported in saves per second.
+
+Run from the project root:
+
+    python -m benchmarks.bench_persistence [--saves 200] [--window-ms 5]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from src import persistence
+from src.movie import save_movie
+from src.movie_classes import Movie, Booking
+
+def make_burst(count, rows=26, seats_per_row=50):
+    """Return a movie and the bookings to add to it, one per save."""
+    labels = [f"{chr(ord('A') + r)}{n}" for r in range(rows) for n in range(1, seats_per_row + 1)]
+    bookings = [Booking(f"GIC{i + 1:04d}", "B", [labels[i % len(labels)]]) for i in range(count)]
+    return Movie("Benchmark", rows, seats_per_row), bookings
+
+def run_burst(path, count):
+    """Save a movie after each of count bookings, then flush; return the wall-clock time."""
+    movie, bookings = make_burst(count)
+    start = time.perf_counter()
+    for booking in bookings:
+        movie.add_booking(booking)
+        save_movie(movie, path)
+    persistence.flush()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    # Per-call INFO logging would dominate the timings and flood the log file
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "movie.gics")
+        print(f"{args.saves} saves of a 26x50 hall")
+        print(f"{'method':<14} {'seconds':>9} {'saves/s':>10}")
+        seconds = run_burst(path, args.saves)
+        print(f"{'fsync each':<14} {seconds:>9.4f} {args.saves / seconds:>10.0f}")
+        persistence.enable_group_commit(args.window_ms / 1000)
+        try:
+            seconds = run_burst(path, args.saves)
+        finally:
+            persistence.disable_group_commit()
+        print(f"{'group commit':<14} {seconds:>9.4f} {args.saves / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+bench_shared_occupancy.py
+-------------------------
+Benchmark sharing seat state between worker processes: pickling vs the shared memory occupancy store.
+A coordinator books one seat at a time in a half-full hall and a worker process must see each change:
+- pickle: the coordinator pickles the Movie and sends it over a pipe; the worker unpickles it and reports the
+  free seats.
+- shared: the coordinator commits the seat with try_take and sends the new version over the same pipe; the
+  worker reads the free seats (counts) or the whole bitmaps (read_masks) from the store in place.
+Both paths pay the same pipe round trip; the difference is the cost of moving the state. The cost of a
+worker reading the state in-process is also reported, in microseconds per read.
+
+Run from the project root:
+
+    python -m benchmarks.bench_shared_occupancy [--updates 500] [--rows 26] [--seats 50]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import pickle
+import time
+
+from src.movie import movie_available_seats
+from src.movie_classes import Movie, Booking
+from src.shared_occupancy import SharedOccupancyStore
+
+def make_movie(rows, seats_per_row):
+    """Return a movie with every other row booked by four-seat bookings, and the free seat labels."""
+    movie = Movie("Benchmark", rows, seats_per_row)
+    free = []
+    for r in range(rows):
+        labels = [f"{chr(ord('A') + r)}{n}" for n in range(1, seats_per_row + 1)]
+        if r % 2:
+            free.extend(labels)
+            continue
+        for i in range(0, seats_per_row, 4):
+            movie.add_booking(Booking(f"GIC{len(movie.bookings) + 1:04d}", "B", labels[i:i + 4]))
+    return movie, free
+
+def pickle_worker(conn):
+    """Worker: unpickle each movie received and reply with its free seats."""
+    logging.disable(logging.INFO)
+    while True:
+        data = conn.recv()
+        if data is None:
+            return
+        conn.send(movie_available_seats(pickle.loads(data)))
+
+def shared_worker(conn, store, full):
+    """Worker: on each version received, read the slot and reply with its free seats."""
+    logging.disable(logging.INFO)
+    while True:
+        version = conn.recv()
+        if version is None:
+            return
+        if full:
+            store.read_masks(0)
+        conn.send(store.counts(0)["free"])
+
+def round_trips(target, args, seats, commit):
+    """Run a worker, commit each seat and wait for the worker's reply; return the seconds per update."""
+    parent, child = multiprocessing.Pipe()
+    worker = multiprocessing.Process(target=target, args=(child,) + args)
+    worker.start()
+    start = time.perf_counter()
+    for seat in seats:
+        parent.send(commit(seat))
+        parent.recv()
+    elapsed = time.perf_counter() - start
+    parent.send(None)
+    worker.join()
+    return elapsed / len(seats)
+
+def best_of(func, arg, repeat):
+    """Return the best wall-clock time of repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=26)
+    parser.add_argument("--seats", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    # Per-call INFO logging would dominate the timings and flood the log file
+    logging.disable(logging.INFO)
+    movie, free = make_movie(args.rows, args.seats)
+    seats = free[:args.updates]
+    store = SharedOccupancyStore.create(1, args.rows, args.seats)
+    try:
+        print(f"{args.rows}x{args.seats} hall, {len(movie.bookings)} bookings, {len(seats)} updates")
+        print(f"{'method':<22} {'us/update':>10}")
+
+        def book_and_pickle(seat):
+            movie.add_booking(Booking(f"GIC{len(movie.bookings) + 1:04d}", "B", [seat]))
+            return pickle.dumps(movie)
+        pickled = round_trips(pickle_worker, (), seats, book_and_pickle)
+        print(f"{'pickle':<22} {pickled * 1e6:>10.1f}")
+
+        for full in (False, True):
+            fresh, _ = make_movie(args.rows, args.seats)
+            store.publish(0, fresh)
+            shared = round_trips(shared_worker, (store, full), seats, lambda seat: store.try_take(0, [seat]))
+            name = "shared (read_masks)" if full else "shared (counts)"
+            print(f"{name:<22} {shared * 1e6:>10.1f}")
+
+        data = pickle.dumps(movie)
+        print(f"\nstate read in-process: pickle.loads {best_of(pickle.loads, data, args.repeat) * 1e6:.1f} us, "
+              f"read_masks {best_of(store.read_masks, 0, args.repeat) * 1e6:.1f} us, "
+              f"counts {best_of(store.counts, 0, args.repeat) * 1e6:.1f} us "
+              f"({len(data)} pickled bytes)")
+    finally:
+        store.close()
+        store.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+bench_snapshot.py
+-----------------
+Benchmark the binary snapshot format against the JSON persistence path.
+A hall is filled with small bookings to the given level; the benchmark then encodes and decodes it, once as
+JSON (json.dumps(movie.to_dict()) / Movie.from_dict(json.loads(...))) and once as a snapshot
+(encode_snapshot / decode_snapshot), and reads its occupancy from the snapshot bitmaps alone.
+Times are reported in milliseconds per call, sizes in bytes.
+
+Run from the project root:
+
+    python -m benchmarks.bench_snapshot [--rows 26] [--seats 50] [--fill 1.0]
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from src.movie_classes import Movie, Booking
+from src.snapshot import encode_snapshot, decode_snapshot, read_occupancy
+
+def make_movie(rows, seats_per_row, fill, seed=0):
+    """Return a movie with bookings of 1 to 6 seats covering the given share of the hall, mostly booked."""
+    rng = random.Random(seed)
+    labels = [f"{chr(ord('A') + r)}{n}" for r in range(rows) for n in range(1, seats_per_row + 1)]
+    taken = rng.sample(labels, int(len(labels) * fill))
+    movie = Movie("Benchmark", rows, seats_per_row)
+    pos = 0
+    while pos < len(taken):
+        size = rng.randint(1, 6)
+        movie.add_booking(Booking(f"GIC{len(movie.bookings) + 1:04d}", rng.choice("BBBR"), taken[pos:pos + size]))
+        pos += size
+    return movie
+
+def best_of(func, arg, repeat):
+    """Return the best wall-clock time of repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--rows", type=int, default=26)
+    parser.add_argument("--seats", type=int, default=50)
+    parser.add_argument("--fill", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    # Per-call INFO logging would dominate the timings and flood the log file
+    logging.disable(logging.INFO)
+    movie = make_movie(args.rows, args.seats, args.fill)
+    movie.occupancy  # build the live index up front so both paths start warm
+    text = json.dumps(movie.to_dict())
+    data = encode_snapshot(movie)
+    print(f"{args.rows}x{args.seats} hall, {len(movie.bookings)} bookings")
+    print(f"{'format':<10} {'bytes':>8} {'encode ms':>10} {'decode ms':>10}")
+    json_encode = best_of(lambda m: json.dumps(m.to_dict()), movie, args.repeat)
+    json_decode = best_of(lambda t: Movie.from_dict(json.loads(t)), text, args.repeat)
+    print(f"{'json':<10} {len(text.encode()):>8} {json_encode * 1000:>10.3f} {json_decode * 1000:>10.3f}")
+    snap_encode = best_of(encode_snapshot, movie, args.repeat)
+    snap_decode = best_of(decode_snapshot, data, args.repeat)
+    print(f"{'snapshot':<10} {len(data):>8} {snap_encode * 1000:>10.3f} {snap_decode * 1000:>10.3f}")
+    print(f"occupancy only (read_occupancy): {best_of(read_occupancy, data, args.repeat) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
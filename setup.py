@@ -19,4 +19,8 @@ setup(
     install_requires=[
         # List your project dependencies here
     ],
+    extras_require={
+        # Vectorized reports in src.analytics
+        'analytics': ['numpy>=1.17'],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+analytics.py
+------------
+This module provides occupancy reports over many showings at once, for operations dashboards.
+The bitmask occupancy of every showing is unpacked into stacked NumPy boolean arrays of shape
+(showings, rows, seats), padded to the largest hall, so fill ratios, heatmaps, stranded seats and
+revenue are computed with a few vectorized operations instead of one Python loop per movie.
+
+NumPy is an optional dependency of this module only (pip install numpy); the booking system does not need it.
+"""
+
+from src.logger import log_info
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+
+def _require_numpy():
+    """Raise an ImportError with an install hint if NumPy is missing."""
+    if np is None:
+        raise ImportError("src.analytics requires NumPy: pip install numpy")
+
+def _unpack_rows(masks, width):
+    """
+    Unpack row bitmasks into a boolean array, bit n-1 of each mask becoming column n-1.
+    Args:
+        masks (list): Row bitmasks (non-negative ints, any size).
+        width (int): Number of columns to keep.
+    Returns:
+        numpy.ndarray: Boolean array of shape (len(masks), width).
+    """
+    nbytes = max(1, (width + 7) // 8)
+    buffer = b"".join(m.to_bytes(nbytes, "little") for m in masks)
+    bits = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8), bitorder="little")
+    return bits.reshape(len(masks), nbytes * 8)[:, :width].astype(bool)
+
+def centrality_weights(seats_per_row, width=None):
+    """
+    Weight of each seat position by centrality: 1 for the central seat(s), falling as 1 / (1 + distance).
+    Distances follow the booking centrality rule, so both middle seats of an even row weigh 1.
+    Args:
+        seats_per_row (int): Number of seats in the row.
+        width (int, optional): Length of the returned array (padding positions weigh 0). Defaults to seats_per_row.
+    Returns:
+        numpy.ndarray: Float array of per-seat weights.
+    """
+    _require_numpy()
+    nums = np.arange(1, seats_per_row + 1)
+    if seats_per_row % 2 == 0:
+        dist = np.abs(nums - (seats_per_row / 2 + 0.5))
+        dist[(nums == seats_per_row // 2) | (nums == seats_per_row // 2 + 1)] = 0
+    else:
+        dist = np.abs(nums - (seats_per_row + 1) // 2).astype(float)
+    weights = np.zeros(width or seats_per_row)
+    weights[:seats_per_row] = 1.0 / (1.0 + dist)
+    return weights
+
+
+class OccupancyStack:
+    """
+    Occupancy of many showings stacked into NumPy arrays of shape (showings, rows, seats).
+    Attributes:
+        showing_ids (list): Showing identifiers, in stack order.
+        booked (numpy.ndarray): True where a seat is booked ('B').
+        reserved (numpy.ndarray): True where a seat is reserved ('R').
+        seats (numpy.ndarray): True where a seat exists in the showing's hall layout (False for padding).
+        links (numpy.ndarray): True at column n-1 where seats n and n+1 are side by side.
+        weights (numpy.ndarray): Centrality weight of each seat position (0 where no seat exists).
+        category_codes (numpy.ndarray): Index into category_names of each seat's category, -1 where no seat exists.
+        category_names (list): Seat category names.
+    """
+    def __init__(self, showing_ids, booked, reserved, seats, links, weights, category_codes, category_names):
+        """
+        Initialize an OccupancyStack from prepared arrays; use from_movies to build one.
+        """
+        self.showing_ids = showing_ids
+        self.booked = booked
+        self.reserved = reserved
+        self.seats = seats
+        self.links = links
+        self.weights = weights
+        self.category_codes = category_codes
+        self.category_names = category_names
+
+    @classmethod
+    def from_movies(cls, movies, showing_ids=None):
+        """
+        Stack the occupancy of many showings.
+        Layout-derived arrays are built once per distinct (shared) hall layout.
+        Args:
+            movies (list): Movie instances.
+            showing_ids (list, optional): Identifier of each movie. Defaults to the positions 0..n-1.
+        Returns:
+            OccupancyStack: The stacked occupancy.
+        """
+        _require_numpy()
+        movies = list(movies)
+        showing_ids = list(showing_ids) if showing_ids is not None else list(range(len(movies)))
+        log_info(f"Stacking occupancy of {len(movies)} showings.")
+        rows = max((m.row for m in movies), default=0)
+        width = max((m.seats_per_row for m in movies), default=0)
+        booked_masks = []
+        reserved_masks = []
+        padding = [0] * rows
+        layout_arrays = {}
+        category_names = []
+        seats, links, weights, codes = [], [], [], []
+        for movie in movies:
+            occupancy = movie.occupancy
+            booked_masks.extend(occupancy.booked + padding[movie.row:])
+            reserved_masks.extend(occupancy.reserved + padding[movie.row:])
+            layout = movie.layout
+            arrays = layout_arrays.get(id(layout))
+            if arrays is None:
+                arrays = cls._layout_arrays(layout, rows, width, category_names)
+                layout_arrays[id(layout)] = arrays
+            seats.append(arrays[0])
+            links.append(arrays[1])
+            weights.append(arrays[2])
+            codes.append(arrays[3])
+        shape = (len(movies), rows, width)
+        booked = _unpack_rows(booked_masks, width).reshape(shape)
+        reserved = _unpack_rows(reserved_masks, width).reshape(shape)
+        if not movies:
+            empty = np.zeros(shape, dtype=bool)
+            return cls(showing_ids, booked, reserved, empty, empty, np.zeros(shape), np.full(shape, -1), category_names)
+        return cls(showing_ids, booked, reserved, np.stack(seats), np.stack(links), np.stack(weights),
+                   np.stack(codes), category_names)
+
+    @staticmethod
+    def _layout_arrays(layout, rows, width, category_names):
+        """Return (seats, links, weights, category codes) arrays of one layout, padded to rows x width."""
+        padding = [0] * (rows - layout.rows)
+        seats = _unpack_rows(list(layout.seat_masks) + padding, width)
+        links = _unpack_rows(list(layout.link_masks) + padding, width)
+        weights = np.where(seats, centrality_weights(layout.seats_per_row, width), 0.0)
+        codes = np.full((rows, width), -1)
+        for name, masks in layout.category_masks.items():
+            if name not in category_names:
+                category_names.append(name)
+            codes[_unpack_rows(list(masks) + padding, width)] = category_names.index(name)
+        return seats, links, weights, codes
+
+    def __len__(self):
+        return len(self.showing_ids)
+
+    @property
+    def taken(self):
+        """numpy.ndarray: True where a seat is booked or reserved."""
+        return self.booked | self.reserved
+
+
+def fill_ratio(stack):
+    """
+    Fraction of each showing's seats that are booked or reserved (as counted by movie_available_seats).
+    Args:
+        stack (OccupancyStack): The stacked showings.
+    Returns:
+        numpy.ndarray: Float array of shape (showings,).
+    """
+    capacity = stack.seats.sum(axis=(1, 2))
+    taken = (stack.taken & stack.seats).sum(axis=(1, 2))
+    return np.divide(taken, capacity, out=np.zeros(len(stack)), where=capacity > 0)
+
+def row_fill(stack):
+    """
+    Fraction of the seats of each row that are booked or reserved, per showing.
+    Args:
+        stack (OccupancyStack): The stacked showings.
+    Returns:
+        numpy.ndarray: Float array of shape (showings, rows); rows without seats are 0.
+    """
+    capacity = stack.seats.sum(axis=2)
+    taken = (stack.taken & stack.seats).sum(axis=2)
+    return np.divide(taken, capacity, out=np.zeros(capacity.shape), where=capacity > 0)
+
+def seat_heatmap(stack):
+    """
+    How often each seat position is booked or reserved across showings.
+    Args:
+        stack (OccupancyStack): The stacked showings.
+    Returns:
+        numpy.ndarray: Float array of shape (rows, seats): the fraction of showings having that seat
+            in which it is taken (0 where no showing has the seat).
+    """
+    present = stack.seats.sum(axis=0)
+    taken = (stack.taken & stack.seats).sum(axis=0)
+    return np.divide(taken, present, out=np.zeros(present.shape), where=present > 0)
+
+def stranded_singles(stack):
+    """
+    Count free seats with no free neighbour they are side by side with, per showing.
+    Like count_stranded_seats, only booked seats count as taken.
+    Args:
+        stack (OccupancyStack): The stacked showings.
+    Returns:
+        numpy.ndarray: Int array of shape (showings,).
+    """
+    free = stack.seats & ~stack.booked
+    # pair[..., c] is True when seats c+1 and c+2 are both free and adjacent
+    pair = free[..., :-1] & free[..., 1:] & stack.links[..., :-1]
+    has_pair = np.zeros(free.shape, dtype=bool)
+    has_pair[..., :-1] |= pair
+    has_pair[..., 1:] |= pair
+    return (free & ~has_pair).sum(axis=(1, 2))
+
+def centrality_weighted_occupancy(stack):
+    """
+    Occupancy weighted by seat centrality, so filling the middle of the hall counts more than the edges.
+    Args:
+        stack (OccupancyStack): The stacked showings.
+    Returns:
+        numpy.ndarray: Float array of shape (showings,), 0 (empty) to 1 (full).
+    """
+    total = stack.weights.sum(axis=(1, 2))
+    taken = (stack.weights * stack.taken).sum(axis=(1, 2))
+    return np.divide(taken, total, out=np.zeros(len(stack)), where=total > 0)
+
+def revenue_summary(stack, prices, default_price=0.0):
+    """
+    Revenue per showing from seat prices by category.
+    Args:
+        stack (OccupancyStack): The stacked showings.
+        prices (dict): Seat category -> ticket price, e.g. {'standard': 12.0, 'premium': 18.0}.
+        default_price (float): Price of seats in categories missing from prices.
+    Returns:
+        dict: 'booked', 'reserved' and 'potential' (full house) revenue, each a float array of shape (showings,).
+    """
+    # The extra trailing 0 is picked by code -1 (no seat)
+    lookup = np.array([prices.get(name, default_price) for name in stack.category_names] + [0.0])
+    price_grid = lookup[stack.category_codes]
+    return {
+        "booked": (price_grid * stack.booked).sum(axis=(1, 2)),
+        "reserved": (price_grid * (stack.reserved & ~stack.booked)).sum(axis=(1, 2)),
+        "potential": price_grid.sum(axis=(1, 2)),
+    }
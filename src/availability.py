@@ -0,0 +1,129 @@
+"""
+availability.py
+---------------
+This module provides a search index of seat availability across many showings.
+For every showing it keeps the number of free seats and the largest block of adjacent free seats in
+each row, so questions like "which showings still have 5 seats together in rows C-F?" are answered from
+these small summaries without loading or scanning any per-seat data. Tracked showings update their
+summary on every booking change, recomputing only the rows that changed.
+"""
+
+from src.logger import log_info, log_warning
+
+
+def summarise_availability(movie):
+    """
+    Build the availability summary of a showing from its occupancy index.
+    Reserved seats count as taken, since they are held for another customer.
+    Args:
+        movie (Movie): The Movie instance.
+    Returns:
+        dict: {'free': free seat count, 'blocks': largest free block per row, index 0 is row A}.
+    """
+    layout = movie.layout
+    occupied = movie.occupancy.occupied_masks(include_reserved=True)
+    return {
+        "free": movie.occupancy.available(),
+        "blocks": [layout.longest_run(i, ~mask) for i, mask in enumerate(occupied)],
+    }
+
+
+class AvailabilityIndex:
+    """
+    Per-showing free-seat counts and largest contiguous block per row.
+    Attributes:
+        summaries (dict): Showing ID -> {'free': int, 'blocks': list of int}.
+    """
+    def __init__(self):
+        """
+        Initialize an empty AvailabilityIndex.
+        """
+        self.summaries = {}
+        self._best = {}
+        self._tracked = {}
+
+    def update(self, showing_id, summary):
+        """
+        Store the summary of a showing, e.g. one read back from storage.
+        Args:
+            showing_id (str): The showing identifier.
+            summary (dict): Dict with keys 'free' and 'blocks' as returned by summarise_availability.
+        """
+        self.summaries[showing_id] = {"free": summary["free"], "blocks": list(summary["blocks"])}
+        self._best[showing_id] = max(summary["blocks"], default=0)
+
+    def track(self, showing_id, movie):
+        """
+        Summarise a loaded showing and keep its summary current as its bookings change.
+        Args:
+            showing_id (str): The showing identifier.
+            movie (Movie): The Movie instance of the showing.
+        """
+        self.untrack(showing_id)
+        self.update(showing_id, summarise_availability(movie))
+
+        def listener(changed, rows):
+            self._refresh(showing_id, changed, rows)
+
+        movie.subscribe(listener)
+        self._tracked[showing_id] = (movie, listener)
+
+    def untrack(self, showing_id):
+        """
+        Stop following a showing's bookings. Its last summary stays searchable.
+        Args:
+            showing_id (str): The showing identifier.
+        """
+        tracked = self._tracked.pop(showing_id, None)
+        if tracked is not None:
+            movie, listener = tracked
+            movie.unsubscribe(listener)
+
+    def remove(self, showing_id):
+        """
+        Drop a showing from the index.
+        Args:
+            showing_id (str): The showing identifier.
+        """
+        self.untrack(showing_id)
+        self.summaries.pop(showing_id, None)
+        self._best.pop(showing_id, None)
+
+    def _refresh(self, showing_id, movie, rows):
+        """Recompute the free count and the blocks of the changed rows (all rows if rows is None)."""
+        summary = self.summaries[showing_id]
+        occupancy = movie.occupancy
+        layout = movie.layout
+        blocks = summary["blocks"]
+        if rows is None:
+            rows = range(len(blocks))
+        for i in rows:
+            if 0 <= i < len(blocks):
+                blocks[i] = layout.longest_run(i, ~(occupancy.booked[i] | occupancy.reserved[i]))
+        summary["free"] = occupancy.available()
+        self._best[showing_id] = max(blocks, default=0)
+
+    def find(self, num_seats, first_row=None, last_row=None):
+        """
+        Find showings that can seat a group side by side.
+        Args:
+            num_seats (int): Number of adjacent seats needed.
+            first_row (str, optional): First acceptable row letter (e.g. 'C'). Defaults to row A.
+            last_row (str, optional): Last acceptable row letter. Defaults to the last row.
+        Returns:
+            list: Showing IDs with a free block of at least num_seats seats in the row range, in index order.
+        """
+        if num_seats <= 0:
+            log_warning(f"Invalid availability search for {num_seats} seats.")
+            return []
+        log_info(f"Searching {len(self.summaries)} showings for {num_seats} adjacent seats in rows {first_row or 'A'}-{last_row or 'end'}.")
+        start = ord(first_row.upper()) - ord('A') if first_row else 0
+        end = ord(last_row.upper()) - ord('A') + 1 if last_row else None
+        whole_hall = start == 0 and end is None
+        matches = []
+        for showing_id, summary in self.summaries.items():
+            if self._best[showing_id] < num_seats or summary["free"] < num_seats:
+                continue
+            if whole_hall or max(summary["blocks"][start:end], default=0) >= num_seats:
+                matches.append(showing_id)
+        return matches
@@ -1,5 +1,3 @@
-
-
 """
 booking.py
 ==========
@@ -8,12 +6,25 @@ The two main approaches to seating are default_seating (best available) and cust
 """
 
 
-from src.logger import log_info, log_warning, log_error
+from src.logger import log_info, log_warning, log_error, log_event
 import string
+import time
 from src.movie import save_movie, movie_display
-from src.validation import is_valid_seat
+from src.validation import is_valid_seat, parse_seat_selection
 from src.movie_classes import Movie, Booking
+from src.metrics import increment, timed
+from src.tracing import traced
+from src.occupancy import mask_to_seat_nums
+from src.booking_ids import get_allocator
+from src.centrality import rank_seats
+from src.idempotency import default_cache, request_fingerprint
+from src.journal import BookingJournal
 
+# Status of a cancelled booking, kept on record so its ID is not reused
+CANCELLED = "C"
+
+@traced("booking.book_ticket")
+@timed("booking.book_ticket")
 def book_ticket(movie: Movie, num_tickets):
     """
     Adds a new Booking object to the Movie's bookings list.
@@ -37,13 +48,14 @@ def book_ticket(movie: Movie, num_tickets):
     log_info("Initial booking saved to movie file.")
     while True:
         print(f"\nBooking ID: {booking_id}")
-        print(movie_display(movie.to_dict()))
+        print(movie_display(movie))
         seating_input = input("\nEnter blank to accept seat selection, or enter new seating position:\n> ")
         status = is_valid_seat(movie, seating_input)
         if status == "blank":
-            log_info(f"Booking {booking_id} confirmed by user.")
             confirm_reservation(movie, booking_id)
             save_movie(movie.to_dict())
+            increment("bookings.confirmed")
+            log_event("booking.confirmed", booking_id=booking_id, movie=movie.title, seats=booking.seats, mode="standard")
             log_info(f"Booking {booking_id} status set to 'B' and saved.")
             print(f"\nBooking ID: {booking_id} confirmed.\n")
             break
@@ -55,30 +67,50 @@ def book_ticket(movie: Movie, num_tickets):
                 b.seats = assigned_seats
             save_movie(movie.to_dict())
             log_info(f"Booking {booking_id} updated with custom seats and saved.")
+        elif status == "selection":
+            if not apply_seat_selection(movie, booking_id, num_tickets, seating_input):
+                print(f"Please select exactly {num_tickets} seats. Please try again or enter blank to accept.")
+                continue
+            save_movie(movie.to_dict())
+            log_info(f"Booking {booking_id} updated with selected seats and saved.")
         else:
             log_warning(f"Invalid seat input '{seating_input.strip()}'; prompt user again.")
             print(f"Seat {seating_input.strip()} is not valid. Please try again or enter blank to accept.")
     return movie
 
+def apply_seat_selection(movie: Movie, booking_id, num_tickets, seating_input):
+    """
+    Assign an individually selected set of seats (e.g. 'A1-A4,C7') to a booking.
+    The input must already have been validated by is_valid_seat; this only checks the seat count.
+    Args:
+        movie (Movie): The Movie instance containing the booking.
+        booking_id (str): The booking ID to update.
+        num_tickets (int): Number of tickets in the booking.
+        seating_input (str): The seat selection input.
+    Returns:
+        list or None: The assigned seat labels, or None if the selection has the wrong number of seats.
+    """
+    seats = parse_seat_selection(seating_input, movie.seats_per_row, num_tickets)
+    if seats is None or len(seats) != num_tickets:
+        log_warning(f"Seat selection '{seating_input.strip()}' does not contain exactly {num_tickets} seats.")
+        return None
+    b = movie.get_booking(booking_id)
+    if b:
+        b.seats = seats
+    log_info(f"Seat selection '{seating_input.strip().upper()}' accepted. Seats assigned: {seats}")
+    return seats
+
 def get_booking_id(movie: Movie):
     """
-    Calculate the next available booking ID for a Movie instance.
-    Booking IDs are in the format 'GIC0001', 'GIC0002', etc.
+    Return the next booking ID for a Movie instance from the configured allocator.
+    By default IDs are in the format 'GIC0001', 'GIC0002', etc., continuing from the highest existing one.
     Args:
-        movie (Movie): The Movie instance to check existing bookings.
+        movie (Movie): The Movie instance to book into.
     Returns:
         str: The next booking ID string.
     """
     log_info("Calculating next booking ID.")
-    max_id = 0
-    for booking in movie.bookings:
-        bid = booking.id
-        if bid.startswith("GIC") and bid[3:].isdigit():
-            num = int(bid[3:])
-            if num > max_id:
-                max_id = num
-    next_id = max_id + 1
-    return f"GIC{next_id:04d}"
+    return get_allocator().next_ids(movie, 1)[0]
 
 def confirm_reservation(movie: Movie, booking_id):
     """
@@ -95,22 +127,29 @@ def confirm_reservation(movie: Movie, booking_id):
         b.status = "B"
     return movie
 
-def build_seat_map(movie: Movie):
+@traced("booking.build_seat_map")
+def build_seat_map(movie: Movie, category=None):
     """
     Build a seat map for the given Movie instance.
     Returns a dict mapping row letters to lists of seat labels (e.g., {'A': ['A1', 'A2', ...]}).
+    Seats removed by the hall layout are left out.
     Args:
         movie (Movie): The Movie instance.
+        category (str, optional): Only include seats in this seat category (e.g. 'premium').
     Returns:
         dict: Seat map by row letter.
     """
     log_info(f"Building seat map for movie: {getattr(movie, 'title', 'Unknown')}")
     rows = movie.row
     seats_per_row = movie.seats_per_row
+    layout = movie.layout
     seat_map = {}
     for i in range(rows):
         row_letter = string.ascii_uppercase[i]
-        seat_map[row_letter] = [f"{row_letter}{n+1}" for n in range(seats_per_row)]
+        if category is not None:
+            seat_map[row_letter] = [f"{row_letter}{n}" for n in mask_to_seat_nums(layout.category_masks.get(category, [0] * rows)[i])]
+        else:
+            seat_map[row_letter] = list(layout.labels[i])
     return seat_map
 
 def get_booked_seats(movie: Movie):
@@ -144,21 +183,24 @@ def get_row_center(seats_per_row):
     else:
         return (seats_per_row + 1) // 2
 
-def ordered_free_seat_map(seat_map, booked):
+def ordered_free_seat_map(seat_map, booked, seats_per_row=None):
     """
     Returns a list of available seats ordered by centrality (most central first, rightmost in tie), row by row (front to back).
     Booked seats are excluded.
     Args:
         seat_map (dict): Seat map by row letter.
         booked (set): Set of booked seat labels.
+        seats_per_row (int, optional): Row width used for centrality. Defaults to the length of each row,
+            which is only right when the hall layout has no removed seats.
     Returns:
         list: List of available seat labels ordered by centrality.
     """
     result = []
     row_letters = sorted(seat_map.keys())
+    width = seats_per_row
     for row_letter in row_letters:
         seats = [s for s in seat_map[row_letter] if s not in booked]
-        seats_per_row = len(seat_map[row_letter])
+        seats_per_row = width or len(seat_map[row_letter])
         # Use seat_sort_order to order by centrality, rightmost in tie
         ordered = seat_sort_order(seats, seats_per_row)
         result.extend(ordered)
@@ -177,44 +219,37 @@ def seat_sort_order(seats, seats_per_row, take=None):
     """
     if not seats:
         return []
-    seat_tuples = []
-    for s in seats:
-        seat_num = int(s[1:])
-        if seats_per_row % 2 == 0:
-            center_left = seats_per_row // 2
-            center_right = center_left + 1
-            if seat_num == center_left or seat_num == center_right:
-                dist = 0
-                tiebreak = -seat_num
-            else:
-                center_val = seats_per_row / 2 + 0.5
-                dist = abs(seat_num - center_val)
-                tiebreak = -seat_num
-            seat_tuples.append((dist, tiebreak, s))
-        else:
-            center_val = (seats_per_row + 1) // 2
-            dist = abs(seat_num - center_val)
-            seat_tuples.append((dist, -seat_num, s))
-    seat_tuples.sort()
-    result = [t[2] for t in seat_tuples]
+    order = rank_seats([int(s[1:]) for s in seats], seats_per_row, tiebreak=seats)
+    result = [seats[i] for i in order]
     if take:
         result = result[:take]
     return result
 
-def default_seating(movie: Movie, num_tickets):
+@traced("booking.default_seating")
+@timed("booking.default_seating")
+def default_seating(movie: Movie, num_tickets, category=None):
     """
     Assign the best available seats for a booking, ordered by centrality (most central first).
     Args:
         movie (Movie): The Movie instance to assign seats for.
         num_tickets (int): Number of tickets to assign.
+        category (str, optional): Only assign seats in this seat category (e.g. 'premium').
     Returns:
         list: List of assigned seat labels (e.g., ['A5', 'A6']).
     """
     log_info(f"Assigning default seating for {num_tickets} tickets.")
-    seat_map = build_seat_map(movie)
-    booked = get_booked_seats(movie)
-    ordered_seats = ordered_free_seat_map(seat_map, booked)
-    return ordered_seats[:num_tickets]
+    # Walk the layout's precomputed centrality order, testing each seat against the free-seat bits
+    layout = movie.layout
+    assigned = []
+    for row_idx, free in enumerate(movie.occupancy.free_masks(category)):
+        if not free:
+            continue
+        for seat in layout.row_order[row_idx]:
+            if free >> (int(seat[1:]) - 1) & 1:
+                assigned.append(seat)
+                if len(assigned) >= num_tickets:
+                    return assigned
+    return assigned
 
 def fill_right_in_row(row, start_num, seats_per_row, booked, assigned):
     """
@@ -266,23 +301,44 @@ def fill_prev_rows_by_centrality(row_idx, row_letters, seat_map, seats_per_row,
         filled.extend(ordered)
     return filled
 
-def custom_seating(movie: Movie, num_tickets, seat_input):
+@traced("booking.custom_seating")
+@timed("booking.custom_seating")
+def custom_seating(movie: Movie, num_tickets, seat_input, category=None):
     """
     Assign custom seats for a booking, starting at a user-specified seat and filling according to the seating algorithm.
     Args:
         movie (Movie): The Movie instance to assign seats for.
         num_tickets (int): Number of tickets to assign.
         seat_input (str): The starting seat label (e.g., 'B4').
+        category (str, optional): Only assign seats in this seat category (e.g. 'premium').
     Returns:
         list: List of assigned seat labels (e.g., ['B4', 'B5', ...]).
     """
     log_info(f"Assigning custom seating for {num_tickets} tickets starting at {seat_input}.")
-    seat_map = build_seat_map(movie)
-    booked = get_booked_seats(movie)
+    seat_map = build_seat_map(movie, category)
+    # Removed and out-of-category seats are never assignable, so the row-walking helpers treat them as booked
+    booked = get_booked_seats(movie) | movie.layout.removed
+    if category is not None:
+        layout = movie.layout
+        booked = booked.union(*(layout.category_seats(c) for c in layout.category_masks if c != category))
+    return fill_from_start_seat(seat_map, movie.seats_per_row, booked, num_tickets, seat_input)
+
+def fill_from_start_seat(seat_map, seats_per_row, booked, num_tickets, seat_input):
+    """
+    Apply the custom seating algorithm from a starting seat against a prebuilt seat map and booked set.
+    Shared by custom_seating and book_tickets_bulk so that a batch can reuse one seat map for every group.
+    Args:
+        seat_map (dict): Seat map by row letter.
+        seats_per_row (int): Number of seats per row.
+        booked (set): Set of seat labels that cannot be assigned.
+        num_tickets (int): Number of tickets to assign.
+        seat_input (str): The starting seat label (e.g., 'B4').
+    Returns:
+        list: List of assigned seat labels.
+    """
     assigned = []
     row = seat_input[0]
     start_num = int(seat_input[1:])
-    seats_per_row = movie.seats_per_row
     row_letters = list(seat_map.keys())
     row_idx = row_letters.index(row)
 
@@ -309,4 +365,196 @@ def custom_seating(movie: Movie, num_tickets, seat_input):
     assigned.extend(prev_rows)
     return assigned[:num_tickets]
 
+def book_tickets_bulk(movie: Movie, requests, idempotency_key=None, dedup=None):
+    """
+    Allocate seats for many groups in one pass and commit them as confirmed ('B') bookings.
+    Each request is either a party size or a (party_size, start_seat) tuple; a start_seat of None
+    uses default seating. The seat map, occupied set and centrality order are built once and shared
+    by every group, and the movie is saved once after all groups are placed.
+    The batch is all-or-nothing: if a request is invalid or the hall cannot seat everyone, nothing is booked.
+    Args:
+        movie (Movie): The Movie instance to book into.
+        requests (list): List of party sizes or (party_size, start_seat) tuples.
+        idempotency_key (str, optional): Client key; a retried batch with the same key returns the original result.
+            Reusing the key for a different request raises IdempotencyConflict.
+        dedup (IdempotencyCache, optional): Cache for idempotency keys. Defaults to the journal-backed process cache.
+    Returns:
+        list: List of (booking_id, seats) tuples in request order, or an empty list if the batch was rejected.
+    """
+    if idempotency_key is not None:
+        result = (dedup if dedup is not None else default_cache()).run(
+            idempotency_key, "bulk", lambda: book_tickets_bulk(movie, requests),
+            _request_fingerprint(movie, requests))
+        # Results restored from the journal come back as JSON lists
+        return [tuple(r) for r in result]
+    log_info(f"Starting bulk booking of {len(requests)} groups for movie '{movie.title}'")
+    start = time.perf_counter()
+    seat_map = build_seat_map(movie)
+    groups = _normalise_bulk_requests(seat_map, requests)
+    if groups is None:
+        return []
+    # Reserved seats are held by someone, so a batch never allocates over them either
+    occupied = {seat for booking in movie.bookings if booking.status in ("R", "B") for seat in booking.seats}
+    requested = sum(size for size, _ in groups)
+    available = movie.layout.capacity - len(occupied)
+    occupied |= movie.layout.removed
+    if requested > available:
+        log_warning(f"Bulk booking rejected: {requested} seats requested, {available} available.")
+        return []
+
+    # Default seating always takes the first free seats in this fixed order, and seats only ever
+    # become occupied during a batch, so a single cursor walks the order once for the whole batch.
+    order = ordered_free_seat_map(seat_map, set(), movie.seats_per_row)
+    cursor = 0
+    booking_ids = get_allocator().next_ids(movie, len(groups))
+    results = []
+    for booking_id, (size, start_seat) in zip(booking_ids, groups):
+        if start_seat is None:
+            seats = []
+            while len(seats) < size:
+                seat = order[cursor]
+                cursor += 1
+                if seat not in occupied:
+                    seats.append(seat)
+        else:
+            seats = fill_from_start_seat(seat_map, movie.seats_per_row, occupied, size, start_seat)
+        occupied.update(seats)
+        results.append((booking_id, seats))
+
+    for booking_id, seats in results:
+        movie.add_booking(Booking(booking_id, "B", seats))
+    save_movie(movie.to_dict())
+    increment("bookings.confirmed", len(results))
+    log_event("booking.bulk_committed", movie=movie.title, bookings=len(results), seats=requested,
+              duration_ms=round((time.perf_counter() - start) * 1000, 3))
+    return results
+
+def _normalise_bulk_requests(seat_map, requests):
+    """
+    Convert bulk booking requests into (party_size, start_seat) tuples, validating each one.
+    Returns None, with a warning, if any request is malformed (not a size or a 2-tuple), has a size that is not a
+    positive int (booleans included), or a start seat that is not a string naming a seat in the hall.
+    """
+    groups = []
+    for request in requests:
+        if isinstance(request, (tuple, list)):
+            if len(request) != 2:
+                log_warning(f"Bulk booking rejected: malformed request {request!r}.")
+                return None
+            size, start_seat = request
+        else:
+            size, start_seat = request, None
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            log_warning(f"Bulk booking rejected: invalid party size {size!r}.")
+            return None
+        if start_seat is not None:
+            if not isinstance(start_seat, str):
+                log_warning(f"Bulk booking rejected: invalid start seat {start_seat!r}.")
+                return None
+            start_seat = start_seat.strip().upper()
+            if start_seat[:1] not in seat_map or start_seat not in seat_map[start_seat[0]]:
+                log_warning(f"Bulk booking rejected: invalid start seat {start_seat!r}.")
+                return None
+        groups.append((size, start_seat))
+    return groups
+
+def _request_fingerprint(movie: Movie, *args):
+    """Fingerprint a command for idempotency: the showing (title and hall dimensions) and the command's arguments."""
+    return request_fingerprint(movie.title, movie.row, movie.seats_per_row, *args)
 
+def cancel_booking(movie: Movie, booking_id, journal=None, waitlist=None, idempotency_key=None, dedup=None):
+    """
+    Cancel a booking and release its seats immediately.
+    The booking stays on record with status 'C' (so its ID is never reused); its seats leave the
+    occupancy index in time proportional to the booking size, which also updates the availability
+    counters and anything subscribed to the movie (availability index, cached seat renders).
+    Args:
+        movie (Movie): The Movie instance containing the booking.
+        booking_id (str): The booking ID to cancel.
+        journal (BookingJournal, optional): Journal receiving the 'cancel' event. Defaults to logs/journal.jsonl.
+        waitlist (Waitlist, optional): Waitlist offered the released seats; seated parties are booked and journaled.
+        idempotency_key (str, optional): Client key; a retried cancellation with the same key returns the original result.
+            Reusing the key for a different request raises IdempotencyConflict.
+        dedup (IdempotencyCache, optional): Cache for idempotency keys. Defaults to the journal-backed process cache.
+    Returns:
+        list or None: The released seat labels, or None if the booking does not exist or is already cancelled.
+    """
+    if idempotency_key is not None:
+        return (dedup if dedup is not None else default_cache()).run(
+            idempotency_key, "cancel", lambda: cancel_booking(movie, booking_id, journal, waitlist),
+            _request_fingerprint(movie, booking_id))
+    start = time.perf_counter()
+    booking = movie.get_booking(booking_id)
+    if booking is None or booking.status == CANCELLED:
+        log_warning(f"Cannot cancel booking '{booking_id}': not found or already cancelled.")
+        return None
+    released = list(booking.seats)
+    booking.status = CANCELLED
+    journal = journal or BookingJournal()
+    journal.append("cancel", movie=movie.title, booking_id=booking_id, seats=released)
+    if waitlist is not None:
+        for request, new_id, seats in waitlist.match_released(movie, released):
+            journal.append("waitlist", movie=movie.title, booking_id=new_id, seats=seats, request_id=request.request_id)
+    save_movie(movie)
+    increment("bookings.cancelled")
+    log_event("booking.cancelled", booking_id=booking_id, movie=movie.title, seats=released,
+              duration_ms=round((time.perf_counter() - start) * 1000, 3))
+    return released
+
+def rebook_booking(movie: Movie, booking_id, seats, journal=None, idempotency_key=None, dedup=None):
+    """
+    Move a booking to other seats, releasing the old ones and taking the new ones in one step.
+    The new seats must exist and must not be held by any other booking; they may overlap the booking's own seats.
+    The party size cannot change: there must be exactly as many distinct new seats as the booking holds.
+    A cancelled booking is revived with status 'B'.
+    Args:
+        movie (Movie): The Movie instance containing the booking.
+        booking_id (str): The booking ID to move.
+        seats (list): The new seat labels.
+        journal (BookingJournal, optional): Journal receiving the 'rebook' event. Defaults to logs/journal.jsonl.
+        idempotency_key (str, optional): Client key; a retried rebooking with the same key returns the original result.
+            Reusing the key for a different request raises IdempotencyConflict.
+        dedup (IdempotencyCache, optional): Cache for idempotency keys. Defaults to the journal-backed process cache.
+    Returns:
+        list or None: The new seat labels, or None if the booking does not exist, the seats are not a list of
+        labels, are empty, repeated or a different number from the booking's, or a seat is unavailable.
+    """
+    if idempotency_key is not None:
+        return (dedup if dedup is not None else default_cache()).run(
+            idempotency_key, "rebook", lambda: rebook_booking(movie, booking_id, seats, journal),
+            _request_fingerprint(movie, booking_id, seats))
+    start = time.perf_counter()
+    booking = movie.get_booking(booking_id)
+    if booking is None:
+        log_warning(f"Cannot rebook booking '{booking_id}': not found.")
+        return None
+    if not isinstance(seats, (list, tuple)) or not all(isinstance(s, str) for s in seats):
+        log_warning(f"Cannot rebook booking '{booking_id}': seats {seats!r} are not a list of seat labels.")
+        return None
+    seats = [s.strip().upper() for s in seats]
+    if not seats or len(set(seats)) != len(seats):
+        log_warning(f"Cannot rebook booking '{booking_id}': seats {seats} are empty or repeated.")
+        return None
+    if len(seats) != len(booking.seats):
+        log_warning(f"Cannot rebook booking '{booking_id}': {len(seats)} seats given for a party of {len(booking.seats)}.")
+        return None
+    occupancy = movie.occupancy
+    own = set(booking.seats) if booking.status != CANCELLED else set()
+    for seat in seats:
+        row_idx, num = (ord(seat[0]) - ord('A'), int(seat[1:])) if seat[1:].isdigit() else (-1, 0)
+        if not movie.layout.has_seat(row_idx, num):
+            log_warning(f"Cannot rebook booking '{booking_id}': seat '{seat}' is not in the seating map.")
+            return None
+        if (occupancy.booked[row_idx] | occupancy.reserved[row_idx]) >> (num - 1) & 1 and seat not in own:
+            log_warning(f"Cannot rebook booking '{booking_id}': seat '{seat}' is not available.")
+            return None
+    previous = list(booking.seats)
+    booking.seats = seats
+    if booking.status == CANCELLED:
+        booking.status = "B"
+    (journal or BookingJournal()).append("rebook", movie=movie.title, booking_id=booking_id, seats=seats, previous=previous)
+    save_movie(movie)
+    increment("bookings.rebooked")
+    log_event("booking.rebooked", booking_id=booking_id, movie=movie.title, seats=seats, previous=previous,
+              duration_ms=round((time.perf_counter() - start) * 1000, 3))
+    return seats
@@ -1,22 +1,30 @@
-from src.logger import log_info, log_warning, log_error
-from src.booking import get_booking_id, confirm_reservation, get_row_center, seat_sort_order, build_seat_map, get_booked_seats
+from src.logger import log_info, log_warning, log_error, log_event
+from src.booking import get_booking_id, confirm_reservation, apply_seat_selection, get_row_center, seat_sort_order, build_seat_map, get_booked_seats
 import string
 
-from src.movie_classes import Movie
+from src.centrality import best_block_start
+from src.metrics import increment, timed
+from src.movie import save_movie, movie_display
+from src.movie_classes import Movie, Booking
+from src.occupancy import block_starts
+from src.tracing import traced
+from src.validation import is_valid_seat
+
+# Default allocators selectable with book_ticket_advanced(strategy=...)
+SEATING_STRATEGIES = ("greedy", "optimised")
 
 # All functions below are hidden from users and are an attempt at a smarter seating algorithm
 # The main driver being that a person is unlikely to want to sit in non-contiguous seats if they are booking multiple tickets
 
-def book_ticket_advanced(movie: Movie, num_tickets):
+@traced("booking_advanced.book_ticket_advanced")
+def book_ticket_advanced(movie: Movie, num_tickets, strategy="greedy"):
     """
     Adds a booking to the movie's bookings array.
     Uses get_booking_id to generate the next booking ID.
+    strategy selects the default allocator: 'greedy' (default_seating_advanced) or
+    'optimised' (default_seating_optimised, which avoids stranding single seats).
     Returns the modified movie JSON.
     """
-    from src.movie_classes import Booking
-    from src.movie import save_movie, movie_display
-    from src.validation import is_valid_seat
-
     log_info(f"[ADVANCED] Starting booking for {num_tickets} tickets for movie '{movie.title}'")
     booking_id = get_booking_id(movie)
     log_info(f"[ADVANCED] Generated booking ID: {booking_id}")
@@ -25,23 +33,28 @@ def book_ticket_advanced(movie: Movie, num_tickets):
     if not hasattr(movie, "bookings") or not isinstance(movie.bookings, list):
         log_warning("[ADVANCED] 'bookings' attribute missing or not a list in movie. Initializing new list.")
         movie.bookings = []
-    # Assign seats using default_seating_advanced (returns seat list)
-    assigned_seats = default_seating_advanced(movie, num_tickets)
+    # Assign seats using the selected default allocator (returns seat list)
+    if strategy == "optimised":
+        assigned_seats = default_seating_optimised(movie, num_tickets)
+    else:
+        assigned_seats = default_seating_advanced(movie, num_tickets)
     booking.seats = assigned_seats
     log_info(f"[ADVANCED] Default seats assigned: {assigned_seats}")
-    movie.bookings.append(booking)
-    log_info(f"[ADVANCED] Booking object added to movie: {booking.__dict__}")
+    movie.add_booking(booking)
+    log_info(f"[ADVANCED] Booking object added to movie: {booking.to_dict()}")
     print(f"\nSuccessfully reserved {num_tickets} {movie.title} tickets")
     while True:
         print(f"\nBooking ID: {booking_id}")
-        print(movie_display(movie.to_dict()))
+        print(movie_display(movie))
         seating_input = input("\nEnter blank to accept seat selection, or enter new seating position:\n> ")
         status = is_valid_seat(movie, seating_input)
         if status == "blank":
-            log_info(f"[ADVANCED] Booking {booking_id} confirmed by user.")
             movie = confirm_reservation(movie, booking_id)
             log_info(f"[ADVANCED] Booking {booking_id} status set to 'B'.")
             save_movie(movie.to_dict())
+            increment("bookings.confirmed")
+            log_event("booking.confirmed", booking_id=booking_id, movie=movie.title,
+                      seats=movie.get_booking(booking_id).seats, mode="advanced")
             print(f"\nBooking ID: {booking_id} confirmed.\n")
             break
         elif status == "valid":
@@ -54,33 +67,41 @@ def book_ticket_advanced(movie: Movie, num_tickets):
                 b.seats = assigned_seats
             save_movie(movie.to_dict())
             log_info(f"[ADVANCED] Booking {booking_id} updated with custom seats and saved.")
+        elif status == "selection":
+            if not apply_seat_selection(movie, booking_id, num_tickets, seating_input):
+                print(f"Please select exactly {num_tickets} seats. Please try again or enter blank to accept.")
+                continue
+            save_movie(movie.to_dict())
+            log_info(f"[ADVANCED] Booking {booking_id} updated with selected seats and saved.")
         else:
             log_warning(f"[ADVANCED] Invalid seat input '{seating_input.strip()}'; prompt user again.")
             print(f"Seat {seating_input.strip()} is not valid. Please try again or enter blank to accept.")
     return movie
 
 def block_center(block, seats_per_row):
-    log_info(f"[ADVANCED] Calculating block center for block: {block}")
     """
     Given a block of seat labels (e.g., ["A4", "A5", "A6"]) and seats_per_row, return the absolute distance
     from the block's center to the row center (lower is more central).
     """
+    log_event("advanced.block_center", block=block)
     if not block:
         return float('inf')
     center = get_row_center(seats_per_row)
     nums = [int(s[1:]) for s in block]
     return abs(center - (sum(nums) / len(nums)))
 
-def find_contiguous_blocks(available):
-    log_info(f"[ADVANCED] Finding contiguous blocks in available seats: {available}")
+def find_contiguous_blocks(available, layout=None):
     """
     Given a list of available seat labels in a row, return a list of all contiguous seat blocks.
+    If a HallLayout is given, seats separated by an aisle are not contiguous.
     Each block is a list of seat labels.
     """
+    log_event("advanced.contiguous_blocks", seats=available)
     blocks = []
     block = []
     for seat in available:
-        if not block or int(seat[1:]) == int(block[-1][1:]) + 1:
+        prev = int(block[-1][1:]) if block else None
+        if not block or (int(seat[1:]) == prev + 1 and (layout is None or layout.is_adjacent(ord(seat[0]) - ord('A'), prev))):
             block.append(seat)
         else:
             if block:
@@ -90,24 +111,27 @@ def find_contiguous_blocks(available):
         blocks.append(block)
     return blocks
 
-def default_seating_advanced(movie_json, num_tickets):
-    log_info(f"[ADVANCED] Assigning advanced default seating for {num_tickets} tickets.")
+@traced("booking_advanced.default_seating_advanced")
+@timed("booking_advanced.default_seating_advanced")
+def default_seating_advanced(movie_json, num_tickets, category=None):
     """
     Assign the best available contiguous seats for the given group size.
+    If category is given (e.g. 'premium'), only seats in that seat category are considered.
     - Fills from row A (back) to front row.
     - Picks the most middle seats available in a row.
     - Keeps groups together if possible; if not enough contiguous seats in a row, overflows to next row.
     - Skips already booked seats.
     Returns a list of assigned seat labels.
     """
+    log_info(f"[ADVANCED] Assigning advanced default seating for {num_tickets} tickets.")
     rows = movie_json.row
     seats_per_row = movie_json.seats_per_row
-    seat_map = build_seat_map(movie_json)
+    seat_map = build_seat_map(movie_json, category)
     booked = get_booked_seats(movie_json)
     seats_needed = num_tickets
     assigned = []
     # 1. Try to assign all seats in one contiguous block in any row (front to back)
-    best_block = _find_first_row_with_block(rows, seat_map, booked, assigned, seats_per_row, seats_needed)
+    best_block = _find_first_row_with_block(rows, seat_map, booked, assigned, seats_per_row, seats_needed, movie_json.layout)
     if best_block:
         assigned.extend(best_block)
         seats_needed -= len(best_block)
@@ -128,38 +152,79 @@ def default_seating_advanced(movie_json, num_tickets):
         seats_needed -= len(assigned_in_row)
     return assigned
 
-def _find_best_block_in_row(available, seats_per_row, seats_needed):
+def count_stranded_seats(movie):
+    """
+    Count free seats that are isolated, i.e. whose left and right neighbours are both unavailable (booked, wall or aisle).
+    These seats can only ever be sold to a party of one, so they are the fragmentation cost of a seating plan.
+    Args:
+        movie (Movie): The Movie instance.
+    Returns:
+        int: Number of stranded single seats.
+    """
+    layout = movie.layout
+    booked = movie.occupancy.booked
+    stranded = 0
+    for i in range(movie.row):
+        stranded += sum(1 for first, last in layout.runs(i, ~booked[i]) if first == last)
+    return stranded
+
+@traced("booking_advanced.default_seating_optimised")
+@timed("booking_advanced.default_seating_optimised")
+def default_seating_optimised(movie_json, num_tickets, category=None):
+    """
+    Assign a contiguous block chosen by the fragmentation it leaves behind, not just by row order.
+    If category is given (e.g. 'premium'), only seats in that seat category are considered.
+    Every placement inside every free run of the hall is scored by:
+    - the number of single seats it strands at either end of its run (fewest first),
+    - the row, front to back as in default_seating_advanced,
+    - the same centrality sum as _find_best_block_in_row,
+    - the rightmost block in a tie.
+    Falls back to default_seating_advanced when no row has a run long enough for the whole group.
+    Returns a list of assigned seat labels.
+    """
+    log_info(f"[ADVANCED] Assigning optimised default seating for {num_tickets} tickets.")
+    layout = movie_json.layout
+    booked = movie_json.occupancy.booked
+    allowed = layout.seat_masks if category is None else layout.category_masks.get(category, (0,) * layout.rows)
+    center = get_row_center(movie_json.seats_per_row)
+    best_score = None
+    best_block = None
+    for i in range(movie_json.row):
+        row_letter = string.ascii_uppercase[i]
+        for first, last in layout.runs(i, ~booked[i] & allowed[i]):
+            for start in range(first, last - num_tickets + 2):
+                end = start + num_tickets - 1
+                stranded = (start - first == 1) + (last - end == 1)
+                centrality = sum(abs(n - center) for n in range(start, end + 1))
+                score = (stranded, i, centrality, -start)
+                if best_score is None or score < best_score:
+                    best_score = score
+                    best_block = [f"{row_letter}{n}" for n in range(start, end + 1)]
+    if best_block is None:
+        return default_seating_advanced(movie_json, num_tickets, category)
+    return best_block
+
+def _find_best_block_in_row(available, seats_per_row, seats_needed, layout=None):
     """
     Given available seats in a row, return the best contiguous block of size seats_needed, or None.
     Returns a list of seat labels if found, else None.
     """
-    blocks = find_contiguous_blocks(available)
-    if not blocks:
+    if not available:
         return None
-    center = get_row_center(seats_per_row)
-    candidates = []
-    for block in blocks:
-        if len(block) >= seats_needed:
-            seat_nums = [int(s[1:]) for s in block]
-            seat_nums.sort()
-            for i in range(len(seat_nums) - seats_needed + 1):
-                subblock = seat_nums[i:i+seats_needed]
-                # Centrality: sum of distances to center
-                centrality = sum(abs(n - center) for n in subblock)
-                # For tiebreakers: prefer rightmost block (highest starting seat number)
-                rightmost = max(subblock)
-                start_seat = subblock[0]
-                # Lower centrality is better, then higher rightmost, then higher start_seat
-                score = (centrality, -rightmost, -start_seat)
-                candidates.append((score, [f"{block[0][0]}{n}" for n in subblock]))
-    if not candidates:
+    # Score every candidate block of the row at once from its free-seat mask
+    row_letter = available[0][0]
+    row_idx = ord(row_letter) - ord('A')
+    free = 0
+    for seat in available:
+        free |= 1 << (int(seat[1:]) - 1)
+    starts = layout.block_starts(row_idx, free, seats_needed) if layout is not None else block_starts(free, seats_needed)
+    start = best_block_start(starts, seats_per_row, seats_needed)
+    if start is None:
         return None
-    # Sort by centrality, then by rightmost seat, then by rightmost starting seat
-    candidates.sort(key=lambda x: (x[0][0], x[0][1], x[0][2]))
-    # Pick the first candidate (most central, rightmost in tie)
-    return candidates[0][1]
+    # Most central, rightmost in tie
+    return [f"{row_letter}{n}" for n in range(start, start + seats_needed)]
 
-def _find_first_row_with_block(rows, seat_map, booked, assigned, seats_per_row, seats_needed):
+def _find_first_row_with_block(rows, seat_map, booked, assigned, seats_per_row, seats_needed, layout=None):
     """
     Find the first row (front to back) with a contiguous block of seats_needed available seats.
     Returns the list of seat labels if found, else None.
@@ -167,7 +232,7 @@ def _find_first_row_with_block(rows, seat_map, booked, assigned, seats_per_row,
     for i in range(rows):
         row_letter = string.ascii_uppercase[i]
         available = [s for s in seat_map[row_letter] if s not in booked and s not in assigned]
-        best_block = _find_best_block_in_row(available, seats_per_row, seats_needed)
+        best_block = _find_best_block_in_row(available, seats_per_row, seats_needed, layout)
         if best_block:
             return best_block
     return None
@@ -190,10 +255,10 @@ def assign_single_seat_advanced(rows, seat_map, booked, assigned, seats_per_row)
         return [sorted_seats[0]]
     return []
 
-def assign_from_starting_seat(seat_map, booked, row, start_num, num_tickets):
+def assign_from_starting_seat(seat_map, booked, row, start_num, num_tickets, layout=None):
     """Assign as many contiguous seats as possible in the starting row from the input seat."""
     available_in_row = [s for s in seat_map[row] if s not in booked]
-    blocks = find_contiguous_blocks(available_in_row)
+    blocks = find_contiguous_blocks(available_in_row, layout)
     block_with_input = None
     for block in blocks:
         if f"{row}{start_num}" in block:
@@ -235,7 +300,7 @@ def find_best_subblock(blocks, seats_needed, seats_per_row):
                     best_subblock = subblock
     return best_subblock
 
-def assign_overflow_rows(seat_map, booked, assigned, row_letters, row_idx, seats_needed, seats_per_row):
+def assign_overflow_rows(seat_map, booked, assigned, row_letters, row_idx, seats_needed, seats_per_row, layout=None):
     """Assign seats in overflow rows, prioritizing largest/most central contiguous blocks."""
     for next_row_idx in range(row_idx + 1, len(row_letters)):
         if seats_needed <= 0:
@@ -244,7 +309,7 @@ def assign_overflow_rows(seat_map, booked, assigned, row_letters, row_idx, seats
         available_in_next_row = [s for s in seat_map[next_row] if s not in booked and s not in assigned]
         if not available_in_next_row:
             continue
-        blocks = find_contiguous_blocks(available_in_next_row)
+        blocks = find_contiguous_blocks(available_in_next_row, layout)
         best_subblock = find_best_subblock(blocks, seats_needed, seats_per_row)
         if best_subblock:
             assigned.extend(best_subblock)
@@ -273,6 +338,7 @@ def assign_fallback_seats(seat_map, booked, assigned, row_letters, seats_needed)
     assigned.extend(all_available[:seats_needed])
     return assigned
 
+@traced("booking_advanced.advanced_custom_seating")
 def advanced_custom_seating(movie, num_tickets, seat_input):
     """
     Assign seats for advanced custom seating:
@@ -282,7 +348,6 @@ def advanced_custom_seating(movie, num_tickets, seat_input):
     - Centrality is secondary to contiguity.
     Returns a list of assigned seat labels.
     """
-    import string
     seat_map = build_seat_map(movie)
     booked = get_booked_seats(movie)
     row = seat_input[0]
@@ -292,12 +357,12 @@ def advanced_custom_seating(movie, num_tickets, seat_input):
     row_idx = row_letters.index(row)
 
     # 1. Assign as much as possible contiguously in the same row, starting at the input seat
-    assigned = assign_from_starting_seat(seat_map, booked, row, start_num, num_tickets)
+    assigned = assign_from_starting_seat(seat_map, booked, row, start_num, num_tickets, movie.layout)
     seats_needed = num_tickets - len(assigned)
 
     # 2. Try to fill next rows, prioritizing largest contiguous block (then centrality of block)
     if seats_needed > 0:
-        assigned, seats_needed = assign_overflow_rows(seat_map, booked, assigned, row_letters, row_idx, seats_needed, seats_per_row)
+        assigned, seats_needed = assign_overflow_rows(seat_map, booked, assigned, row_letters, row_idx, seats_needed, seats_per_row, movie.layout)
 
     # 3. Fallback: if still not enough, fill with any available seat (non-contiguous)
     if seats_needed > 0:
@@ -0,0 +1,173 @@
+"""
+booking_ids.py
+--------------
+This module provides pluggable booking ID allocators.
+- SequentialIdAllocator (default): per-movie IDs GIC0001, GIC0002, ... continuing from the highest
+  existing number, which the movie keeps in its booking index, so no bookings are scanned.
+  Numbers past 9999 simply grow (GIC10000); pass a larger width for IDs that sort lexically.
+- LeasedBlockAllocator: IDs unique across movies and worker processes. Each worker leases a block of
+  numbers from a shared FileLeaseSource (the only coordination point, locked once per block) and hands
+  them out locally; an optional shard tag keeps separately leased namespaces apart.
+Stored GICnnnn IDs stay valid with every allocator.
+"""
+
+import os
+import threading
+
+from src.logger import log_info
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+LEGACY_PREFIX = "GIC"
+
+
+def legacy_booking_number(booking_id):
+    """
+    Return the number of a GICnnnn booking ID.
+    Args:
+        booking_id (str): The booking ID.
+    Returns:
+        int or None: The number, or None if the ID is not in the GIC + digits format.
+    """
+    if booking_id.startswith(LEGACY_PREFIX) and booking_id[3:].isdigit():
+        return int(booking_id[3:])
+    return None
+
+
+class SequentialIdAllocator:
+    """
+    Per-movie sequential GIC IDs, the historical format.
+    Attributes:
+        width (int): Minimum number of digits.
+    """
+    def __init__(self, width=4):
+        """
+        Initialize a SequentialIdAllocator.
+        Args:
+            width (int, optional): Minimum number of digits (zero padded).
+        """
+        self.width = width
+
+    def next_ids(self, movie, count=1):
+        """
+        Return the next booking IDs of a movie. IDs only become taken once their bookings are added.
+        Args:
+            movie (Movie): The Movie instance.
+            count (int, optional): Number of IDs.
+        Returns:
+            list: Booking ID strings.
+        """
+        start = movie.last_booking_number + 1
+        return [f"{LEGACY_PREFIX}{n:0{self.width}d}" for n in range(start, start + count)]
+
+
+class FileLeaseSource:
+    """
+    Shared counter in a file, handing out disjoint blocks of numbers to any number of processes.
+    Attributes:
+        path (str): Path of the counter file.
+        start (int): First number handed out when the file does not exist yet.
+    """
+    def __init__(self, path, start=1):
+        """
+        Initialize a FileLeaseSource.
+        Args:
+            path (str): Path of the counter file.
+            start (int, optional): First number of the first lease.
+        """
+        self.path = path
+        self.start = start
+
+    def lease(self, size):
+        """
+        Reserve the next block of numbers.
+        Args:
+            size (int): Block size.
+        Returns:
+            int: First number of the block [first, first + size).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.read(fd, 64).strip()
+            first = int(data) if data else self.start
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(first + size).encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)  # also releases the lock
+        log_info(f"Leased booking numbers {first}-{first + size - 1} from {self.path}.")
+        return first
+
+
+class LeasedBlockAllocator:
+    """
+    Booking IDs from leased number blocks, unique across movies and processes sharing one lease source.
+    Attributes:
+        source (FileLeaseSource): Where blocks are leased from.
+        block_size (int): Numbers leased at a time.
+        shard (str): Tag added after the prefix, e.g. a region or cluster name.
+        width (int): Minimum number of digits.
+    """
+    def __init__(self, source, block_size=1000, shard="", width=8):
+        """
+        Initialize a LeasedBlockAllocator.
+        Args:
+            source (FileLeaseSource): Lease source shared by all workers.
+            block_size (int, optional): Numbers leased at a time.
+            shard (str, optional): Namespace tag, e.g. 'EU' gives 'GICEU-00000001'.
+            width (int, optional): Minimum number of digits.
+        """
+        self.source = source
+        self.block_size = block_size
+        self.shard = shard
+        self.width = width
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_ids(self, movie=None, count=1):
+        """
+        Return new booking IDs. Each ID is handed out once, whether or not its booking is kept.
+        Args:
+            movie (Movie, optional): Unused; leased IDs are unique across movies.
+            count (int, optional): Number of IDs.
+        Returns:
+            list: Booking ID strings.
+        """
+        prefix = f"{LEGACY_PREFIX}{self.shard}-" if self.shard else f"{LEGACY_PREFIX}-"
+        ids = []
+        with self._lock:
+            while len(ids) < count:
+                if self._next >= self._end:
+                    self._next = self.source.lease(self.block_size)
+                    self._end = self._next + self.block_size
+                ids.append(f"{prefix}{self._next:0{self.width}d}")
+                self._next += 1
+        return ids
+
+
+_allocator = SequentialIdAllocator()
+
+
+def set_allocator(allocator):
+    """
+    Select the allocator used by get_booking_id and bulk booking.
+    Args:
+        allocator: Object with a next_ids(movie, count) method.
+    """
+    global _allocator
+    _allocator = allocator
+
+def get_allocator():
+    """
+    Returns:
+        The current booking ID allocator.
+    """
+    return _allocator
@@ -0,0 +1,225 @@
+"""
+catalog.py
+----------
+This module provides a catalog of movies and their showings for serving many showings from one process.
+Each showing is stored as its own movie JSON file; the catalog keeps a small index of all showings
+and loads a Movie lazily on first access into a bounded LRU cache. Showings changed while cached are
+written back to storage when they are evicted or when the catalog is flushed.
+The index also stores each showing's availability summary, so find_showings can search every
+showing for a block of adjacent seats without loading any of them.
+A cached showing is marked dirty as soon as its occupancy changes, and dirty showings are saved before the
+index, so the stored summaries never describe bookings missing from the showing files.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+
+from src import persistence
+from src.availability import AvailabilityIndex, summarise_availability
+from src.logger import log_info, log_warning
+from src.movie import save_movie, load_movie
+from src.movie_classes import Movie
+
+DEFAULT_CATALOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'catalog'))
+INDEX_FILE = "catalog.json"
+# Showing IDs become file names, so they are limited to characters that cannot leave storage_dir
+SHOWING_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class MovieCatalog:
+    """
+    Catalog of showings backed by one JSON file per showing and an LRU cache of loaded Movie instances.
+    Attributes:
+        storage_dir (str): Directory holding the index and the showing files.
+        capacity (int): Maximum number of Movie instances kept in memory.
+        availability (AvailabilityIndex): Free-seat summaries of every showing.
+    """
+    def __init__(self, storage_dir=None, capacity=64):
+        """
+        Initialize a MovieCatalog, reading the showing index from storage if it exists.
+        Args:
+            storage_dir (str, optional): Directory for catalog files. Defaults to logs/catalog.
+            capacity (int, optional): Maximum number of cached Movie instances.
+        """
+        self.storage_dir = storage_dir or DEFAULT_CATALOG_DIR
+        self.capacity = max(1, capacity)
+        self._cache = OrderedDict()
+        self._dirty = set()
+        self._watchers = {}
+        self._index = {}
+        index_path = os.path.join(self.storage_dir, INDEX_FILE)
+        if os.path.isdir(self.storage_dir):
+            persistence.remove_temp_files(self.storage_dir)
+        if os.path.exists(index_path):
+            persistence.flush()
+            with open(index_path) as f:
+                self._index = json.load(f)
+        self.availability = AvailabilityIndex()
+        for showing_id, entry in self._index.items():
+            if "blocks" not in entry:
+                # Index written before summaries were stored: summarise once from the showing file
+                entry.update(summarise_availability(load_movie(self._showing_path(showing_id))))
+            self.availability.update(showing_id, entry)
+        log_info(f"Movie catalog opened at {self.storage_dir} with {len(self._index)} showings.")
+
+    def _showing_path(self, showing_id):
+        """
+        Return the path of the JSON file holding a showing.
+        Raises:
+            ValueError: If the showing ID is not made of letters, digits, '_' and '-' only.
+        """
+        if not isinstance(showing_id, str) or not SHOWING_ID_PATTERN.fullmatch(showing_id):
+            raise ValueError(f"Invalid showing ID: {showing_id!r}")
+        return os.path.join(self.storage_dir, f"{showing_id}.json")
+
+    def _save_index(self):
+        """Save changed cached showings, then write the showing index with current availability summaries."""
+        for showing_id in list(self._dirty):
+            save_movie(self._cache[showing_id], self._showing_path(showing_id))
+            self._dirty.discard(showing_id)
+        for showing_id, entry in self._index.items():
+            entry.update(self.availability.summaries.get(showing_id, {}))
+        persistence.write(os.path.join(self.storage_dir, INDEX_FILE), json.dumps(self._index))
+
+    def add_showing(self, showing_id, movie: Movie, showtime=None):
+        """
+        Add (or replace) a showing, write it to storage and cache it.
+        Args:
+            showing_id (str): Unique showing identifier (used as the file name; letters, digits, '_' and '-').
+            movie (Movie): The Movie instance for this showing.
+            showtime (str, optional): Free-form showtime, e.g. '2024-05-01 19:30'.
+        Raises:
+            ValueError: If the showing ID is not made of letters, digits, '_' and '-' only.
+        """
+        path = self._showing_path(showing_id)
+        log_info(f"Adding showing '{showing_id}' for movie '{movie.title}' at {showtime}.")
+        self._index[showing_id] = {
+            "title": movie.title,
+            "showtime": showtime,
+            "row": movie.row,
+            "seats_per_row": movie.seats_per_row,
+        }
+        self._dirty.discard(showing_id)  # a replaced cached showing must not be written over the new one
+        save_movie(movie, path)
+        self.availability.track(showing_id, movie)
+        self._save_index()
+        self._put(showing_id, movie)
+
+    def list_movies(self):
+        """
+        Returns:
+            list: Sorted, distinct movie titles in the catalog.
+        """
+        return sorted({entry["title"] for entry in self._index.values()})
+
+    def list_showings(self, title=None):
+        """
+        List showings from the index without loading any Movie.
+        Args:
+            title (str, optional): Only list showings of this movie title.
+        Returns:
+            list: Dicts with keys 'showing_id', 'title', 'showtime', 'row', 'seats_per_row' and the availability
+                summary keys 'free' and 'blocks', ordered by showtime.
+        """
+        showings = [
+            dict(entry, showing_id=showing_id)
+            for showing_id, entry in self._index.items()
+            if title is None or entry["title"] == title
+        ]
+        return sorted(showings, key=lambda s: (s["showtime"] or "", s["showing_id"]))
+
+    def find_showings(self, num_seats, title=None, first_row=None, last_row=None):
+        """
+        Find showings with at least num_seats adjacent free seats, using only the availability index.
+        Args:
+            num_seats (int): Number of adjacent seats needed.
+            title (str, optional): Only consider showings of this movie title.
+            first_row (str, optional): First acceptable row letter.
+            last_row (str, optional): Last acceptable row letter.
+        Returns:
+            list: Showing dicts as returned by list_showings, ordered by showtime.
+        """
+        matches = set(self.availability.find(num_seats, first_row, last_row))
+        return [s for s in self.list_showings(title) if s["showing_id"] in matches]
+
+    def get(self, showing_id):
+        """
+        Return the Movie for a showing, loading it from storage on a cache miss.
+        Args:
+            showing_id (str): The showing identifier.
+        Returns:
+            Movie or None: The Movie instance, or None if the showing is not in the catalog.
+        """
+        movie = self._cache.get(showing_id)
+        if movie is not None:
+            self._cache.move_to_end(showing_id)
+            return movie
+        if showing_id not in self._index:
+            log_warning(f"Showing '{showing_id}' not found in catalog.")
+            return None
+        movie = load_movie(self._showing_path(showing_id))
+        self.availability.track(showing_id, movie)
+        self._put(showing_id, movie)
+        return movie
+
+    def mark_dirty(self, showing_id):
+        """
+        Record that a cached showing has changed and must be written back before it leaves memory.
+        Occupancy changes mark a showing automatically; this is only needed for other changes, e.g. a new title.
+        Args:
+            showing_id (str): The showing identifier.
+        """
+        if showing_id in self._cache:
+            self._dirty.add(showing_id)
+
+    def flush(self):
+        """
+        Write every changed cached showing back to storage.
+        """
+        if self._dirty:
+            self._save_index()
+
+    def cached_showings(self):
+        """
+        Returns:
+            list: Showing IDs currently in memory, least recently used first.
+        """
+        return list(self._cache)
+
+    def _put(self, showing_id, movie):
+        """Insert a Movie into the cache as most recently used, evicting the least recently used ones."""
+        self._watch(showing_id, movie)
+        self._cache[showing_id] = movie
+        self._cache.move_to_end(showing_id)
+        while len(self._cache) > self.capacity:
+            evicted_id, evicted = self._cache.popitem(last=False)
+            self._unwatch(evicted_id)
+            if evicted_id in self._dirty:
+                self._write_back(evicted_id, evicted)
+            self.availability.untrack(evicted_id)
+            log_info(f"Evicted showing '{evicted_id}' from catalog cache.")
+
+    def _watch(self, showing_id, movie):
+        """Mark a cached showing dirty whenever its occupancy changes."""
+        self._unwatch(showing_id)
+
+        def listener(changed, rows):
+            self._dirty.add(showing_id)
+
+        movie.subscribe(listener)
+        self._watchers[showing_id] = (movie, listener)
+
+    def _unwatch(self, showing_id):
+        """Stop marking a showing dirty on changes, e.g. when it leaves the cache."""
+        watched = self._watchers.pop(showing_id, None)
+        if watched is not None:
+            movie, listener = watched
+            movie.unsubscribe(listener)
+
+    def _write_back(self, showing_id, movie):
+        """Save a changed showing that is leaving the cache, then the index."""
+        save_movie(movie, self._showing_path(showing_id))
+        self._dirty.discard(showing_id)
+        self._save_index()
@@ -0,0 +1,140 @@
+"""
+centrality.py
+-------------
+This module provides the centrality scoring used to rank seats and choose seat blocks, with two engines:
+- 'python' (default): plain loops over seat numbers, no dependencies.
+- 'numpy': scores a whole row at once with a precomputed distance-to-centre array, rolling-window
+  block sums (a cumulative sum) and a stable lexsort/argmin that keeps the rightmost tie-break.
+Both engines return identical results; the NumPy engine pays off on wide rows and is optional (pip install numpy).
+NumPy is imported the first time the 'numpy' engine is used, so importing this module stays cheap.
+"""
+
+from src.hall_layout import centrality_key
+from src.logger import log_info
+from src.occupancy import mask_to_seat_nums
+
+np = None  # set by _load_numpy
+
+ENGINES = ("python", "numpy")
+
+_engine = "python"
+_distance_cache = {}
+
+
+def _load_numpy():
+    """
+    Import NumPy on first use of the numpy engine.
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The numpy centrality engine requires NumPy: pip install numpy") from None
+        np = numpy
+    return np
+
+def set_engine(name):
+    """
+    Select the centrality engine used when callers do not pass one.
+    Args:
+        name (str): 'python' or 'numpy'.
+    Raises:
+        ValueError: If the engine name is unknown.
+        ImportError: If 'numpy' is requested but NumPy is not installed.
+    """
+    global _engine
+    if name not in ENGINES:
+        raise ValueError(f"Unknown centrality engine '{name}', expected one of {ENGINES}")
+    if name == "numpy":
+        _load_numpy()
+    log_info(f"Centrality engine set to '{name}'.")
+    _engine = name
+
+def get_engine():
+    """
+    Returns:
+        str: The current default centrality engine.
+    """
+    return _engine
+
+def _distances(seats_per_row):
+    """
+    Return cached NumPy arrays for a row width: (rank distance, block distance prefix sums).
+    Rank distance follows centrality_key (both middle seats of an even row are at 0); block distance
+    is |n - get_row_center(seats_per_row)|, as used to score contiguous blocks.
+    """
+    cached = _distance_cache.get(seats_per_row)
+    if cached is None:
+        nums = np.arange(1, seats_per_row + 1)
+        if seats_per_row % 2 == 0:
+            rank = np.abs(nums - (seats_per_row / 2 + 0.5))
+            rank[(nums == seats_per_row // 2) | (nums == seats_per_row // 2 + 1)] = 0
+        else:
+            rank = np.abs(nums - (seats_per_row + 1) // 2).astype(float)
+        block = np.abs(nums - (seats_per_row + 1) // 2)
+        cached = (rank, np.concatenate(([0], np.cumsum(block))))
+        _distance_cache[seats_per_row] = cached
+    return cached
+
+def _mask_bits(mask, width):
+    """Unpack the low `width` bits of a mask into a boolean NumPy array (index n-1 for seat n)."""
+    nbytes = max(1, (width + 7) // 8)
+    bits = np.unpackbits(np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8), bitorder="little")
+    return bits[:width].astype(bool)
+
+def rank_seats(seat_nums, seats_per_row, tiebreak=None, engine=None):
+    """
+    Order seats by centrality: most central first, rightmost in tie, then by the optional tiebreak values.
+    Args:
+        seat_nums (list): Seat numbers (1-based).
+        seats_per_row (int): Number of seats in the row.
+        tiebreak (list, optional): Values compared last, one per seat (e.g. the seat labels).
+        engine (str, optional): 'python' or 'numpy'. Defaults to the engine chosen with set_engine.
+    Returns:
+        list: Indexes into seat_nums, in rank order.
+    """
+    if (engine or _engine) == "numpy" and seat_nums and 1 <= min(seat_nums) and max(seat_nums) <= seats_per_row:
+        _load_numpy()
+        nums = np.asarray(seat_nums)
+        rank, _ = _distances(seats_per_row)
+        dist = rank[nums - 1]
+        # lexsort sorts by the last key first
+        keys = (-nums, dist) if tiebreak is None else (np.asarray(tiebreak), -nums, dist)
+        return np.lexsort(keys).tolist()
+    if tiebreak is None:
+        return sorted(range(len(seat_nums)), key=lambda i: centrality_key(seat_nums[i], seats_per_row))
+    return sorted(range(len(seat_nums)), key=lambda i: (centrality_key(seat_nums[i], seats_per_row), tiebreak[i]))
+
+def best_block_start(starts_mask, seats_per_row, width, engine=None):
+    """
+    Choose the most central block among candidate start positions.
+    A block's score is the sum of its seats' distances to the row centre; ties go to the rightmost block.
+    Args:
+        starts_mask (int): Mask with bit n-1 set for every seat n that starts a free block of `width` seats.
+        seats_per_row (int): Number of seats in the row.
+        width (int): Block width.
+        engine (str, optional): 'python' or 'numpy'. Defaults to the engine chosen with set_engine.
+    Returns:
+        int or None: First seat number of the best block, or None if there is no candidate.
+    """
+    starts_mask &= (1 << max(0, seats_per_row - width + 1)) - 1
+    if not starts_mask or width <= 0:
+        return None
+    if (engine or _engine) == "numpy":
+        _load_numpy()
+        _, prefix = _distances(seats_per_row)
+        windows = prefix[width:] - prefix[:-width]
+        valid = _mask_bits(starts_mask, len(windows))
+        scores = np.where(valid, windows, np.iinfo(windows.dtype).max)
+        # argmin on the reversed scores returns the rightmost of the tied minima
+        return len(scores) - int(np.argmin(scores[::-1]))
+    center = (seats_per_row + 1) // 2  # same as booking.get_row_center
+    best = None
+    for start in mask_to_seat_nums(starts_mask):
+        score = (sum(abs(n - center) for n in range(start, start + width)), -start)
+        if best is None or score < best[0]:
+            best = (score, start)
+    return best[1]
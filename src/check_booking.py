@@ -4,8 +4,9 @@ check_booking.py
 This module will provide functions to check and display bookings for a given movie.
 """
 from src.logger import log_info, log_warning, log_error
-from src.movie import movie_display
-from src.booking import confirm_reservation
+from src.movie import movie_display, save_movie
+from src.movie_classes import Movie
+from src.booking import confirm_reservation, CANCELLED
 
 def unbook_reservation(movie_json, booking_id):
 	"""
@@ -14,7 +15,6 @@ def unbook_reservation(movie_json, booking_id):
 	Accepts either a Movie instance..
 	"""
 	log_info(f"Attempting to unbook reservation for booking ID: {booking_id}")
-	from src.movie_classes import Movie
 	# Accept both Movie instance and dict for compatibility
 	if isinstance(movie_json, Movie):
 		movie_obj = movie_json
@@ -25,7 +25,6 @@ def unbook_reservation(movie_json, booking_id):
 	if booking is not None:
 		booking.status = 'R'
 		log_info(f"Booking {booking_id} status set to 'R'.")
-		from src.movie import save_movie
 		save_movie(movie_obj)
 	else:
 		log_warning(f"Booking ID {booking_id} not found in movie bookings.")
@@ -41,7 +40,6 @@ def view_booking(movie_json, booking_id):
 	Accepts only a Movie instance .
 	"""
 	log_info(f"Viewing booking for ID: {booking_id}")
-	from src.movie_classes import Movie
 	# Accept only Movie instance
 	if isinstance(movie_json, Movie):
 		movie_obj = movie_json
@@ -49,6 +47,12 @@ def view_booking(movie_json, booking_id):
 		log_error("movie_json is not a Movie instance.")
 		return movie_json
 	print(f"\nBooking ID: {booking_id}")
+	booking = movie_obj.get_booking(booking_id)
+	if booking is not None and booking.status == CANCELLED:
+		# Highlighting would revive the seats of a cancelled booking
+		print("This booking has been cancelled.")
+		print(movie_display(movie_obj))
+		return movie_obj
 	movie_obj = unbook_reservation(movie_obj, booking_id)
 	print(movie_display(movie_obj))
 	movie_obj = confirm_reservation(movie_obj, booking_id)
@@ -0,0 +1,338 @@
+"""
+hall_layout.py
+--------------
+This module describes the floor plan of an auditorium: aisles, removed seats, wheelchair spaces and seat categories.
+A HallLayout is compiled once into per-row bitmasks (which seats exist) and an adjacency mask
+(which neighbouring seats are really side by side), so allocators can check contiguity and
+find blocks with bit operations even when the hall is not a perfect rectangle.
+
+Layouts are immutable flyweights: HallLayout.shared() interns one instance per auditorium definition,
+and every showing in that auditorium references it, keeping only its own occupancy bits and bookings.
+"""
+
+import weakref
+from types import MappingProxyType
+
+from src.occupancy import seat_position, block_starts, mask_to_seat_nums, popcount
+
+STANDARD = "standard"
+ACCESSIBLE = "accessible"
+
+_SHARED_LAYOUTS = weakref.WeakValueDictionary()
+
+
+def centrality_key(seat_num, seats_per_row):
+    """
+    Sort key for a seat number by centrality in its row (most central first, rightmost in tie).
+    Both middle seats of an even row count as fully central.
+    Args:
+        seat_num (int): Seat number (1-based).
+        seats_per_row (int): Number of seats per row.
+    Returns:
+        tuple: (distance from center, -seat_num).
+    """
+    if seats_per_row % 2 == 0:
+        center_left = seats_per_row // 2
+        if seat_num == center_left or seat_num == center_left + 1:
+            return (0, -seat_num)
+        return (abs(seat_num - (seats_per_row / 2 + 0.5)), -seat_num)
+    return (abs(seat_num - (seats_per_row + 1) // 2), -seat_num)
+
+
+class HallLayout:
+    """
+    Floor plan of a hall with `rows` rows of up to `seats_per_row` seats. Instances are read-only once built;
+    use HallLayout.shared() to get the interned instance for a definition.
+    Attributes:
+        rows (int): Number of rows.
+        seats_per_row (int): Number of seat positions per row.
+        aisles (tuple): Seat numbers followed by an aisle (e.g. (4,) puts an aisle between seats 4 and 5).
+        removed (frozenset): Seat labels that do not exist.
+        wheelchair (frozenset): Seat labels that are wheelchair spaces.
+        full_mask (int): Mask with one bit per seat position in a row.
+        seat_masks (list): Per-row masks of seats that exist.
+        wheelchair_masks (list): Per-row masks of wheelchair spaces.
+        link_masks (list): Per-row masks where bit n-1 is set if seats n and n+1 both exist and no aisle separates them.
+        capacity (int): Number of seats that exist.
+        categories (dict): Category definitions as given (category name -> row letters or seat labels).
+        category_masks (dict): Category name -> per-row masks of the seats in that category.
+        category_capacity (dict): Category name -> number of seats in that category.
+        labels (tuple): Per-row tuples of the labels of seats that exist, left to right.
+        row_order (tuple): Per-row tuples of seat labels ordered by centrality.
+        centrality_order (tuple): Every seat label, row by row, each row ordered by centrality.
+    """
+    def __init__(self, rows, seats_per_row, aisles=(), removed=(), wheelchair=(), categories=None):
+        """
+        Initialize and compile a HallLayout.
+        Args:
+            rows (int): Number of rows.
+            seats_per_row (int): Number of seat positions per row.
+            aisles (iterable, optional): Seat numbers followed by an aisle.
+            removed (iterable, optional): Seat labels that do not exist.
+            wheelchair (iterable, optional): Seat labels that are wheelchair spaces.
+            categories (dict, optional): Category name -> list of row letters (whole rows) or seat labels.
+                Seats in no category are 'standard'; uncategorised wheelchair spaces are 'accessible'.
+        Seat labels outside the grid are ignored.
+        """
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        self.aisles = tuple(sorted(set(a for a in aisles if 0 < a < seats_per_row)))
+        self.removed = frozenset(s for s in (s.upper() for s in removed) if self._in_bounds(s))
+        self.wheelchair = frozenset(s for s in (s.upper() for s in wheelchair) if self._in_bounds(s)) - self.removed
+        self.full_mask = (1 << seats_per_row) - 1
+        self.seat_masks = [self.full_mask] * rows
+        for seat in self.removed:
+            row_idx, num = seat_position(seat)
+            self.seat_masks[row_idx] &= ~(1 << (num - 1))
+        self.wheelchair_masks = [0] * rows
+        for seat in self.wheelchair:
+            row_idx, num = seat_position(seat)
+            self.wheelchair_masks[row_idx] |= 1 << (num - 1)
+        aisle_mask = 0
+        for a in self.aisles:
+            aisle_mask |= 1 << (a - 1)
+        # Seat n links to n+1 when both exist and no aisle sits between them
+        self.link_masks = [m & (m >> 1) & ~aisle_mask for m in self.seat_masks]
+        self.capacity = sum(popcount(m) for m in self.seat_masks)
+        self.categories = {name: tuple(t.upper() for t in targets) for name, targets in (categories or {}).items()}
+        self._compile_categories()
+        self.labels = tuple(
+            tuple(f"{chr(ord('A') + i)}{n}" for n in mask_to_seat_nums(mask)) for i, mask in enumerate(self.seat_masks)
+        )
+        self.row_order = tuple(
+            tuple(sorted(row, key=lambda s: centrality_key(int(s[1:]), seats_per_row))) for row in self.labels
+        )
+        self.centrality_order = tuple(seat for row in self.row_order for seat in row)
+        # Freeze: lists become tuples and dicts read-only views, so a shared layout cannot be changed by one showing
+        self.seat_masks = tuple(self.seat_masks)
+        self.wheelchair_masks = tuple(self.wheelchair_masks)
+        self.link_masks = tuple(self.link_masks)
+        self.categories = MappingProxyType(self.categories)
+        self.category_masks = MappingProxyType({name: tuple(m) for name, m in self.category_masks.items()})
+        self.category_capacity = MappingProxyType(self.category_capacity)
+        self._seat_categories = tuple(tuple(row) for row in self._seat_categories)
+        self._category_seats = MappingProxyType(self._category_seats)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("HallLayout is immutable")
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        """Pickle and copy as the interned layout for the same definition."""
+        return (_shared_from_dict, (self.rows, self.seats_per_row, self.to_dict()))
+
+    @classmethod
+    def shared(cls, rows, seats_per_row, aisles=(), removed=(), wheelchair=(), categories=None):
+        """
+        Return the interned HallLayout for a definition, building it only the first time it is requested.
+        Every screening in the same auditorium gets the same instance.
+        Args:
+            rows (int): Number of rows.
+            seats_per_row (int): Number of seat positions per row.
+            aisles (iterable, optional): Seat numbers followed by an aisle.
+            removed (iterable, optional): Seat labels that do not exist.
+            wheelchair (iterable, optional): Seat labels that are wheelchair spaces.
+            categories (dict, optional): Category name -> list of row letters or seat labels.
+        Returns:
+            HallLayout: The shared layout.
+        """
+        key = (
+            rows,
+            seats_per_row,
+            tuple(sorted(set(aisles))),
+            frozenset(s.upper() for s in removed),
+            frozenset(s.upper() for s in wheelchair),
+            tuple((name, tuple(t.upper() for t in targets)) for name, targets in (categories or {}).items()),
+        )
+        layout = _SHARED_LAYOUTS.get(key)
+        if layout is None:
+            layout = cls(rows, seats_per_row, aisles, removed, wheelchair, categories)
+            _SHARED_LAYOUTS[key] = layout
+        return layout
+
+    def _compile_categories(self):
+        """Build the per-category row masks, capacities and the per-seat category table."""
+        remaining = list(self.seat_masks)
+        self.category_masks = {}
+        for name, targets in self.categories.items():
+            masks = [0] * self.rows
+            for target in targets:
+                if len(target) == 1:
+                    row_idx = ord(target) - ord('A')
+                    if 0 <= row_idx < self.rows:
+                        masks[row_idx] = self.full_mask
+                elif self._in_bounds(target):
+                    row_idx, num = seat_position(target)
+                    masks[row_idx] |= 1 << (num - 1)
+            # A seat belongs to the first category that claims it
+            masks = [m & r for m, r in zip(masks, remaining)]
+            remaining = [r & ~m for r, m in zip(remaining, masks)]
+            self.category_masks[name] = masks
+        if ACCESSIBLE not in self.category_masks:
+            masks = [w & r for w, r in zip(self.wheelchair_masks, remaining)]
+            remaining = [r & ~m for r, m in zip(remaining, masks)]
+            self.category_masks[ACCESSIBLE] = masks
+        self.category_masks[STANDARD] = [r | m for r, m in zip(remaining, self.category_masks.get(STANDARD, [0] * self.rows))]
+        self.category_capacity = {name: sum(popcount(m) for m in masks) for name, masks in self.category_masks.items()}
+        self._seat_categories = [[None] * self.seats_per_row for _ in range(self.rows)]
+        self._category_seats = {}
+        for name, masks in self.category_masks.items():
+            labels = []
+            for row_idx, mask in enumerate(masks):
+                for num in mask_to_seat_nums(mask):
+                    self._seat_categories[row_idx][num - 1] = name
+                    labels.append(f"{chr(ord('A') + row_idx)}{num}")
+            self._category_seats[name] = frozenset(labels)
+
+    def _in_bounds(self, seat):
+        """Return True if a seat label falls inside the rows x seats_per_row grid."""
+        row_idx, num = seat_position(seat)
+        return 0 <= row_idx < self.rows and 1 <= num <= self.seats_per_row
+
+    @classmethod
+    def from_dict(cls, rows, seats_per_row, data):
+        """
+        Return the shared HallLayout for a layout dictionary.
+        Args:
+            rows (int): Number of rows.
+            seats_per_row (int): Number of seat positions per row.
+            data (dict or None): Dictionary with optional keys 'aisles', 'removed', 'wheelchair' and 'categories'.
+        Returns:
+            HallLayout: The interned layout.
+        """
+        data = data or {}
+        return cls.shared(
+            rows,
+            seats_per_row,
+            aisles=data.get("aisles", ()),
+            removed=data.get("removed", ()),
+            wheelchair=data.get("wheelchair", ()),
+            categories=data.get("categories"),
+        )
+
+    def to_dict(self):
+        """
+        Convert the layout definition to a dictionary (geometry is stored on the Movie).
+        Returns:
+            dict: Dictionary with keys 'aisles', 'removed', 'wheelchair' and, if any are defined, 'categories'.
+        """
+        data = {
+            "aisles": list(self.aisles),
+            "removed": sorted(self.removed),
+            "wheelchair": sorted(self.wheelchair),
+        }
+        if self.categories:
+            data["categories"] = {name: list(targets) for name, targets in self.categories.items()}
+        return data
+
+    def is_rectangular(self):
+        """
+        Returns:
+            bool: True if every seat exists and there are no aisles, wheelchair spaces or categories.
+        """
+        return not (self.aisles or self.removed or self.wheelchair or self.categories)
+
+    def seat_category(self, row_idx, seat_num):
+        """
+        Look up the category of a seat in O(1).
+        Args:
+            row_idx (int): Row index (0 is row A).
+            seat_num (int): Seat number (1-based).
+        Returns:
+            str or None: The category name, or None if the seat does not exist.
+        """
+        return self._seat_categories[row_idx][seat_num - 1]
+
+    def category_seats(self, category):
+        """
+        Return the labels of every seat in a category.
+        Args:
+            category (str): The category name.
+        Returns:
+            frozenset: Seat labels in the category (empty for an unknown category).
+        """
+        return self._category_seats.get(category, frozenset())
+
+    def has_seat(self, row_idx, seat_num):
+        """
+        Check whether a seat position exists in the hall.
+        Args:
+            row_idx (int): Row index (0 is row A).
+            seat_num (int): Seat number (1-based).
+        Returns:
+            bool: True if the seat exists.
+        """
+        return 0 <= row_idx < self.rows and 1 <= seat_num <= self.seats_per_row and bool(self.seat_masks[row_idx] >> (seat_num - 1) & 1)
+
+    def is_adjacent(self, row_idx, seat_num):
+        """
+        Check whether seat_num and seat_num + 1 in a row are side by side.
+        Args:
+            row_idx (int): Row index (0 is row A).
+            seat_num (int): Seat number (1-based) of the left seat.
+        Returns:
+            bool: True if the two seats exist and are not separated by an aisle.
+        """
+        return seat_num >= 1 and bool(self.link_masks[row_idx] >> (seat_num - 1) & 1)
+
+    def block_starts(self, row_idx, free_mask, width):
+        """
+        Return a mask of seats that start `width` free, mutually adjacent seats in a row.
+        Args:
+            row_idx (int): Row index (0 is row A).
+            free_mask (int): Row mask of free seats.
+            width (int): Required block width.
+        Returns:
+            int: Mask of valid block start positions.
+        """
+        free = free_mask & self.seat_masks[row_idx]
+        if width <= 1:
+            return free if width == 1 else 0
+        links = free & (free >> 1) & self.link_masks[row_idx]
+        return block_starts(links, width - 1)
+
+    def runs(self, row_idx, free_mask):
+        """
+        Split the free seats of a row into runs of mutually adjacent seats.
+        Args:
+            row_idx (int): Row index (0 is row A).
+            free_mask (int): Row mask of free seats.
+        Returns:
+            list: (first, last) seat number pairs, left to right.
+        """
+        free = free_mask & self.seat_masks[row_idx]
+        links = self.link_masks[row_idx]
+        runs = []
+        for n in mask_to_seat_nums(free):
+            if runs and runs[-1][1] == n - 1 and links >> (n - 2) & 1:
+                runs[-1][1] = n
+            else:
+                runs.append([n, n])
+        return [(first, last) for first, last in runs]
+
+    def longest_run(self, row_idx, free_mask):
+        """
+        Length of the largest block of free, mutually adjacent seats in a row.
+        Args:
+            row_idx (int): Row index (0 is row A).
+            free_mask (int): Row mask of free seats.
+        Returns:
+            int: Largest block width, 0 if the row has no free seat.
+        """
+        free = free_mask & self.seat_masks[row_idx]
+        if not free:
+            return 0
+        # A run of w seats is w - 1 consecutive linked pairs; erode the pair mask until it is empty
+        pairs = free & (free >> 1) & self.link_masks[row_idx]
+        width = 1
+        while pairs:
+            pairs &= pairs >> 1
+            width += 1
+        return width
+
+
+def _shared_from_dict(rows, seats_per_row, data):
+    """Unpickling helper: return the interned layout for a definition."""
+    return HallLayout.from_dict(rows, seats_per_row, data)
@@ -0,0 +1,183 @@
+"""
+idempotency.py
+--------------
+This module provides deduplication of booking commands by client idempotency key.
+A retried command carrying a key that was already served gets the original result back instead of
+booking again. Each entry also stores a fingerprint of the request (the showing and the command's
+arguments), so a key reused for a different request raises IdempotencyConflict instead of returning
+another request's result. Keys live in a bounded, insertion-ordered cache with a time-to-live: lookups
+are one dict access, and expired or excess entries are evicted from the oldest end. Every stored result
+is also written to the booking journal, so deduplication survives a restart.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from src.journal import BookingJournal
+from src.logger import log_info, log_warning
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+
+_default_cache = None
+
+
+class IdempotencyConflict(ValueError):
+    """Raised when an idempotency key is reused for a different command or request."""
+
+
+def request_fingerprint(*parts):
+    """
+    Fingerprint a request, e.g. the showing (title and hall dimensions) and the command's arguments.
+    Args:
+        *parts: JSON-serialisable parts of the request (tuples count as lists).
+    Returns:
+        str: A short hex digest; equal requests give equal fingerprints.
+    """
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()[:32]
+
+
+class IdempotencyCache:
+    """
+    Bounded TTL cache of command results by idempotency key, persisted through a BookingJournal.
+    Attributes:
+        journal (BookingJournal or None): Journal receiving an 'idempotency' event for every stored result.
+        ttl (float): Seconds a key is remembered.
+        max_entries (int): Maximum number of keys kept.
+    """
+    def __init__(self, journal=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        """
+        Initialize an empty IdempotencyCache.
+        Args:
+            journal (BookingJournal, optional): Journal used to persist and reload entries. None keeps them in memory only.
+            ttl (float, optional): Seconds a key is remembered.
+            max_entries (int, optional): Maximum number of keys kept.
+            clock (callable, optional): Returns the current Unix time.
+        """
+        self.journal = journal
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, now):
+        """Drop expired entries from the oldest end, then the oldest ones beyond max_entries."""
+        entries = self._entries
+        while entries and next(iter(entries.values()))[0] <= now:
+            entries.popitem(last=False)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _entry(self, key):
+        """Return the unexpired (expires, command, fingerprint, result) entry of a key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            self._evict(self._clock())
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def get(self, key, command, fingerprint=None):
+        """
+        Look up the stored result of a command.
+        Args:
+            key (str): The client idempotency key.
+            command (str): The command name, e.g. 'cancel'. A key reused for another command is a conflict.
+            fingerprint (str, optional): Fingerprint of the request; a key stored for another request is a conflict.
+        Returns:
+            tuple: (found, result). found is False for an unknown or expired key.
+        Raises:
+            IdempotencyConflict: If the key was already used for another command or a different request.
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return False, None
+        _, stored_command, stored_fingerprint, result = entry
+        if stored_command != command:
+            log_warning(f"Idempotency key '{key}' was used for '{stored_command}', not '{command}'.")
+            raise IdempotencyConflict(f"Idempotency key '{key}' was already used for '{stored_command}'")
+        if fingerprint is not None and stored_fingerprint is not None and stored_fingerprint != fingerprint:
+            log_warning(f"Idempotency key '{key}' was used for a different '{command}' request.")
+            raise IdempotencyConflict(f"Idempotency key '{key}' was already used for a different request")
+        return True, result
+
+    def put(self, key, command, result, fingerprint=None):
+        """
+        Store the result of a command under its key and journal it.
+        Args:
+            key (str): The client idempotency key.
+            command (str): The command name.
+            result: The command's JSON-serialisable result.
+            fingerprint (str, optional): Fingerprint of the request, see request_fingerprint.
+        """
+        now = self._clock()
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, command, fingerprint, result)
+        self._evict(now)
+        if self.journal is not None:
+            self.journal.append("idempotency", key=key, command=command, fingerprint=fingerprint, result=result,
+                                expires=now + self.ttl)
+
+    def load(self):
+        """
+        Restore unexpired entries from the journal, e.g. after a restart.
+        Returns:
+            int: Number of keys restored.
+        """
+        if self.journal is None:
+            return 0
+        now = self._clock()
+        for record in self.journal.replay("idempotency"):
+            if record["expires"] > now:
+                self._entries.pop(record["key"], None)
+                self._entries[record["key"]] = (
+                    record["expires"], record["command"], record.get("fingerprint"), record["result"]
+                )
+        self._evict(now)
+        log_info(f"Restored {len(self._entries)} idempotency keys from {self.journal.path}.")
+        return len(self._entries)
+
+    def run(self, key, command, func, fingerprint=None):
+        """
+        Run a command once per key: return the stored result for a repeated key, else run and store it.
+        Failed commands (result None or empty) are not stored, since they changed nothing and may be retried.
+        Args:
+            key (str or None): The client idempotency key; None always runs the command.
+            command (str): The command name.
+            func (callable): Runs the command and returns its result.
+            fingerprint (str, optional): Fingerprint of the request, see request_fingerprint.
+        Returns:
+            The command's result.
+        Raises:
+            IdempotencyConflict: If the key was already used for another command or a different request.
+        """
+        if key is None:
+            return func()
+        found, result = self.get(key, command, fingerprint)
+        if found:
+            log_info(f"Idempotency key '{key}' already served for '{command}'; returning the original result.")
+            return result
+        result = func()
+        if result:
+            self.put(key, command, result, fingerprint)
+        return result
+
+
+def default_cache():
+    """
+    Return the process-wide IdempotencyCache, loading it from the default journal on first use.
+    Returns:
+        IdempotencyCache: The shared cache.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IdempotencyCache(BookingJournal())
+        _default_cache.load()
+    return _default_cache
@@ -0,0 +1,68 @@
+"""
+journal.py
+----------
+This module provides an append-only journal of booking events.
+Each event is one JSON object per line (JSON Lines), so appending costs one small write regardless of
+how many bookings a movie has, and the history can be replayed in order, e.g. to audit cancellations.
+"""
+
+import json
+import os
+import time
+
+from src.logger import log_info
+
+DEFAULT_JOURNAL_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'journal.jsonl'))
+
+
+class BookingJournal:
+    """
+    Append-only JSON Lines journal of booking events.
+    Attributes:
+        path (str): Path of the journal file.
+    """
+    def __init__(self, path=None):
+        """
+        Initialize a BookingJournal.
+        Args:
+            path (str, optional): Journal file path. Defaults to logs/journal.jsonl.
+        """
+        self.path = path or DEFAULT_JOURNAL_FILE
+
+    def append(self, event, **fields):
+        """
+        Append one event to the journal.
+        Args:
+            event (str): Event type, e.g. 'cancel' or 'rebook'.
+            **fields: JSON-serialisable event details, e.g. movie, booking_id, seats.
+        Returns:
+            dict: The event as written, including its 'event' and 'ts' (Unix time) keys.
+        """
+        record = {"event": event, "ts": time.time()}
+        record.update(fields)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+        log_info(f"Journaled {event} event: {fields}")
+        return record
+
+    def replay(self, event=None):
+        """
+        Read the journal back in order.
+        Args:
+            event (str, optional): Only return events of this type.
+        Returns:
+            list: Event dicts, oldest first. An unfinished last line (e.g. after a crash) is skipped.
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if event is None or record.get("event") == event:
+                    records.append(record)
+        return records
@@ -1,29 +1,328 @@
-
 """
 logger.py
 ---------
 This module provides logging utilities for the GIC Cinema Booking System.
-It configures a file-based logger and exposes helper functions for info, warning, and error logs.
+It exposes helper functions for info, warning, and error logs. Importing it has no side effects: the log
+directory and the file handler are set up by configure_logging(), which the application calls at start-up.
+Until then messages below WARNING are dropped cheaply and nothing is written.
+Logs go to one file per day (YYYY-MM-DD.log). The file rolls over at midnight and whenever it reaches a size
+limit: it is renamed to YYYY-MM-DD.<n>.log, which takes microseconds, and gzip-compressed to .log.gz on a
+background thread, so neither rotation nor compression holds up the thread that is logging. Files older than
+the retention period are deleted after each compression.
+Besides free-text messages, log_event() records structured events (an event name plus fields such as booking_id,
+movie, seats, duration_ms). Fields are only rendered if the record is written, and each event can be sampled:
+with a rate of 0.01 only one record in a hundred is kept, tagged with its sample_rate so counts can be scaled
+back up. With configure_logging(fmt='json') (or GIC_LOG_FORMAT=json) every line is a compact JSON object, so
+the logs load straight into a dataframe instead of being parsed with regexes.
 """
 
+import gzip
+import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import queue
+import random
+import re
+import shutil
+import threading
 
-LOG_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs')
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
-log_filename = datetime.now().strftime('%Y-%m-%d') + '.log'
-log_path = os.path.join(LOG_DIR, log_filename)
+LOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs'))
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_RETENTION_DAYS = 14
+# Log files: YYYY-MM-DD.log (active), YYYY-MM-DD.<n>.log (rotated), YYYY-MM-DD.<n>.log.gz (compressed)
+LOG_FILE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.log(\.gz)?$")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.FileHandler(log_path, mode='a')]  # Append mode
-)
+LOG_FORMATS = ("text", "json")
+# Environment variables overriding the log format and the sampling rates ('event=rate,event=rate')
+LOG_FORMAT_ENV = "GIC_LOG_FORMAT"
+LOG_SAMPLE_ENV = "GIC_LOG_SAMPLE"
+# Share of the records kept for high-volume events; other events are always kept
+DEFAULT_SAMPLE_RATES = {
+    "advanced.block_center": 0.01,
+    "advanced.contiguous_blocks": 0.01,
+}
 
 logger = logging.getLogger('gic-cbs')
+logger.addHandler(logging.NullHandler())  # no "last resort" output to stderr before configure_logging
+
+_log_path = None
+_sample_rates = dict(DEFAULT_SAMPLE_RATES)
+
+
+class LogCompressor:
+    """
+    Background thread gzip-compressing rotated log files and applying the retention period.
+    Attributes:
+        retention_days (int or None): Log files of days older than this are deleted; None keeps everything.
+    """
+    def __init__(self, retention_days=DEFAULT_RETENTION_DAYS):
+        """
+        Initialize a LogCompressor. The thread starts with the first submitted file.
+        Args:
+            retention_days (int, optional): Days of logs kept, today included.
+        """
+        self.retention_days = retention_days
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path):
+        """
+        Queue a closed log file for compression and return immediately.
+        Args:
+            path (str): Path of the rotated log file.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-compressor", daemon=True)
+                self._thread.start()
+        self._queue.put(path)
+
+    def join(self):
+        """
+        Wait until every queued file has been compressed.
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                compress_log(path)
+                if self.retention_days is not None:
+                    prune_logs(os.path.dirname(path), self.retention_days)
+            except OSError as e:
+                logger.warning(f"Could not compress log file {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def compress_log(path):
+    """
+    Gzip a log file to <path>.gz and delete the original. The archive is written under a temporary
+    name first, so an interrupted compression never leaves a truncated .gz behind.
+    Args:
+        path (str): Path of the log file.
+    Returns:
+        str: Path of the compressed file.
+    """
+    target = path + ".gz"
+    with open(path, 'rb') as src, gzip.open(target + ".tmp", 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(target + ".tmp", target)
+    os.remove(path)
+    return target
+
+def prune_logs(log_dir, retention_days, today=None):
+    """
+    Delete the log files of days older than the retention period.
+    Args:
+        log_dir (str): Directory of the log files.
+        retention_days (int): Days of logs kept, today included.
+        today (date, optional): Reference day. Defaults to today.
+    Returns:
+        list: Names of the deleted files.
+    """
+    cutoff = ((today or datetime.now().date()) - timedelta(days=retention_days - 1)).isoformat()
+    deleted = []
+    for name in os.listdir(log_dir):
+        match = LOG_FILE_PATTERN.match(name)
+        if match and match.group(1) < cutoff:
+            os.remove(os.path.join(log_dir, name))
+            deleted.append(name)
+    return deleted
+
+
+class RotatingDailyFileHandler(logging.FileHandler):
+    """
+    File handler writing to <log_dir>/YYYY-MM-DD.log and rolling over at midnight or at a size limit.
+    Rolled-over files are renamed to YYYY-MM-DD.<n>.log and handed to a LogCompressor.
+    Attributes:
+        log_dir (str): Directory of the log files.
+        max_bytes (int or None): Size at which the file rolls over; None only rolls over at midnight.
+        compressor (LogCompressor or None): Compresses rotated files; None leaves them uncompressed.
+    """
+    def __init__(self, log_dir, max_bytes=DEFAULT_MAX_BYTES, compressor=None, now=None):
+        """
+        Initialize a RotatingDailyFileHandler and queue any uncompressed log files left by earlier runs.
+        Args:
+            log_dir (str): Directory of the log files.
+            max_bytes (int, optional): Size limit of one file.
+            compressor (LogCompressor, optional): Compressor of rotated files.
+            now (datetime, optional): Current time, for the first file's date.
+        """
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.compressor = compressor
+        self._set_day(now or datetime.now())
+        logging.FileHandler.__init__(self, self._day_path(), mode='a')
+        self._size = os.path.getsize(self.baseFilename)
+        if compressor is not None:
+            for name in sorted(os.listdir(log_dir)):
+                match = LOG_FILE_PATTERN.match(name)
+                # Rotated files, and day files of earlier days (e.g. written by a process that never rolled over)
+                if match and not match.group(3) and (match.group(2) or match.group(1) < self._day):
+                    path = os.path.join(log_dir, name)
+                    if match.group(2) is None:
+                        path = self._rename_rotated(path, match.group(1))
+                    compressor.submit(path)
+
+    def _set_day(self, moment):
+        """Remember the day being written and the timestamp of the next midnight."""
+        self._day = moment.strftime('%Y-%m-%d')
+        midnight = datetime(moment.year, moment.month, moment.day) + timedelta(days=1)
+        self._next_midnight = midnight.timestamp()
+
+    def _day_path(self, day=None):
+        return os.path.join(self.log_dir, (day or self._day) + '.log')
+
+    def _rename_rotated(self, path, day):
+        """Rename a finished log file to the next free YYYY-MM-DD.<n>.log and return the new path."""
+        taken = [int(m.group(2)) for m in map(LOG_FILE_PATTERN.match, os.listdir(self.log_dir))
+                 if m and m.group(1) == day and m.group(2)]
+        target = os.path.join(self.log_dir, f"{day}.{max(taken, default=0) + 1}.log")
+        os.replace(path, target)
+        return target
+
+    def emit(self, record):
+        """
+        Write a record, rolling over first if its day has ended or the file is full.
+        Args:
+            record (logging.LogRecord): The record.
+        """
+        try:
+            if record.created >= self._next_midnight or (self.max_bytes and self._size >= self.max_bytes):
+                self.rollover(datetime.fromtimestamp(record.created))
+            message = self.format(record) + self.terminator
+            self.stream.write(message)
+            self.flush()
+            self._size += len(message)
+        except Exception:
+            self.handleError(record)
+
+    def rollover(self, now=None):
+        """
+        Close the current file, rename it for compression and open the file of the current day.
+        If another process sharing the file has already rotated it, the file is only reopened.
+        Args:
+            now (datetime, optional): Current time. Defaults to now.
+        """
+        now = now or datetime.now()
+        rotated = None
+        try:
+            # Another process logging to the same file may have rotated it already; then only reopen
+            if os.path.samestat(os.fstat(self.stream.fileno()), os.stat(self.baseFilename)):
+                rotated = self.baseFilename
+        except FileNotFoundError:
+            pass
+        self.stream.close()
+        if rotated is not None:
+            rotated = self._rename_rotated(rotated, self._day)
+        self._set_day(now)
+        self.baseFilename = self._day_path()
+        self.stream = self._open()
+        self._size = os.path.getsize(self.baseFilename)
+        if rotated is not None and self.compressor is not None:
+            self.compressor.submit(rotated)
+
+
+class _Event:
+    """Message of a structured record, rendered as 'event key=value ...' only when a text line is written."""
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event, fields):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join([self.event] + [f"{key}={value}" for key, value in self.fields.items()])
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one compact JSON object: ts, level and event, then the event's fields.
+    Free-text messages become event 'message' with the text in 'msg'.
+    """
+    def format(self, record):
+        """
+        Args:
+            record (logging.LogRecord): The record.
+        Returns:
+            str: The JSON line (without newline).
+        """
+        data = {"ts": round(record.created, 6), "level": record.levelname}
+        if isinstance(record.msg, _Event):
+            data["event"] = record.msg.event
+            data.update(record.msg.fields)
+        else:
+            data["event"] = "message"
+            data["msg"] = record.getMessage()
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def set_sample_rate(event, rate):
+    """
+    Set the share of an event's records that are written.
+    Args:
+        event (str): Event name, e.g. 'advanced.block_center'.
+        rate (float): Between 0 (drop all) and 1 (keep all).
+    """
+    _sample_rates[event] = min(1.0, max(0.0, float(rate)))
+
+def parse_sample_rates(spec):
+    """
+    Parse sampling rates written as 'event=rate,event=rate'.
+    Args:
+        spec (str): The specification, e.g. 'advanced.block_center=0.1'.
+    Returns:
+        dict: Event name -> rate. Malformed items are skipped.
+    """
+    rates = {}
+    for item in (spec or "").split(","):
+        event, _, rate = item.partition("=")
+        try:
+            rates[event.strip()] = float(rate)
+        except ValueError:
+            continue
+    return rates
+
+def configure_logging(log_dir=None, level=logging.INFO, max_bytes=DEFAULT_MAX_BYTES,
+                      retention_days=DEFAULT_RETENTION_DAYS, compress=True, fmt=None, sample_rates=None):
+    """
+    Set up file logging: one file per day in the log directory, appended to if the app is restarted,
+    rotated at midnight and at max_bytes. Calling it again has no effect.
+    Args:
+        log_dir (str, optional): Directory of the log files. Defaults to the logs directory under the project root.
+        level (int, optional): Minimum level written.
+        max_bytes (int, optional): Size at which a file rolls over; None only rolls over at midnight.
+        retention_days (int, optional): Days of logs kept; None keeps everything.
+        compress (bool, optional): Gzip rotated files in the background.
+        fmt (str, optional): 'text' or 'json'. Defaults to GIC_LOG_FORMAT, else 'text'.
+        sample_rates (dict, optional): Event name -> share of records kept, on top of the defaults
+            and of GIC_LOG_SAMPLE.
+    Returns:
+        str: Path of the current log file.
+    """
+    global _log_path
+    if _log_path is not None:
+        return _log_path
+    log_dir = log_dir or LOG_DIR
+    os.makedirs(log_dir, exist_ok=True)
+    compressor = LogCompressor(retention_days) if compress else None
+    handler = RotatingDailyFileHandler(log_dir, max_bytes=max_bytes, compressor=compressor)
+    fmt = fmt or os.environ.get(LOG_FORMAT_ENV, "text")
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{fmt}', expected one of {LOG_FORMATS}")
+    for event, rate in {**parse_sample_rates(os.environ.get(LOG_SAMPLE_ENV)), **(sample_rates or {})}.items():
+        set_sample_rate(event, rate)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(LOG_FORMAT))
+    logging.basicConfig(level=level, handlers=[handler])
+    _log_path = handler.baseFilename
+    return _log_path
 
 def log_info(message):
     """
@@ -47,4 +346,21 @@ def log_error(message):
     Args:
         message (str): The message to log.
     """
-    logger.error(message)
\ No newline at end of file
+    logger.error(message)
+
+def log_event(event, level=logging.INFO, **fields):
+    """
+    Log a structured event, subject to the event's sampling rate.
+    Args:
+        event (str): Event name, e.g. 'booking.confirmed'.
+        level (int, optional): Log level.
+        **fields: JSON-serialisable details, e.g. booking_id, movie, seats, duration_ms.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = _sample_rates.get(event)
+    if rate is not None and rate < 1.0:
+        if rate <= 0.0 or random.random() >= rate:
+            return
+        fields["sample_rate"] = rate
+    logger.log(level, _Event(event, fields))
@@ -1,4 +1,3 @@
-
 """
 main.py
 -------
@@ -6,7 +5,12 @@ Entry point and main user interface loop for the GIC Cinema Booking System.
 Handles movie creation, main menu, and ticket booking flows.
 """
 
-from src import booking_advanced, logger, movie, booking, check_booking
+import argparse
+import math
+import os
+import sys
+
+from src import booking_advanced, logger, movie, booking, check_booking, metrics, persistence, tracing
 from src.movie_classes import Movie
 
 from src.validation import movie_validation, is_positive_integer, ticket_num_validation, is_valid_booking
@@ -14,6 +18,17 @@ from src.validation import movie_validation, is_positive_integer, ticket_num_val
 
 # Constant for repeated invalid input message
 INVALID_TICKET_INPUT_MSG = "Invalid input. Please enter a valid number of tickets or blank to go back."
+# Environment variable holding the port of the Prometheus metrics endpoint; unset disables it
+METRICS_PORT_ENV = "GIC_METRICS_PORT"
+# Environment variables switching on the profiling mode when set to 1
+PROFILE_ENV = "GIC_PROFILE"
+PROFILE_MEMORY_ENV = "GIC_PROFILE_MEMORY"
+# Environment variable switching on booking flow tracing when set to 1
+TRACE_ENV = "GIC_TRACE"
+# Environment variable holding the group commit window for movie saves in milliseconds; unset saves synchronously
+GROUP_COMMIT_ENV = "GIC_GROUP_COMMIT_MS"
+# Environment variable selecting the default allocator of the advanced booking mode: 'greedy' or 'optimised'
+SEATING_STRATEGY_ENV = "GIC_SEATING_STRATEGY"
 
 def prompt_movie_creation():
     """
@@ -64,13 +79,13 @@ def main_menu_loop(movie_data):
             logger.log_warning(f"Invalid menu selection: {choice}. Prompting again.")
             print("Invalid selection. Please try again.")
 
+@tracing.traced("main.booking_tickets_loop")
 def booking_tickets_loop(movie_data, mode):
     """
     Prompt the user to enter the number of tickets to book and handle booking logic.
     Args:
         movie_data (Movie): The current Movie instance.
     """
-    from src import booking
     while True:
         ticket_input = input("\nEnter number of tickets to book, or enter blank to go back to main menu:\n> ")
         logger.log_info(f"Booking prompt received input: '{ticket_input}'")
@@ -91,7 +106,9 @@ def booking_tickets_loop(movie_data, mode):
                 if mode == "standard":
                     movie_data = booking.book_ticket(movie_data, int(ticket_input))
                 elif mode == "advanced":
-                    movie_data = booking_advanced.book_ticket_advanced(movie_data, int(ticket_input))
+                    movie_data = booking_advanced.book_ticket_advanced(
+                        movie_data, int(ticket_input), strategy=seating_strategy_from_env()
+                    )
                 break
             else:
                 logger.log_warning(f"Ticket input '{ticket_input}' failed ticket_num_validation.")
@@ -135,17 +152,142 @@ def check_booking_loop(movie_data):
             logger.log_warning(f"Booking ID '{booking_id.strip()}' is invalid.")
             print(f"Booking ID '{booking_id.strip()}' not found. Please try again.")
 
-def main():
+def parse_args(argv=None):
     """
-    Main entry point for the GIC Cinema Booking System application.
-    Initializes the app, prompts for movie creation, and starts the main menu loop.
+    Parse the command line options of the application.
+    Profiling and tracing can also be switched on with the GIC_PROFILE, GIC_PROFILE_MEMORY and GIC_TRACE
+    environment variables (set to 1).
+    Args:
+        argv (list, optional): Arguments without the program name. None means no arguments.
+    Returns:
+        argparse.Namespace: Options 'profile', 'profile_memory', 'trace' and 'replay'.
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="GIC Cinema Booking System")
+    parser.add_argument("--profile", action="store_true", default=os.environ.get(PROFILE_ENV) == "1",
+                        help="profile the session with cProfile and write flamegraph-ready reports to the logs directory")
+    parser.add_argument("--profile-memory", action="store_true", default=os.environ.get(PROFILE_MEMORY_ENV) == "1",
+                        help="also trace allocations with tracemalloc (implies --profile)")
+    parser.add_argument("--trace", action="store_true", default=os.environ.get(TRACE_ENV) == "1",
+                        help="record booking flow spans to logs/traces.jsonl")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="run headless, reading the session's inputs from FILE, one per line")
+    options = parser.parse_args(argv or [])
+    options.profile = options.profile or options.profile_memory
+    return options
+
+def metrics_port_from_env():
+    """
+    Read the metrics endpoint port from the environment.
+    Returns:
+        int or None: The port, or None if it is unset or not a valid port number (a warning is logged).
+    """
+    value = os.environ.get(METRICS_PORT_ENV)
+    if not value:
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        port = -1
+    if not 0 <= port <= 65535:
+        logger.log_warning(f"Ignoring {METRICS_PORT_ENV}={value!r}: not a port number; metrics endpoint disabled.")
+        return None
+    return port
+
+def group_commit_delay_from_env():
+    """
+    Read the group commit window from the environment.
+    Returns:
+        float or None: The window in seconds, or None if it is unset or not a finite, non-negative number of
+            milliseconds (a warning is logged).
+    """
+    value = os.environ.get(GROUP_COMMIT_ENV)
+    if not value:
+        return None
+    try:
+        delay_ms = float(value)
+    except ValueError:
+        delay_ms = -1.0
+    if not (math.isfinite(delay_ms) and delay_ms >= 0):
+        logger.log_warning(
+            f"Ignoring {GROUP_COMMIT_ENV}={value!r}: not a number of milliseconds; saves stay synchronous."
+        )
+        return None
+    return delay_ms / 1000
+
+def seating_strategy_from_env():
+    """
+    Read the default allocator of the advanced booking mode from the environment.
+    Returns:
+        str: 'greedy' (the default) or 'optimised'; an unknown value logs a warning and gives 'greedy'.
+    """
+    value = os.environ.get(SEATING_STRATEGY_ENV, "").strip().lower()
+    if not value:
+        return "greedy"
+    if value not in booking_advanced.SEATING_STRATEGIES:
+        logger.log_warning(f"Ignoring {SEATING_STRATEGY_ENV}={value!r}: expected one of "
+                           f"{', '.join(booking_advanced.SEATING_STRATEGIES)}; using greedy seating.")
+        return "greedy"
+    return value
+
+def run_session():
+    """
+    Run one interactive session: start-up, movie creation and the main menu loop.
     """
-    from src import logger
     logger.log_info("GIC CBS application started.")
+    state_dir = os.path.dirname(movie.DEFAULT_MOVIE_FILE)
+    if os.path.isdir(state_dir):
+        persistence.remove_temp_files(state_dir)
+    group_commit_delay = group_commit_delay_from_env()
+    if group_commit_delay is not None:
+        persistence.enable_group_commit(group_commit_delay)
+    metrics_port = metrics_port_from_env()
+    if metrics_port is not None:
+        from src import metrics_server  # http.server is only loaded when the endpoint is enabled
+        metrics_server.start_metrics_server(metrics_port)
     print("\nWelcome to the GIC CBS application!")
     movie_obj = prompt_movie_creation()
+    if metrics_port is not None:
+        metrics_server.watch_movie(movie_obj)
     main_menu_loop(movie_obj)
 
+def run_replay(path):
+    """
+    Run a session headlessly with its inputs read from a file; the session ends when the inputs run out.
+    Args:
+        path (str): File with one input per line.
+    """
+    with open(path) as replay:
+        stdin, sys.stdin = sys.stdin, replay
+        try:
+            run_session()
+        except EOFError:
+            logger.log_info(f"Replay inputs from {path} exhausted; session ended.")
+        finally:
+            sys.stdin = stdin
+
+def main(argv=None):
+    """
+    Main entry point for the GIC Cinema Booking System application.
+    Initializes the app, prompts for movie creation, and starts the main menu loop,
+    optionally traced, under the profiler and/or replaying recorded inputs.
+    Args:
+        argv (list, optional): Command line arguments, see parse_args.
+    """
+    logger.configure_logging()
+    options = parse_args(argv)
+    if options.trace:
+        tracing.enable()
+    session = (lambda: run_replay(options.replay)) if options.replay else run_session
+    if not options.profile:
+        session()
+        return
+    from src.profiling import SessionProfiler  # cProfile/tracemalloc are only loaded in profiling mode
+    with SessionProfiler(memory=options.profile_memory) as profiler:
+        session()
+    print(f"\nProfile written to {profiler.paths['collapsed']}")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Only the real entry point writes logs/metrics.json at exit; main() called in-process (tests) does not
+    metrics.REGISTRY.dump_on_exit()
+    main(sys.argv[1:])
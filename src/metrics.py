@@ -0,0 +1,230 @@
+"""
+metrics.py
+----------
+This module provides a lightweight in-process metrics registry.
+Functions decorated with @timed('name') record a call counter, an error counter and a latency histogram;
+recording costs two perf_counter calls, a bisect into fixed bucket bounds and a few integer updates, so it
+can stay on in production. The registry can be dumped as a dict or JSON on demand, or once at exit.
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import time
+
+from src.logger import log_info
+
+# Latency bucket upper bounds in seconds, 10 microseconds to 10 seconds
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+DEFAULT_METRICS_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'metrics.json'))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values.
+    Attributes:
+        bounds (tuple): Bucket upper bounds, ascending; values above the last bound go to an overflow bucket.
+        counts (list): Number of observations per bucket (len(bounds) + 1 entries).
+        count (int): Number of observations.
+        total (float): Sum of observations.
+        max (float): Largest observation.
+    """
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        """
+        Initialize an empty Histogram.
+        Args:
+            bounds (tuple, optional): Bucket upper bounds in ascending order.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Record one value.
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket that contains it.
+        Args:
+            q (float): Quantile between 0 and 1.
+        Returns:
+            float: The estimate (the largest observation for the overflow bucket, 0 if empty).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: count, sum, max, mean, p50/p95/p99 estimates and cumulative bucket counts keyed by upper bound.
+        """
+        cumulative = {}
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class MetricsRegistry:
+    """
+    Named counters and latency histograms.
+    Attributes:
+        counters (dict): Counter name -> int.
+        histograms (dict): Histogram name -> Histogram.
+    """
+    def __init__(self):
+        """
+        Initialize an empty MetricsRegistry.
+        """
+        self.counters = {}
+        self.histograms = {}
+        self._exit_paths = set()
+
+    def increment(self, name, amount=1):
+        """
+        Add to a counter, creating it at 0.
+        Args:
+            name (str): Counter name.
+            amount (int, optional): Amount to add.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        """
+        Record a value in a histogram, creating it on first use.
+        Args:
+            name (str): Histogram name.
+            value (float): The observed value.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def timed(self, name):
+        """
+        Decorator recording '<name>.calls' and '<name>.errors' counters and a '<name>' latency histogram (seconds).
+        Args:
+            name (str): Operation name, e.g. 'booking.default_seating'.
+        Returns:
+            callable: The decorator.
+        """
+        calls_name = f"{name}.calls"
+        errors_name = f"{name}.errors"
+        perf_counter = time.perf_counter
+        counters = self.counters
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    counters[errors_name] = counters.get(errors_name, 0) + 1
+                    raise
+                finally:
+                    self.observe(name, perf_counter() - start)
+                    counters[calls_name] = counters.get(calls_name, 0) + 1
+            return wrapper
+        return decorator
+
+    def reset(self):
+        """
+        Clear every counter and histogram.
+        """
+        self.counters.clear()
+        self.histograms.clear()
+
+    def dump(self):
+        """
+        Returns:
+            dict: {'counters': {...}, 'histograms': {name: Histogram.to_dict()}} with names sorted.
+        """
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "histograms": {name: self.histograms[name].to_dict() for name in sorted(self.histograms)},
+        }
+
+    def dump_to(self, path=None):
+        """
+        Write the dump as JSON.
+        Args:
+            path (str, optional): Output file. Defaults to logs/metrics.json.
+        Returns:
+            str: The path written.
+        """
+        path = path or DEFAULT_METRICS_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.dump(), f, indent=2)
+        log_info(f"Metrics written to {path}.")
+        return path
+
+    def dump_on_exit(self, path=None):
+        """
+        Write the dump once when the interpreter exits. Registering the same path again has no effect.
+        Args:
+            path (str, optional): Output file. Defaults to logs/metrics.json.
+        """
+        path = path or DEFAULT_METRICS_FILE
+        if path not in self._exit_paths:
+            self._exit_paths.add(path)
+            atexit.register(self.dump_to, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def timed(name):
+    """
+    Decorator timing a function into the process-wide registry; see MetricsRegistry.timed.
+    Args:
+        name (str): Operation name.
+    Returns:
+        callable: The decorator.
+    """
+    return REGISTRY.timed(name)
+
+def increment(name, amount=1):
+    """
+    Add to a counter of the process-wide registry; see MetricsRegistry.increment.
+    Args:
+        name (str): Counter name.
+        amount (int, optional): Amount to add.
+    """
+    REGISTRY.increment(name, amount)
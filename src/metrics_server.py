@@ -0,0 +1,160 @@
+"""
+metrics_server.py
+-----------------
+This module exposes the metrics registry in the Prometheus text format over a small embedded HTTP listener
+(standard library only), for scraping by the cluster's Prometheus.
+The listener runs on daemon threads and only reads: every scrape works on copies of the registry's counters
+and histogram buckets and of the watched movies' booking lists, and never takes a lock, so serving a scrape
+never makes a booking wait.
+Exposed series:
+- gic_<counter>_total: counters, e.g. gic_booking_book_ticket_calls_total.
+- gic_<histogram>_seconds: latency histograms, e.g. gic_booking_default_seating_seconds (allocation)
+  and gic_movie_save_movie_seconds (persistence writes).
+- gic_seats{movie, state}: free/reserved/booked seats of every watched movie.
+- gic_log_queue_depth: records waiting in queueing log handlers (0 while logging is synchronous).
+"""
+
+import logging
+import re
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.logger import log_info, log_warning
+from src.metrics import REGISTRY
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 9100
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_WATCHED = weakref.WeakSet()
+
+
+def watch_movie(movie):
+    """
+    Report the seat counts of a movie on the metrics endpoint for as long as it is alive.
+    Args:
+        movie (Movie): The Movie instance.
+    """
+    _WATCHED.add(movie)
+
+def metric_name(name):
+    """
+    Convert a registry name such as 'booking.default_seating' into a Prometheus metric name.
+    Args:
+        name (str): The registry name.
+    Returns:
+        str: The name with a 'gic_' prefix and invalid characters replaced by underscores.
+    """
+    return "gic_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+def _label(value):
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def seat_counts(movie):
+    """
+    Count the free, reserved and booked seats of a movie from a copy of its bookings list.
+    Args:
+        movie (Movie): The Movie instance.
+    Returns:
+        dict: {'free': int, 'reserved': int, 'booked': int}.
+    """
+    booked = reserved = 0
+    for booking in list(movie.bookings):
+        if booking.status == "B":
+            booked += len(booking.seats)
+        elif booking.status == "R":
+            reserved += len(booking.seats)
+    return {"free": movie.layout.capacity - booked - reserved, "reserved": reserved, "booked": booked}
+
+def log_queue_depth():
+    """
+    Returns:
+        int: Records waiting in the queues of the application's queueing log handlers.
+    """
+    depth = 0
+    for log in (logging.getLogger(), logging.getLogger("gic-cbs")):
+        for handler in list(log.handlers):
+            queue = getattr(handler, "queue", None)
+            if queue is not None and hasattr(queue, "qsize"):
+                depth += queue.qsize()
+    return depth
+
+def render(registry=REGISTRY, movies=None):
+    """
+    Render the registry, the watched movies' seats and the log queue depth in the Prometheus text format.
+    Args:
+        registry (MetricsRegistry, optional): The registry to render.
+        movies (iterable, optional): Movies to report. Defaults to the watched movies.
+    Returns:
+        str: The exposition text.
+    """
+    lines = []
+    for name, value in sorted(dict(registry.counters).items()):
+        metric = metric_name(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, histogram in sorted(dict(registry.histograms).items()):
+        metric = metric_name(name) + "_seconds"
+        # The bucket copy is the source of truth for the count, so a scrape racing an observation stays consistent
+        counts, total = list(histogram.counts), histogram.total
+        lines.append(f"# TYPE {metric} histogram")
+        seen = 0
+        for bound, n in zip(histogram.bounds, counts):
+            seen += n
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {seen}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {sum(counts)}')
+        lines.append(f"{metric}_sum {total}")
+        lines.append(f"{metric}_count {sum(counts)}")
+    movies = list(_WATCHED if movies is None else movies)
+    if movies:
+        lines.append("# TYPE gic_seats gauge")
+        for movie in movies:
+            for state, value in seat_counts(movie).items():
+                lines.append(f'gic_seats{{movie="{_label(movie.title)}",state="{state}"}} {value}')
+    lines.append("# TYPE gic_log_queue_depth gauge")
+    lines.append(f"gic_log_queue_depth {log_queue_depth()}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics; everything else is 404."""
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render(self.registry).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep scrapes out of the application log."""
+
+
+def start_metrics_server(port=DEFAULT_PORT, host=DEFAULT_HOST, registry=REGISTRY):
+    """
+    Serve /metrics on a background daemon thread.
+    Args:
+        port (int, optional): TCP port; 0 picks a free one.
+        host (str, optional): Interface to bind.
+        registry (MetricsRegistry, optional): The registry to expose.
+    Returns:
+        ThreadingHTTPServer or None: The running server (stop it with shutdown()), or None if the port is unavailable.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        log_warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    log_info(f"Metrics endpoint serving on http://{host}:{server.server_address[1]}/metrics")
+    return server
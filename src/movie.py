@@ -1,4 +1,3 @@
-
 """
 movie.py
 --------
@@ -6,8 +5,21 @@ This module contains functions related to movie creation and management.
 """
 
 
+import json
+import os
+import weakref
+
+from src import persistence
 from src.logger import log_info, log_warning, log_error
 from src.movie_classes import Movie, Booking
+from src.hall_layout import HallLayout
+from src.metrics import timed
+from src.snapshot import SNAPSHOT_EXT, SnapshotError, decode_snapshot, encode_snapshot, verify_snapshot
+from src.tracing import traced
+
+DEFAULT_MOVIE_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'movie.json'))
+
+_DISPLAY_CACHES = weakref.WeakKeyDictionary()
 
 def create_movie(user_input):
     """
@@ -24,43 +36,63 @@ def create_movie(user_input):
     seats_per_row = int(parts[-1])
     return Movie(title, row, seats_per_row)
 
-def movie_available_seats(movie: Movie):
+def movie_available_seats(movie: Movie, category=None):
     """
-    Calculate the number of available (unbooked) seats for a Movie instance.
+    Calculate the number of available (neither reserved nor booked) seats for a Movie instance.
+    Reads the O(1) counters of the movie's occupancy index.
     Args:
         movie (Movie): The Movie instance.
+        category (str, optional): Only count seats in this seat category (e.g. 'premium').
     Returns:
         int: Number of available seats.
     """
     log_info(f"Calculating available seats for movie: {getattr(movie, 'title', 'Unknown')}")
-    total = movie.row * movie.seats_per_row
-    booked = 0
-    for booking in movie.bookings:
-        booked += len(booking.seats)
-    return total - booked
+    return movie.occupancy.available(category)
 
-def save_movie(movie):
+@traced("movie.save_movie")
+@timed("movie.save_movie")
+def save_movie(movie, movie_file=None):
     """
-    Save a Movie instance (or dict) to a JSON file in the logs directory.
+    Save a Movie instance (or dict) to a JSON file, by default logs/movie.json.
+    A path ending in '.gics' is written as a binary snapshot instead (see src.snapshot).
+    The file is replaced atomically, through the group commit writer when it is enabled (see src.persistence).
     Args:
         movie (Movie or dict): The Movie instance or dict to save.
+        movie_file (str, optional): Path of the JSON or snapshot file to write.
     """
-    if isinstance(movie, Movie):
-        movie_json = movie.to_dict()
-        title = movie.title
-    else:
-        movie_json = movie
-        title = movie.get('title', 'Unknown')
-    log_info(f"Saving movie JSON for '{title}' to logs/movie.json")
-    import os
-    import json
-    log_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs'))
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    movie_file = os.path.join(log_dir, 'movie.json')
-    with open(movie_file, 'w') as f:
-        json.dump(movie_json, f)
+    movie_file = movie_file or DEFAULT_MOVIE_FILE
+    title = movie.title if isinstance(movie, Movie) else movie.get('title', 'Unknown')
+    log_info(f"Saving movie '{title}' to {movie_file}")
+    if movie_file.endswith(SNAPSHOT_EXT):
+        persistence.write(movie_file, encode_snapshot(movie))
+        return
+    movie_json = movie.to_dict() if isinstance(movie, Movie) else movie
+    persistence.write(movie_file, json.dumps(movie_json))
+
+def load_movie(movie_file):
+    """
+    Load a Movie instance from a JSON or snapshot ('.gics') file written by save_movie.
+    Args:
+        movie_file (str): Path of the file to read.
+    Returns:
+        Movie: The loaded Movie instance.
+    Raises:
+        SnapshotError: If a snapshot file is torn or corrupted (its checksum does not match).
+    """
+    log_info(f"Loading movie from {movie_file}")
+    persistence.flush()  # read our own queued writes
+    if movie_file.endswith(SNAPSHOT_EXT):
+        with open(movie_file, 'rb') as f:
+            data = f.read()
+        if not verify_snapshot(data):
+            log_error(f"Snapshot {movie_file} is torn or corrupted; refusing to load it.")
+            raise SnapshotError(f"Snapshot {movie_file} failed verification")
+        return decode_snapshot(data)
+    with open(movie_file) as f:
+        return Movie.from_dict(json.load(f))
 
+@traced("movie.movie_display")
+@timed("movie.movie_display")
 def movie_display(movie):
     """
     Build a string representation of the movie seating chart for display.
@@ -80,20 +112,25 @@ def movie_display(movie):
         seat_map = build_seat_display_map(movie)
         title = movie.get('title', 'Unknown')
     log_info(f"Building display for movie: {title}")
+    aisles = movie_layout(movie).aisles
+    columns = seats_per_row + len(aisles)
     lines = []
     lines.append("Selected seats:\n")
     screen_text = "S C R E E N"
     if seats_per_row > 10:
-        total_width = seats_per_row * 3 + 1
+        total_width = columns * 3 + 1
     else:
-        total_width = seats_per_row * 2 + 2
+        total_width = columns * 2 + 2
     screen_centered = screen_text.center(total_width)
     lines.append(screen_centered)
     lines.append("-" * total_width)
     seat_sep = '  ' if seats_per_row > 10 else ' '
     for i in range(rows-1, -1, -1):
         row_letter = chr(ord('A') + i)
-        row_str = row_letter + ' ' + seat_sep.join(seat_map[row_letter])
+        cells = seat_map[row_letter]
+        if aisles:
+            cells = insert_aisles(cells, aisles, ' ')
+        row_str = row_letter + ' ' + seat_sep.join(cells)
         lines.append(row_str)
     footer = '  '
     for n in range(1, seats_per_row + 1):
@@ -101,9 +138,40 @@ def movie_display(movie):
             footer += str(n) + '  '
         else:
             footer += str(n) + ' '
+        if n in aisles:
+            footer += '   ' if seats_per_row > 10 else '  '
     lines.append(footer.rstrip())
     return '\n'.join(lines)
 
+def movie_layout(movie):
+    """
+    Return the HallLayout of a Movie instance or movie dict.
+    Args:
+        movie (Movie or dict): The Movie instance or dict.
+    Returns:
+        HallLayout: The hall layout (a full rectangle if the dict has none).
+    """
+    if isinstance(movie, Movie):
+        return movie.layout
+    return HallLayout.from_dict(movie["row"], movie["seats_per_row"], movie.get("layout"))
+
+def insert_aisles(cells, aisles, filler):
+    """
+    Return a copy of a row of display cells with a filler cell after each aisle position.
+    Args:
+        cells (list): Display cells for seats 1..N.
+        aisles (tuple): Seat numbers followed by an aisle.
+        filler (str): The cell drawn for the aisle.
+    Returns:
+        list: The cells with aisle fillers inserted.
+    """
+    result = []
+    for n, cell in enumerate(cells, start=1):
+        result.append(cell)
+        if n in aisles:
+            result.append(filler)
+    return result
+
 def mark_seats_on_map(seat_map, status, seats):
     """
     Mark the given seats on the seat_map with the appropriate symbol based on status.
@@ -127,25 +195,93 @@ def mark_seats_on_map(seat_map, status, seats):
 def build_seat_display_map(movie):
     """
     Build a seat map for display, marking reserved and booked seats with symbols.
+    Seats removed by the hall layout are blank and free wheelchair spaces are shown as 'W'.
     Args:
         movie (Movie or dict): The Movie instance or dict.
     Returns:
         dict: Seat map with symbols for display.
     """
     if isinstance(movie, Movie):
-        rows = movie.row
-        seats_per_row = movie.seats_per_row
-        bookings = movie.bookings
-        title = movie.title
-    else:
-        rows = movie["row"]
-        seats_per_row = movie["seats_per_row"]
-        bookings = movie.get("bookings", [])
-        title = movie.get('title', 'Unknown')
+        log_info(f"Building seat display map for movie: {movie.title}")
+        cache = _DISPLAY_CACHES.get(movie)
+        if cache is None:
+            cache = SeatDisplayCache(movie)
+            _DISPLAY_CACHES[movie] = cache
+        return {chr(ord('A') + i): list(cache.row_cells(movie, i)) for i in range(movie.row)}
+    rows = movie["row"]
+    seats_per_row = movie["seats_per_row"]
+    bookings = movie.get("bookings", [])
+    title = movie.get('title', 'Unknown')
     log_info(f"Building seat display map for movie: {title}")
     seat_map = {chr(ord('A') + i): ['.'] * seats_per_row for i in range(rows)}
+    layout = movie_layout(movie)
+    for seat in layout.removed:
+        seat_map[seat[0]][int(seat[1:]) - 1] = ' '
+    for seat in layout.wheelchair:
+        seat_map[seat[0]][int(seat[1:]) - 1] = 'W'
     for booking in bookings:
         status = booking.status if isinstance(booking, Booking) else booking.get("status")
         seats = booking.seats if isinstance(booking, Booking) else booking.get("seats", [])
         mark_seats_on_map(seat_map, status, seats)
-    return seat_map
\ No newline at end of file
+    return seat_map
+
+
+class SeatDisplayCache:
+    """
+    Display cells of a Movie's rows, built from its occupancy index and kept until that row changes.
+    The cache subscribes to the movie, so a booking, cancellation or rebooking only re-renders the rows it touches.
+    """
+    def __init__(self, movie):
+        """
+        Initialize a SeatDisplayCache and subscribe it to the movie's occupancy changes.
+        Args:
+            movie (Movie): The Movie instance to render.
+        """
+        self._rows = {}
+        self._grid = None
+        movie.subscribe(self._invalidate)
+
+    def _invalidate(self, movie, rows):
+        """Drop the cached cells of the changed rows (all rows if rows is None)."""
+        if rows is None:
+            self._rows.clear()
+        else:
+            for row_idx in rows:
+                self._rows.pop(row_idx, None)
+
+    def row_cells(self, movie, row_idx):
+        """
+        Return the display cells of one row: '#' booked, 'o' reserved, ' ' removed, 'W' wheelchair, '.' free.
+        Args:
+            movie (Movie): The Movie instance (the one this cache subscribed to).
+            row_idx (int): Row index (0 is row A).
+        Returns:
+            tuple: One cell per seat position.
+        """
+        grid = movie.occupancy
+        if grid is not self._grid:
+            # The occupancy index was rebuilt (bookings list replaced or layout changed)
+            self._rows.clear()
+            self._grid = grid
+        cells = self._rows.get(row_idx)
+        if cells is None:
+            layout = movie.layout
+            booked = grid.booked[row_idx]
+            reserved = grid.reserved[row_idx]
+            seats = layout.seat_masks[row_idx]
+            wheelchair = layout.wheelchair_masks[row_idx]
+            cells = []
+            for n in range(movie.seats_per_row):
+                if booked >> n & 1:
+                    cells.append('#')
+                elif reserved >> n & 1:
+                    cells.append('o')
+                elif not seats >> n & 1:
+                    cells.append(' ')
+                elif wheelchair >> n & 1:
+                    cells.append('W')
+                else:
+                    cells.append('.')
+            cells = tuple(cells)
+            self._rows[row_idx] = cells
+        return cells
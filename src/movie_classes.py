@@ -1,3 +1,8 @@
+from src.occupancy import OccupancyGrid
+from src.hall_layout import HallLayout
+from src.booking_ids import legacy_booking_number
+
+
 
 class Booking:
     """
@@ -15,9 +20,33 @@ class Booking:
             status (str): The booking status ('R' or 'B').
             seats (list): List of seat labels.
         """
+        self._movie = None
         self.id = booking_id
-        self.status = status
-        self.seats = list(seats)
+        self._status = status
+        self._seats = list(seats)
+
+    @property
+    def status(self):
+        """str: The booking status ('R' or 'B')."""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        if self._movie is not None:
+            self._movie._on_booking_change(self, value, self._seats)
+        self._status = value
+
+    @property
+    def seats(self):
+        """list: The seat labels held by the booking."""
+        return self._seats
+
+    @seats.setter
+    def seats(self, value):
+        value = list(value)
+        if self._movie is not None:
+            self._movie._on_booking_change(self, self._status, value)
+        self._seats = value
 
     @classmethod
     def from_dict(cls, data):
@@ -61,8 +90,10 @@ class Movie:
         row (int): Number of rows in the theater.
         seats_per_row (int): Number of seats per row.
         bookings (list): List of Booking instances for this movie.
+        layout (HallLayout): Floor plan of the hall (aisles, removed seats, wheelchair spaces).
+        occupancy (OccupancyGrid): Live bitmask index of booked and reserved seats.
     """
-    def __init__(self, title, row, seats_per_row, bookings=None):
+    def __init__(self, title, row, seats_per_row, bookings=None, layout=None):
         """
         Initialize a Movie instance.
         Args:
@@ -70,41 +101,75 @@ class Movie:
             row (int): Number of rows.
             seats_per_row (int): Number of seats per row.
             bookings (list, optional): List of Booking instances.
+            layout (HallLayout, optional): Floor plan of the hall; defaults to a full rectangle.
         """
         self.title = title
         self.row = row
         self.seats_per_row = seats_per_row
         self.bookings = list(bookings) if bookings is not None else []
+        self._layout = layout
+        self._occupancy = None
+        self._indexed_bookings = None
+        self._indexed_count = 0
+        self._indexed_ids = set()
+        self._by_id = {}
+        self._last_number = 0
+        self._listeners = []
+
+    def __getstate__(self):
+        """Copy and pickle without change listeners, which belong to this instance only."""
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
 
     @classmethod
     def from_dict(cls, data):
         """
         Create a Movie instance from a dictionary.
         Args:
-            data (dict): Dictionary with keys 'title', 'row', 'seats_per_row', and 'bookings'.
+            data (dict): Dictionary with keys 'title', 'row', 'seats_per_row', 'bookings' and optionally 'layout'.
         Returns:
             Movie: The created Movie instance.
         """
         bookings = [Booking.from_dict(b) for b in data.get("bookings", [])]
+        layout = None
+        if data.get("layout"):
+            layout = HallLayout.from_dict(data["row"], data["seats_per_row"], data["layout"])
         return cls(
             title=data["title"],
             row=data["row"],
             seats_per_row=data["seats_per_row"],
-            bookings=bookings
+            bookings=bookings,
+            layout=layout
         )
 
     def to_dict(self):
         """
         Convert the Movie instance to a dictionary.
         Returns:
-            dict: Dictionary representation of the movie.
+            dict: Dictionary representation of the movie. A 'layout' key is only present for non-rectangular halls.
         """
-        return {
+        data = {
             "title": self.title,
             "row": self.row,
             "seats_per_row": self.seats_per_row,
             "bookings": [b.to_dict() for b in self.bookings]
         }
+        if self._layout is not None and not self._layout.is_rectangular():
+            data["layout"] = self._layout.to_dict()
+        return data
+
+    @property
+    def layout(self):
+        """HallLayout: Floor plan of the hall, a full row x seats_per_row rectangle unless one was given."""
+        if self._layout is None:
+            self._layout = HallLayout.shared(self.row, self.seats_per_row)
+        return self._layout
+
+    @layout.setter
+    def layout(self, value):
+        self._layout = value
+        self._occupancy = None  # capacities and categories come from the layout
 
     def add_booking(self, booking):
         """
@@ -112,26 +177,127 @@ class Movie:
         Args:
             booking (Booking): The Booking instance to add.
         """
+        indexed = self._occupancy_is_current()
         self.bookings.append(booking)
+        if indexed:
+            self._track(booking)
+            self._indexed_count += 1
+            self._occupancy.add_seats(booking.status, booking.seats)
+            self._by_id.setdefault(booking.id, booking)
+            self._note_number(booking.id)
+        self._notify(booking.seats if indexed else None)
+
+    def subscribe(self, listener):
+        """
+        Register a callback run after the occupancy of this movie changes.
+        Args:
+            listener (callable): Called as listener(movie, rows) where rows is the set of changed row indexes,
+                or None if any row may have changed.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Remove a callback registered with subscribe.
+        Args:
+            listener (callable): The callback to remove.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, seats):
+        """Tell listeners which rows changed; seats=None means any row may have changed."""
+        if not self._listeners:
+            return
+        rows = None if seats is None else {ord(seat[0]) - ord('A') for seat in seats}
+        for listener in list(self._listeners):
+            listener(self, rows)
+
+    @property
+    def occupancy(self):
+        """
+        OccupancyGrid: Live bitmask index of booked and reserved seats.
+        Built on first access, then kept current as bookings are added or their seats/status change.
+        It is rebuilt if the bookings list is replaced or appended to directly.
+        """
+        if not self._occupancy_is_current():
+            self._occupancy = OccupancyGrid.from_movie(self)
+            self._indexed_bookings = self.bookings
+            self._indexed_count = len(self.bookings)
+            self._indexed_ids = set()
+            self._by_id = {}
+            self._last_number = 0
+            for booking in self.bookings:
+                self._track(booking)
+                self._by_id.setdefault(booking.id, booking)
+                self._note_number(booking.id)
+        return self._occupancy
+
+    def _occupancy_is_current(self):
+        """Return True if the occupancy index reflects the current bookings list."""
+        return (
+            self._occupancy is not None
+            and self._indexed_bookings is self.bookings
+            and self._indexed_count == len(self.bookings)
+        )
+
+    @property
+    def last_booking_number(self):
+        """int: Highest number among the movie's GICnnnn booking IDs (0 if none), kept by the booking index."""
+        self.occupancy  # brings the booking index up to date
+        return self._last_number
+
+    def _note_number(self, booking_id):
+        """Raise the highest known GICnnnn number if booking_id is above it."""
+        number = legacy_booking_number(booking_id)
+        if number is not None and number > self._last_number:
+            self._last_number = number
+
+    def _track(self, booking):
+        """Attach a booking to this movie so its seat/status changes update the occupancy index."""
+        booking._movie = self
+        self._indexed_ids.add(id(booking))
+
+    def _on_booking_change(self, booking, status, seats):
+        """
+        Move a tracked booking's seats in the occupancy index before its status or seats change.
+        Args:
+            booking (Booking): The booking about to change.
+            status (str): The new booking status.
+            seats (list): The new seat labels.
+        """
+        if not self._occupancy_is_current() or id(booking) not in self._indexed_ids:
+            return
+        self._occupancy.remove_seats(booking.status, booking.seats)
+        self._occupancy.add_seats(status, seats)
+        self._notify(list(booking.seats) + list(seats))
 
     def get_booking(self, booking_id):
         """
-        Retrieve a Booking instance by booking ID.
+        Retrieve a Booking instance by booking ID, in O(1) through the booking index.
         Args:
             booking_id (str): The booking ID to search for.
         Returns:
             Booking or None: The Booking instance if found, else None.
         """
-        for b in self.bookings:
-            if b.id == booking_id:
-                return b
-        return None
+        self.occupancy  # brings the booking index up to date
+        return self._by_id.get(booking_id)
 
-    # There is no requirement for a specific booking removal strategy but this could be useful in the future
     def remove_booking(self, booking_id):
         """
         Remove a Booking instance from the bookings list by booking ID.
+        The list is changed in place and only the booking's own seats are released from the occupancy index.
+        To keep the booking on record, cancel it instead (booking.cancel_booking).
         Args:
             booking_id (str): The booking ID to remove.
         """
-        self.bookings = [b for b in self.bookings if b.id != booking_id]
+        booking = self.get_booking(booking_id)
+        if booking is None:
+            return
+        self._occupancy.remove_seats(booking.status, booking.seats)
+        del self.bookings[next(i for i, b in enumerate(self.bookings) if b is booking)]
+        self._indexed_count -= 1
+        self._indexed_ids.discard(id(booking))
+        del self._by_id[booking_id]
+        booking._movie = None
+        self._notify(booking.seats)
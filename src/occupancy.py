@@ -0,0 +1,244 @@
+"""
+occupancy.py
+------------
+This module provides a bitmask view of a movie's seats for the allocation layer.
+Each row is an int where bit n-1 is set when seat n is taken, so whole-row questions
+(is there a free block of k seats, which seats fall inside a buffer zone) become a few bit operations.
+"""
+
+
+def seat_position(seat):
+    """
+    Convert a seat label into its (row index, seat number) position.
+    Args:
+        seat (str): Seat label (e.g., 'B4').
+    Returns:
+        tuple: (row_idx, seat_num), e.g. (1, 4).
+    """
+    return ord(seat[0]) - ord('A'), int(seat[1:])
+
+def popcount(mask):
+    """
+    Count the set bits in a mask.
+    Args:
+        mask (int): The bitmask.
+    Returns:
+        int: Number of set bits.
+    """
+    return bin(mask).count("1")
+
+def mask_to_seat_nums(mask):
+    """
+    List the seat numbers whose bits are set in a row mask, lowest first.
+    Args:
+        mask (int): The row bitmask.
+    Returns:
+        list: Seat numbers (1-based).
+    """
+    nums = []
+    while mask:
+        low = mask & -mask
+        nums.append(low.bit_length())
+        mask ^= low
+    return nums
+
+def block_starts(free_mask, width):
+    """
+    Return a mask with bit n-1 set for every seat n that starts a run of `width` free seats.
+    Uses shift-and-AND doubling, so the cost is O(log width) big-int operations.
+    Args:
+        free_mask (int): Row mask of free seats.
+        width (int): Required block width.
+    Returns:
+        int: Mask of valid block start positions.
+    """
+    if width <= 0:
+        return 0
+    starts = free_mask
+    covered = 1
+    while covered < width:
+        step = min(covered, width - covered)
+        starts &= starts >> step
+        covered += step
+    return starts
+
+def dilate_row(mask, buffer_seats, full_mask):
+    """
+    Grow every set bit of a row mask by buffer_seats positions to the left and right.
+    Args:
+        mask (int): The row bitmask.
+        buffer_seats (int): Number of seats to grow on each side.
+        full_mask (int): Mask of all seats in the row, used to clip the result.
+    Returns:
+        int: The dilated row mask.
+    """
+    grown = mask
+    for shift in range(1, buffer_seats + 1):
+        grown |= (mask << shift) | (mask >> shift)
+    return grown & full_mask
+
+def dilate_masks(masks, buffer_seats, buffer_rows, full_mask):
+    """
+    Dilate an occupancy grid horizontally by buffer_seats and vertically by buffer_rows.
+    Horizontal growth happens first, so a row buffer also covers the seat buffer of the row next to it.
+    Args:
+        masks (list): Row bitmasks, index 0 is row A.
+        buffer_seats (int): Seats kept free either side of each taken seat.
+        buffer_rows (int): Rows kept free in front of and behind each taken seat.
+        full_mask (int): Mask of all seats in a row.
+    Returns:
+        list: The dilated row bitmasks.
+    """
+    horizontal = [dilate_row(m, buffer_seats, full_mask) for m in masks]
+    if buffer_rows <= 0:
+        return horizontal
+    rows = len(horizontal)
+    dilated = []
+    for i in range(rows):
+        mask = 0
+        for j in range(max(0, i - buffer_rows), min(rows, i + buffer_rows + 1)):
+            mask |= horizontal[j]
+        dilated.append(mask)
+    return dilated
+
+
+class OccupancyGrid:
+    """
+    Bitmask occupancy of a movie, one int per row for booked ('B') and one for reserved ('R') seats.
+    Also keeps O(1) counters of taken seats (booked or reserved) in total and per seat category.
+    Attributes:
+        rows (int): Number of rows.
+        seats_per_row (int): Number of seats per row.
+        layout (HallLayout or None): Floor plan used for capacities and seat categories.
+        full_mask (int): Mask with one bit per seat in a row.
+        booked (list): Row bitmasks of booked seats.
+        reserved (list): Row bitmasks of reserved seats.
+        taken_total (int): Number of booked or reserved seats.
+        taken (dict): Category name -> number of booked or reserved seats in that category.
+    """
+    def __init__(self, rows, seats_per_row, layout=None):
+        """
+        Initialize an empty OccupancyGrid.
+        Args:
+            rows (int): Number of rows.
+            seats_per_row (int): Number of seats per row.
+            layout (HallLayout, optional): Floor plan of the hall.
+        """
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        self.layout = layout
+        self.full_mask = (1 << seats_per_row) - 1
+        self.booked = [0] * rows
+        self.reserved = [0] * rows
+        self.taken_total = 0
+        self.taken = {}
+
+    @classmethod
+    def from_movie(cls, movie):
+        """
+        Build an OccupancyGrid from a Movie instance's bookings.
+        Args:
+            movie (Movie): The Movie instance.
+        Returns:
+            OccupancyGrid: The occupancy of the movie.
+        """
+        grid = cls(movie.row, movie.seats_per_row, movie.layout)
+        for booking in movie.bookings:
+            grid.add_seats(booking.status, booking.seats)
+        return grid
+
+    def _masks_for(self, status):
+        """Return the row mask list tracking the given booking status, or None if it is not tracked."""
+        if status == "B":
+            return self.booked
+        if status == "R":
+            return self.reserved
+        return None
+
+    def add_seats(self, status, seats):
+        """
+        Mark seats as taken under the given booking status.
+        Args:
+            status (str): The booking status ('R' or 'B').
+            seats (list): Seat labels to mark.
+        """
+        masks = self._masks_for(status)
+        if masks is None:
+            return
+        for seat in seats:
+            row_idx, num = seat_position(seat)
+            bit = 1 << (num - 1)
+            if not (self.booked[row_idx] | self.reserved[row_idx]) & bit:
+                self._count(row_idx, num, 1)
+            masks[row_idx] |= bit
+
+    def remove_seats(self, status, seats):
+        """
+        Clear seats previously marked under the given booking status.
+        Args:
+            status (str): The booking status ('R' or 'B').
+            seats (list): Seat labels to clear.
+        """
+        masks = self._masks_for(status)
+        if masks is None:
+            return
+        for seat in seats:
+            row_idx, num = seat_position(seat)
+            bit = 1 << (num - 1)
+            if not masks[row_idx] & bit:
+                continue
+            masks[row_idx] &= ~bit
+            if not (self.booked[row_idx] | self.reserved[row_idx]) & bit:
+                self._count(row_idx, num, -1)
+
+    def _count(self, row_idx, num, delta):
+        """Adjust the taken counters for one seat."""
+        self.taken_total += delta
+        category = self.layout.seat_category(row_idx, num) if self.layout is not None else None
+        self.taken[category] = self.taken.get(category, 0) + delta
+
+    def available(self, category=None):
+        """
+        Number of seats that are neither booked nor reserved, in O(1).
+        Args:
+            category (str, optional): Only count seats in this category.
+        Returns:
+            int: Number of available seats.
+        """
+        if self.layout is None:
+            capacity = self.rows * self.seats_per_row if category is None else 0
+        elif category is None:
+            capacity = self.layout.capacity
+        else:
+            capacity = self.layout.category_capacity.get(category, 0)
+        taken = self.taken_total if category is None else self.taken.get(category, 0)
+        return capacity - taken
+
+    def free_masks(self, category=None):
+        """
+        Return the per-row masks of seats that exist, are not booked and, optionally, are in a category.
+        This is the per-category free-seat index used by the allocators.
+        Args:
+            category (str, optional): Only include seats in this category.
+        Returns:
+            list: Row bitmasks of free seats.
+        """
+        if self.layout is None:
+            seats = [self.full_mask] * self.rows
+        elif category is None:
+            seats = self.layout.seat_masks
+        else:
+            seats = self.layout.category_masks.get(category, [0] * self.rows)
+        return [s & ~b for s, b in zip(seats, self.booked)]
+
+    def occupied_masks(self, include_reserved=False):
+        """
+        Return the row masks of taken seats.
+        Args:
+            include_reserved (bool): Also treat reserved seats as taken.
+        Returns:
+            list: Row bitmasks.
+        """
+        if include_reserved:
+            return [b | r for b, r in zip(self.booked, self.reserved)]
+        return list(self.booked)
@@ -0,0 +1,306 @@
+"""
+persistence.py
+--------------
+This module provides crash-safe writes of movie state files.
+atomic_write writes the new contents to a temporary file next to the target, fsyncs it, renames it over the
+target with os.replace and fsyncs the directory, so after a crash the target holds either the old or the new
+contents, never a truncated mix. A crash before the rename only leaves a '.<name>.<pid>.<n>.tmp' file behind,
+which remove_temp_files deletes at start-up once its writer process is gone (several sessions may share the
+state directory, so live writers' files are left alone).
+Group commit (off until enable_group_commit is called, e.g. with GIC_GROUP_COMMIT_MS set) amortises the fsyncs
+over bursts of saves: write() queues the contents, a newer save of the same path replaces one still queued, and a
+background thread commits the queue as one batch after a short delay, syncing each directory once per batch.
+write(..., wait=True) returns once its batch is durable, so concurrent savers share the batch's fsyncs; otherwise
+a crash loses at most the saves of the last delay.
+"""
+
+import atexit
+import glob
+import itertools
+import os
+import threading
+import time
+
+from src.logger import log_info, log_error
+from src.metrics import increment, timed
+
+TEMP_SUFFIX = ".tmp"
+# Default time a batch collects saves before it is committed, in seconds
+DEFAULT_DELAY = 0.005
+DEFAULT_MAX_BATCH = 64
+# Temporary files older than this (seconds) are stale even if their PID is alive again (PID reuse)
+STALE_TEMP_AGE = 3600
+
+_temp_counter = itertools.count()
+_writer = None
+
+
+def _temp_path(path):
+    """Return a unique temporary file name in the directory of path."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.{os.getpid()}.{next(_temp_counter)}{TEMP_SUFFIX}")
+
+def fsync_directory(directory):
+    """
+    Flush a directory entry change (a created or renamed file) to disk.
+    Platforms that cannot open directories (Windows) are skipped.
+    Args:
+        directory (str): The directory.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def atomic_write(path, data, sync_directory=True):
+    """
+    Replace the contents of a file atomically and durably.
+    Args:
+        path (str): The target file; its directory is created if needed.
+        data (bytes or str): The new contents (str is written as UTF-8).
+        sync_directory (bool, optional): Also fsync the directory so the rename itself survives a crash.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp = _temp_path(path)
+    fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    if sync_directory:
+        fsync_directory(directory)
+
+def _pid_alive(pid):
+    """Return True if a process with this PID exists."""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True  # exists but belongs to someone else, or cannot be probed on this platform
+    return True
+
+def remove_temp_files(directory, max_age=STALE_TEMP_AGE, now=None):
+    """
+    Delete temporary files left in a directory by writes interrupted before their rename.
+    A file is only removed when the process named in it is no longer running or the file is older than max_age,
+    so the in-flight writes of other live processes sharing the directory are left alone.
+    Args:
+        directory (str): The directory to sweep.
+        max_age (float, optional): Seconds after which a temporary file is removed whatever its PID.
+        now (float, optional): Current Unix time; defaults to time.time().
+    Returns:
+        int: Number of files removed.
+    """
+    now = time.time() if now is None else now
+    removed = 0
+    for temp in glob.glob(os.path.join(glob.escape(directory), f".*{TEMP_SUFFIX}")):
+        parts = os.path.basename(temp)[:-len(TEMP_SUFFIX)].rsplit(".", 2)
+        pid = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else None
+        try:
+            stale = now - os.path.getmtime(temp) > max_age
+            if not stale and (pid is None or _pid_alive(pid)):
+                continue
+            os.remove(temp)
+            removed += 1
+        except OSError:
+            continue
+    if removed:
+        log_info(f"Removed {removed} interrupted write(s) from {directory}.")
+    return removed
+
+
+class GroupCommitWriter:
+    """
+    Commits queued file writes in batches on a background thread.
+    Attributes:
+        delay (float): Seconds a batch collects saves before it is committed.
+        max_batch (int): Number of queued paths that commits a batch without waiting for the delay.
+    """
+    def __init__(self, delay=DEFAULT_DELAY, max_batch=DEFAULT_MAX_BATCH):
+        """
+        Initialize a GroupCommitWriter.
+        Args:
+            delay (float, optional): Seconds a batch collects saves before it is committed.
+            max_batch (int, optional): Number of queued paths that commits a batch at once.
+        """
+        self.delay = delay
+        self.max_batch = max(1, max_batch)
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._batch = 1  # ID of the batch collecting saves
+        self._committed = 0  # ID of the last batch made durable
+        self._errors = {}
+        self._urgent = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data, wait=False):
+        """
+        Queue the new contents of a file.
+        Args:
+            path (str): The target file.
+            data (bytes or str): The new contents.
+            wait (bool, optional): Block until the batch holding this write is durable.
+        Raises:
+            OSError: If wait is set and the batch could not be written.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Group commit writer is closed")
+            if path in self._pending:
+                increment("persistence.coalesced")
+            self._pending[path] = data
+            batch = self._batch
+            if len(self._pending) >= self.max_batch:
+                self._urgent = True
+            self._cond.notify_all()
+            if wait:
+                self._wait_for(batch)
+
+    def flush(self):
+        """
+        Commit everything queued now and wait until it is durable.
+        Raises:
+            OSError: If the batch could not be written.
+        """
+        with self._cond:
+            target = self._batch - 1  # the batch being written, if any
+            if not self._pending and self._committed >= target:
+                return
+            if self._pending:
+                target = self._batch
+                self._urgent = True
+                self._cond.notify_all()
+            self._wait_for(target)
+
+    def close(self):
+        """
+        Flush the queue and stop the background thread.
+        """
+        with self._cond:
+            if self._closed:
+                return
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _wait_for(self, batch):
+        """Wait, holding the condition, until a batch is committed; re-raise its error if it failed."""
+        while self._committed < batch:
+            self._cond.wait()
+        error = self._errors.get(batch)
+        if error is not None:
+            raise error
+
+    def _run(self):
+        """Background loop: collect a batch for up to delay seconds, then commit it."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Let the burst gather; a full queue, flush() or close() cuts the window short
+                deadline = time.monotonic() + self.delay
+                while not self._urgent and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, {}
+                batch_id = self._batch
+                self._batch += 1
+                self._urgent = False
+            error = self._commit(batch)
+            with self._cond:
+                if error is not None:
+                    self._errors[batch_id] = error
+                self._committed = batch_id
+                self._cond.notify_all()
+
+    @timed("persistence.commit")
+    def _commit(self, batch):
+        """Write a batch, syncing each directory once; return the first error, or None."""
+        error = None
+        directories = set()
+        for path, data in batch.items():
+            try:
+                atomic_write(path, data, sync_directory=False)
+                directories.add(os.path.dirname(os.path.abspath(path)))
+            except OSError as e:
+                log_error(f"Group commit failed to write {path}: {e}")
+                error = error or e
+        for directory in directories:
+            fsync_directory(directory)
+        increment("persistence.batches")
+        return error
+
+
+def enable_group_commit(delay=DEFAULT_DELAY, max_batch=DEFAULT_MAX_BATCH):
+    """
+    Route write() through a GroupCommitWriter; queued writes are flushed at interpreter exit.
+    Args:
+        delay (float, optional): Seconds a batch collects saves before it is committed.
+        max_batch (int, optional): Number of queued paths that commits a batch at once.
+    Returns:
+        GroupCommitWriter: The active writer.
+    """
+    global _writer
+    disable_group_commit()
+    _writer = GroupCommitWriter(delay, max_batch)
+    atexit.register(_writer.close)
+    log_info(f"Group commit enabled with a {delay * 1000:g} ms window.")
+    return _writer
+
+def disable_group_commit():
+    """
+    Flush and stop the active GroupCommitWriter; write() is synchronous again.
+    """
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        atexit.unregister(writer.close)
+        writer.close()
+
+def write(path, data, wait=False):
+    """
+    Write a file atomically, through the group commit writer when it is enabled.
+    Args:
+        path (str): The target file.
+        data (bytes or str): The new contents.
+        wait (bool, optional): With group commit, block until the write is durable.
+    """
+    writer = _writer
+    if writer is None:
+        atomic_write(path, data)
+    else:
+        writer.submit(path, data, wait)
+
+def flush():
+    """
+    Make every queued write durable; a no-op without group commit.
+    """
+    writer = _writer
+    if writer is not None:
+        writer.flush()
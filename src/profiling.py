@@ -0,0 +1,174 @@
+"""
+profiling.py
+------------
+This module provides the profiling mode of the application (python -m src.main --profile).
+A SessionProfiler wraps a session in cProfile and, optionally, tracemalloc. On exit it writes to the logs directory:
+- profile-<stamp>.collapsed: collapsed stacks ('root;caller;callee microseconds' per line), ready for
+  flamegraph.pl or speedscope. cProfile only records caller/callee pairs, so each function's own time is
+  split over its call paths in proportion to the time each caller spent in it.
+- profile-<stamp>.pstats: the raw cProfile data, for pstats or snakeviz.
+- profile-<stamp>.txt: the top functions by cumulative and by own time.
+- profile-<stamp>-allocations.txt: the top allocation sites by size (only with memory profiling).
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+from src.logger import LOG_DIR, log_info
+
+DEFAULT_TOP = 25
+# Call paths carrying less than this share of the total time are not expanded further
+MIN_PATH_SHARE = 1e-6
+
+
+def frame_label(func):
+    """
+    Format a pstats function key as a flamegraph frame.
+    Args:
+        func (tuple): (filename, line, function name) as used by pstats.
+    Returns:
+        str: 'module.py:function:line', or the function name alone for built-ins.
+    """
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(";", ",")
+    return f"{os.path.basename(filename)}:{name}:{line}".replace(";", ",")
+
+def collapsed_stacks(stats):
+    """
+    Convert cProfile statistics into collapsed stacks.
+    Args:
+        stats (dict): pstats.Stats(...).stats, function key -> (cc, nc, tt, ct, callers).
+    Returns:
+        list: 'frame;frame;... microseconds' lines, one per call path with non-zero own time.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+    total = sum(entry[2] for entry in stats.values()) or 1.0
+    lines = {}
+
+    def visit(func, path, share):
+        """Emit the own time of func on this path, then descend into its callees."""
+        _, _, tt, ct, _ = stats[func]
+        micros = int(round(tt * share * 1e6))
+        if micros:
+            key = ";".join(frame_label(f) for f in path)
+            lines[key] = lines.get(key, 0) + micros
+        for callee in callees.get(func, ()):
+            if callee in path:
+                continue  # recursion is folded into the outer frame
+            callee_ct = stats[callee][3]
+            edge_ct = stats[callee][4][func][3]
+            child_share = share * edge_ct / callee_ct if callee_ct else 0.0
+            if child_share * callee_ct / total >= MIN_PATH_SHARE:
+                visit(callee, path + (callee,), child_share)
+
+    for func, entry in stats.items():
+        if not entry[4]:
+            visit(func, (func,), 1.0)
+    return [f"{key} {value}" for key, value in sorted(lines.items())]
+
+
+class SessionProfiler:
+    """
+    Context manager profiling the code it wraps and writing the reports on exit.
+    Attributes:
+        out_dir (str): Directory receiving the reports.
+        memory (bool): Also trace allocations with tracemalloc.
+        top (int): Number of entries in the text reports.
+        paths (dict): Report kind -> path, filled in on exit.
+    """
+    def __init__(self, out_dir=None, memory=False, top=DEFAULT_TOP, frames=10):
+        """
+        Initialize a SessionProfiler.
+        Args:
+            out_dir (str, optional): Report directory. Defaults to the logs directory.
+            memory (bool, optional): Also trace allocations (slows the session down noticeably).
+            top (int, optional): Number of entries in the text reports.
+            frames (int, optional): Traceback depth stored per allocation.
+        """
+        self.out_dir = os.path.abspath(out_dir or LOG_DIR)
+        self.memory = memory
+        self.top = top
+        self.frames = frames
+        self.paths = {}
+        self._profile = cProfile.Profile()
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start(self.frames)
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profile.disable()
+        snapshot = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        self.write_reports(snapshot)
+        return False
+
+    def write_reports(self, snapshot=None):
+        """
+        Write the profile reports.
+        Args:
+            snapshot (tracemalloc.Snapshot, optional): Allocation snapshot to report on.
+        Returns:
+            dict: Report kind ('collapsed', 'pstats', 'summary', 'allocations') -> path.
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, "profile-" + time.strftime("%Y%m%d-%H%M%S"))
+        stats = pstats.Stats(self._profile)
+
+        self.paths["pstats"] = base + ".pstats"
+        stats.dump_stats(self.paths["pstats"])
+        self.paths["collapsed"] = base + ".collapsed"
+        with open(self.paths["collapsed"], "w") as f:
+            f.write("\n".join(collapsed_stacks(stats.stats)) + "\n")
+        self.paths["summary"] = base + ".txt"
+        with open(self.paths["summary"], "w") as f:
+            for sort_key in ("cumulative", "tottime"):
+                buffer = io.StringIO()
+                pstats.Stats(self._profile, stream=buffer).sort_stats(sort_key).print_stats(self.top)
+                f.write(f"=== Top {self.top} functions by {sort_key} time ===\n{buffer.getvalue()}\n")
+        if snapshot is not None:
+            self.paths["allocations"] = base + "-allocations.txt"
+            with open(self.paths["allocations"], "w") as f:
+                f.write(format_allocations(snapshot, self.top))
+        log_info(f"Profile reports written: {self.paths}")
+        return self.paths
+
+
+def format_allocations(snapshot, top=DEFAULT_TOP):
+    """
+    Format the largest allocation sites of a tracemalloc snapshot.
+    Args:
+        snapshot (tracemalloc.Snapshot): The snapshot.
+        top (int, optional): Number of sites listed.
+    Returns:
+        str: One line per site with its size, block count and location, followed by the largest site's traceback.
+    """
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    statistics = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in statistics)
+    lines = [f"=== Top {top} allocation sites ({total / 1024:.1f} KiB live in total) ==="]
+    for stat in statistics[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+    by_traceback = snapshot.statistics("traceback")
+    if by_traceback:
+        lines.append("")
+        lines.append(f"=== Largest site traceback ({by_traceback[0].size / 1024:.1f} KiB) ===")
+        lines.extend(by_traceback[0].traceback.format())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,375 @@
+"""
+shared_occupancy.py
+-------------------
+This module provides an occupancy store in shared memory, so several worker processes see one seat state
+instead of drifting private copies of it.
+The store is a multiprocessing.shared_memory block (an mmap of /dev/shm on Linux) holding a store header
+followed by fixed-size slots, one per showing. Each slot has:
+- a header: a version counter, the geometry, the capacity and the reserved and booked seat counts
+- the booked, then the reserved bitmap, one bit per seat and max_seats_per_row bits (rounded up to whole
+  bytes) per row, little-endian, as in snapshot files; read_masks returns them as OccupancyGrid row masks
+- the seat bitmap of the hall layout (HallLayout.seat_masks), so seats removed from the floor plan cannot be
+  taken through the store
+Writers take one lock shared by all workers, but only for the few byte writes of a change. Readers never lock:
+the version counter is odd while a change is being written, so a reader copies what it needs and retries if
+the version was odd or moved meanwhile (a seqlock). Counts and single-seat checks read a few bytes in place.
+Seats are located from the slot's geometry and seat bitmap only under the lock (or inside a seqlock read), so a
+concurrent publish of another hall into the slot cannot redirect a change to the wrong bytes.
+A worker keeps its Movie for booking details and compares version() with the version it last saw to know
+when another worker has changed the showing.
+"""
+
+import struct
+import time
+from contextlib import contextmanager
+from multiprocessing import Lock, shared_memory
+
+from src.logger import log_info
+from src.occupancy import popcount, seat_position
+
+MAGIC = b"GICO"
+STORE_VERSION = 2
+# magic, format version, slot count, max rows, max seats per row, slot size
+STORE_HEADER = struct.Struct("<4sHHHHI")
+# version counter, rows, seats per row, capacity, reserved count, booked count (24 bytes keep bitmaps 8-aligned)
+SLOT_HEADER = struct.Struct("<QHHIII")
+VERSION = struct.Struct("<Q")
+# Readers give up after this many retries of a read torn by concurrent writes
+MAX_READ_RETRIES = 10000
+
+
+class SharedOccupancyStore:
+    """
+    Fixed-layout seat bitmaps of several showings in shared memory.
+    Attributes:
+        name (str): Name of the shared memory block, used by attach().
+        slots (int): Number of showing slots.
+        max_rows (int): Most rows a slot can hold.
+        max_seats_per_row (int): Most seats per row a slot can hold.
+        writable (bool): Whether this handle holds the writer lock.
+    """
+    def __init__(self, shm, lock, owner):
+        """
+        Wrap a shared memory block; use create() or attach() instead.
+        Args:
+            shm (SharedMemory): The block.
+            lock (multiprocessing.Lock or None): The writer lock; None gives a read-only handle.
+            owner (bool): Whether this handle created the block (and unlinks it on unlink()).
+        """
+        magic, version, slots, max_rows, max_seats_per_row, slot_size = STORE_HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != STORE_VERSION:
+            raise ValueError(f"Shared memory block {shm.name!r} is not an occupancy store")
+        self._shm = shm
+        self._buf = shm.buf
+        self._lock = lock
+        self._owner = owner
+        self.name = shm.name
+        self.slots = slots
+        self.max_rows = max_rows
+        self.max_seats_per_row = max_seats_per_row
+        self._row_bytes = (max_seats_per_row + 7) // 8
+        self._slot_size = slot_size
+
+    @classmethod
+    def create(cls, slots, max_rows=26, max_seats_per_row=50, name=None):
+        """
+        Create a zeroed store; pass it (or its name and lock) to the worker processes.
+        Args:
+            slots (int): Number of showing slots.
+            max_rows (int, optional): Most rows of any showing.
+            max_seats_per_row (int, optional): Most seats per row of any showing.
+            name (str, optional): Name of the block; a random one by default.
+        Returns:
+            SharedOccupancyStore: A writable store.
+        """
+        row_bytes = (max_seats_per_row + 7) // 8
+        slot_size = SLOT_HEADER.size + 3 * max_rows * row_bytes
+        slot_size += -slot_size % 8
+        size = STORE_HEADER.size + slot_size * slots
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        STORE_HEADER.pack_into(shm.buf, 0, MAGIC, STORE_VERSION, slots, max_rows, max_seats_per_row, slot_size)
+        log_info(f"Shared occupancy store {shm.name} created: {slots} slots of {max_rows}x{max_seats_per_row}.")
+        return cls(shm, Lock(), owner=True)
+
+    @classmethod
+    def attach(cls, name, lock=None):
+        """
+        Open an existing store by name.
+        Args:
+            name (str): Name of the block.
+            lock (multiprocessing.Lock, optional): The creator's writer lock; without it the handle is read-only.
+        Returns:
+            SharedOccupancyStore: The store.
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 every attachment registers with the resource tracker, which unlinks the block when
+            # the tracker exits; workers started by the creator share its tracker, so only they should attach
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, lock, owner=False)
+
+    def __reduce__(self):
+        """Pickle (when starting a worker process) as an attachment to the same block and lock."""
+        return (SharedOccupancyStore.attach, (self.name, self._lock))
+
+    @property
+    def writable(self):
+        """Whether this handle holds the writer lock."""
+        return self._lock is not None
+
+    def close(self):
+        """
+        Release this handle's mapping; the block lives on until unlink().
+        """
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Destroy the block (creator only), once every worker is done with it.
+        """
+        if self._owner:
+            self._shm.unlink()
+
+    def _offset(self, slot):
+        """Return the byte offset of a slot."""
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Slot {slot} out of range 0-{self.slots - 1}")
+        return STORE_HEADER.size + slot * self._slot_size
+
+    def _locate(self, base, seat):
+        """
+        Return (booked byte offset, reserved byte offset, bit value) of a seat in the slot at base, or None if
+        the slot's hall has no such seat; call with the writer lock held or inside a seqlock read.
+        """
+        row_idx, num = seat_position(seat)
+        rows, seats_per_row = struct.unpack_from("<HH", self._buf, base + 8)
+        if not (0 <= row_idx < rows and 1 <= num <= seats_per_row):
+            return None
+        row_bytes = self._row_bytes
+        booked = base + SLOT_HEADER.size + row_idx * row_bytes + (num - 1) // 8
+        bit = 1 << ((num - 1) % 8)
+        if not self._buf[booked + 2 * rows * row_bytes] & bit:
+            return None  # removed from the layout
+        return booked, booked + rows * row_bytes, bit
+
+    def _locate_all(self, slot, base, seats):
+        """Locate seats in a slot with the writer lock held; raise ValueError for a seat the hall does not have."""
+        located = []
+        for seat in seats:
+            position = self._locate(base, seat)
+            if position is None:
+                raise ValueError(f"Seat {seat!r} is not a seat of the hall in slot {slot}")
+            located.append(position)
+        return located
+
+    @contextmanager
+    def _locked(self, slot):
+        """Hold the writer lock; yield the slot's offset."""
+        if self._lock is None:
+            raise RuntimeError("Read-only handle: attach with the store's lock to write")
+        base = self._offset(slot)
+        with self._lock:
+            yield base
+
+    @contextmanager
+    def _changing(self, base):
+        """
+        Mark a slot as changing (odd version) while the block runs; the writer lock must be held.
+        Yields a list that holds the slot's new version once the block is done.
+        """
+        version = VERSION.unpack_from(self._buf, base)[0] + 1
+        VERSION.pack_into(self._buf, base, version)
+        committed = []
+        try:
+            yield committed
+        finally:
+            VERSION.pack_into(self._buf, base, version + 1)
+            committed.append(version + 1)
+
+    def _read(self, slot, read):
+        """Run read(base) until it sees no concurrent write; return (version, result)."""
+        base = self._offset(slot)
+        buf = self._buf
+        for _ in range(MAX_READ_RETRIES):
+            before = VERSION.unpack_from(buf, base)[0]
+            if before & 1:
+                time.sleep(0)  # let the writer finish
+                continue
+            result = read(base)
+            if VERSION.unpack_from(buf, base)[0] == before:
+                return before, result
+        raise TimeoutError(f"Slot {slot} kept changing while being read")
+
+    def publish(self, slot, movie):
+        """
+        Copy a movie's occupancy into a slot, replacing what it held.
+        Args:
+            slot (int): The slot.
+            movie (Movie): The movie; its geometry must fit the store.
+        Returns:
+            int: The slot's new version.
+        """
+        grid = movie.occupancy
+        if grid.rows > self.max_rows or grid.seats_per_row > self.max_seats_per_row:
+            raise ValueError(
+                f"A {grid.rows}x{grid.seats_per_row} hall does not fit slots of "
+                f"{self.max_rows}x{self.max_seats_per_row}"
+            )
+        row_bytes = self._row_bytes
+        masks = grid.booked + grid.reserved + list(movie.layout.seat_masks)
+        bitmaps = b"".join(mask.to_bytes(row_bytes, "little") for mask in masks)
+        booked = sum(map(popcount, grid.booked))
+        reserved = sum(popcount(r & ~b) for b, r in zip(grid.booked, grid.reserved))
+        with self._locked(slot) as base, self._changing(base) as committed:
+            start = base + SLOT_HEADER.size
+            self._buf[start:start + len(bitmaps)] = bitmaps
+            struct.pack_into("<HHIII", self._buf, base + 8, grid.rows, grid.seats_per_row,
+                             movie.layout.capacity, reserved, booked)
+        return committed[0]
+
+    def version(self, slot):
+        """
+        Args:
+            slot (int): The slot.
+        Returns:
+            int: The slot's version counter; it changes with every committed change.
+        """
+        return self._read(slot, lambda base: None)[0]
+
+    def counts(self, slot):
+        """
+        Read a slot's seat counts from its header.
+        Args:
+            slot (int): The slot.
+        Returns:
+            dict: {'version', 'free', 'reserved', 'booked'}.
+        """
+        version, (capacity, reserved, booked) = self._read(
+            slot, lambda base: struct.unpack_from("<III", self._buf, base + 12)
+        )
+        return {"version": version, "free": capacity - reserved - booked, "reserved": reserved, "booked": booked}
+
+    def is_taken(self, slot, seat):
+        """
+        Check one seat in place.
+        Args:
+            slot (int): The slot.
+            seat (str): Seat label, e.g. 'B4'.
+        Returns:
+            bool: True if the seat is booked or reserved.
+        Raises:
+            ValueError: If the slot's hall has no such seat.
+        """
+        def read(base):
+            position = self._locate(base, seat)
+            if position is None:
+                return None
+            booked, reserved, bit = position
+            return bool((self._buf[booked] | self._buf[reserved]) & bit)
+
+        taken = self._read(slot, read)[1]
+        if taken is None:
+            raise ValueError(f"Seat {seat!r} is not a seat of the hall in slot {slot}")
+        return taken
+
+    def read_masks(self, slot):
+        """
+        Copy a slot's bitmaps consistently.
+        Args:
+            slot (int): The slot.
+        Returns:
+            tuple: (version, booked row masks, reserved row masks), masks as in OccupancyGrid.
+        """
+        row_bytes = self._row_bytes
+
+        def read(base):
+            rows = struct.unpack_from("<H", self._buf, base + 8)[0]
+            start = base + SLOT_HEADER.size
+            data = bytes(self._buf[start:start + 2 * rows * row_bytes])
+            return rows, data
+
+        version, (rows, data) = self._read(slot, read)
+        masks = [int.from_bytes(data[i:i + row_bytes], "little") for i in range(0, len(data), row_bytes)]
+        return version, masks[:rows], masks[rows:]
+
+    def try_take(self, slot, seats, status="B"):
+        """
+        Book or reserve seats if none of them is taken, in one critical section.
+        Args:
+            slot (int): The slot.
+            seats (list): Seat labels.
+            status (str, optional): 'B' to book or 'R' to reserve.
+        Returns:
+            int or None: The slot's new version, or None if a seat was already taken (nothing is changed).
+        Raises:
+            ValueError: If the slot's hall has no such seat (nothing is changed).
+        """
+        seats = list(dict.fromkeys(seats))
+        buf = self._buf
+        with self._locked(slot) as base:
+            located = self._locate_all(slot, base, seats)
+            if any((buf[booked] | buf[reserved]) & bit for booked, reserved, bit in located):
+                return None
+            with self._changing(base) as committed:
+                for booked, reserved, bit in located:
+                    buf[booked if status == "B" else reserved] |= bit
+                self._adjust(base, len(located) if status == "R" else 0, len(located) if status == "B" else 0)
+        return committed[0]
+
+    def confirm(self, slot, seats):
+        """
+        Turn reserved seats into booked ones; seats that are not reserved are left alone.
+        Args:
+            slot (int): The slot.
+            seats (list): Seat labels.
+        Returns:
+            int: The slot's new version.
+        Raises:
+            ValueError: If the slot's hall has no such seat (nothing is changed).
+        """
+        buf = self._buf
+        with self._locked(slot) as base:
+            located = self._locate_all(slot, base, seats)
+            with self._changing(base) as committed:
+                moved = 0
+                for booked, reserved, bit in located:
+                    if buf[reserved] & bit:
+                        buf[reserved] &= ~bit & 0xFF
+                        buf[booked] |= bit
+                        moved += 1
+                self._adjust(base, -moved, moved)
+        return committed[0]
+
+    def release(self, slot, seats):
+        """
+        Free booked or reserved seats, e.g. on cancellation.
+        Args:
+            slot (int): The slot.
+            seats (list): Seat labels.
+        Returns:
+            int: The slot's new version.
+        Raises:
+            ValueError: If the slot's hall has no such seat (nothing is changed).
+        """
+        buf = self._buf
+        with self._locked(slot) as base:
+            located = self._locate_all(slot, base, seats)
+            with self._changing(base) as committed:
+                freed_booked = freed_reserved = 0
+                for booked, reserved, bit in located:
+                    if buf[booked] & bit:
+                        buf[booked] &= ~bit & 0xFF
+                        freed_booked += 1
+                    elif buf[reserved] & bit:
+                        buf[reserved] &= ~bit & 0xFF
+                        freed_reserved += 1
+                self._adjust(base, -freed_reserved, -freed_booked)
+        return committed[0]
+
+    def _adjust(self, base, reserved, booked):
+        """Add to a slot's reserved and booked counts (writer lock held)."""
+        counts = struct.unpack_from("<II", self._buf, base + 16)
+        struct.pack_into("<II", self._buf, base + 16, counts[0] + reserved, counts[1] + booked)
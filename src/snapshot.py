@@ -0,0 +1,272 @@
+"""
+snapshot.py
+-----------
+This module provides a compact, versioned binary snapshot format for movie state, as an alternative to JSON.
+Layout (little-endian):
+- header: magic b'GICS', format version, flags, rows, seats per row, booking count, title and layout lengths
+- the title (UTF-8) and, for non-rectangular halls, the layout definition (JSON, as in Movie.to_dict)
+- occupancy bitmaps: booked, then reserved seats, one bit per seat, ceil(seats_per_row / 8) bytes per row,
+  so availability can be read without decoding any booking (read_occupancy)
+- the booking table, column by column: ID lengths, ID bytes, status bytes, seat counts, then every seat as
+  its index row * seats_per_row + (number - 1)
+- (version 2) a CRC32 of everything before it, so a torn or corrupted file is rejected before any of it is
+  used; verify_snapshot runs just that check. Version 1 snapshots, without the trailer, are still read.
+The columns are packed and unpacked with struct and array in bulk; the only per-seat work when decoding is a
+lookup in a per-geometry table of seat labels.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain, starmap
+from operator import attrgetter, itemgetter
+
+from src.hall_layout import HallLayout
+from src.movie_classes import Movie, Booking
+
+MAGIC = b"GICS"
+SNAPSHOT_VERSION = 2
+# Versions decoded; version 1 has no checksum trailer
+SUPPORTED_VERSIONS = (1, 2)
+SNAPSHOT_EXT = ".gics"
+HEADER = struct.Struct("<4sHHHHIHI")
+CHECKSUM = struct.Struct("<I")
+# Header flag: seat indexes and counts are 32-bit (halls with more than 65535 seat positions)
+FLAG_WIDE_INDEX = 0x1
+
+_label_tables = {}
+_index_tables = {}
+
+
+class SnapshotError(ValueError):
+    """Raised when data is not a readable snapshot."""
+
+
+def _labels(rows, seats_per_row):
+    """Return the cached tuple of seat labels by seat index for a hall geometry."""
+    key = (rows, seats_per_row)
+    table = _label_tables.get(key)
+    if table is None:
+        table = _label_tables[key] = tuple(
+            f"{chr(ord('A') + r)}{n}" for r in range(rows) for n in range(1, seats_per_row + 1)
+        )
+    return table
+
+def _little_endian(values):
+    """Return the bytes of an array in little-endian order."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _read_array(typecode, view, pos, count):
+    """Read count little-endian items of an array type starting at pos; return (array, next position)."""
+    values = array(typecode)
+    end = pos + count * values.itemsize
+    if end > len(view):
+        raise SnapshotError("Snapshot is truncated.")
+    values.frombytes(view[pos:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+def _indexes(rows, seats_per_row):
+    """Return the cached dict of seat index by seat label for a hall geometry."""
+    key = (rows, seats_per_row)
+    table = _index_tables.get(key)
+    if table is None:
+        table = _index_tables[key] = {label: i for i, label in enumerate(_labels(rows, seats_per_row))}
+    return table
+
+def encode_snapshot(movie):
+    """
+    Encode a movie as a binary snapshot.
+    A Movie's bitmaps come straight from its live occupancy index; for a dict they are built from the bookings.
+    Args:
+        movie (Movie or dict): The Movie instance or its to_dict() form.
+    Returns:
+        bytes: The snapshot.
+    Raises:
+        ValueError: If a seat label is outside the hall, a status is not one ASCII character or an ID is over 255 bytes.
+    """
+    if isinstance(movie, Movie):
+        title, rows, seats_per_row = movie.title, movie.row, movie.seats_per_row
+        layout = movie.layout.to_dict() if not movie.layout.is_rectangular() else None
+        bookings = movie.bookings
+        ids = [b.id.encode() for b in bookings]
+        statuses = "".join(map(attrgetter("status"), bookings))
+        seat_lists = list(map(attrgetter("seats"), bookings))
+    else:
+        title, rows, seats_per_row = movie["title"], movie["row"], movie["seats_per_row"]
+        layout = movie.get("layout")
+        bookings = movie.get("bookings", [])
+        ids = [b["ID"].encode() for b in bookings]
+        statuses = "".join(map(itemgetter("status"), bookings))
+        seat_lists = list(map(itemgetter("seats"), bookings))
+    if len(statuses) != len(bookings):
+        raise ValueError("Booking statuses must be single characters")
+    flags = FLAG_WIDE_INDEX if rows * seats_per_row > 0xFFFF else 0
+    typecode = "I" if flags & FLAG_WIDE_INDEX else "H"
+    index = _indexes(rows, seats_per_row)
+    counts = array(typecode, map(len, seat_lists))
+    try:
+        seats = array(typecode, map(index.__getitem__, chain.from_iterable(seat_lists)))
+        id_lengths = array("B", map(len, ids))
+    except KeyError as e:
+        raise ValueError(f"Seat {e.args[0]!r} is outside the {rows}x{seats_per_row} hall") from None
+    except OverflowError:
+        raise ValueError("Booking IDs must be at most 255 bytes") from None
+
+    if isinstance(movie, Movie):
+        booked, reserved = movie.occupancy.booked, movie.occupancy.reserved
+    else:
+        booked, reserved = [0] * rows, [0] * rows
+        pos = 0
+        for status, count in zip(statuses, counts):
+            masks = booked if status == "B" else reserved if status == "R" else None
+            if masks is not None:
+                for i in seats[pos:pos + count]:
+                    masks[i // seats_per_row] |= 1 << (i % seats_per_row)
+            pos += count
+    row_bytes = (seats_per_row + 7) // 8
+    title = title.encode()
+    layout = json.dumps(layout).encode() if layout else b""
+
+    body = b"".join((
+        HEADER.pack(MAGIC, SNAPSHOT_VERSION, flags, rows, seats_per_row, len(bookings), len(title), len(layout)),
+        title,
+        layout,
+        b"".join(mask.to_bytes(row_bytes, "little") for mask in booked),
+        b"".join(mask.to_bytes(row_bytes, "little") for mask in reserved),
+        id_lengths.tobytes(),
+        b"".join(ids),
+        statuses.encode("ascii"),
+        _little_endian(counts),
+        _little_endian(seats),
+    ))
+    return body + CHECKSUM.pack(zlib.crc32(body))
+
+def _checked_view(data):
+    """Check magic, version and checksum; return (memoryview without the checksum trailer, version)."""
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise SnapshotError("Snapshot is truncated.")
+    magic, version = struct.unpack_from("<4sH", view, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a movie snapshot.")
+    if version not in SUPPORTED_VERSIONS:
+        raise SnapshotError(f"Unsupported snapshot version {version}.")
+    if version >= 2:
+        if len(view) < HEADER.size + CHECKSUM.size:
+            raise SnapshotError("Snapshot is truncated.")
+        view, trailer = view[:-CHECKSUM.size], view[-CHECKSUM.size:]
+        if zlib.crc32(view) != CHECKSUM.unpack(trailer)[0]:
+            raise SnapshotError("Snapshot checksum mismatch (torn or corrupted write).")
+    return view, version
+
+def verify_snapshot(data):
+    """
+    Check that data is a complete, uncorrupted snapshot without decoding it.
+    Version 1 snapshots carry no checksum and pass if their header is valid.
+    Args:
+        data (bytes): The candidate snapshot.
+    Returns:
+        bool: True if the snapshot can be trusted.
+    """
+    try:
+        _checked_view(data)
+    except SnapshotError:
+        return False
+    return True
+
+def _read_header(view):
+    """Unpack the header of a checked view; return (flags, rows, seats_per_row, count, title, layout, next position)."""
+    _, _, flags, rows, seats_per_row, count, title_len, layout_len = HEADER.unpack_from(view, 0)
+    pos = HEADER.size
+    end = pos + title_len + layout_len
+    if end > len(view):
+        raise SnapshotError("Snapshot is truncated.")
+    title = bytes(view[pos:pos + title_len]).decode()
+    layout = json.loads(bytes(view[pos + title_len:end])) if layout_len else None
+    return flags, rows, seats_per_row, count, title, layout, end
+
+def read_occupancy(data):
+    """
+    Read the occupancy bitmaps of a snapshot without decoding its bookings.
+    Args:
+        data (bytes): The snapshot.
+    Returns:
+        tuple: (rows, seats_per_row, booked row masks, reserved row masks), masks as in OccupancyGrid.
+    """
+    view, _ = _checked_view(data)
+    _, rows, seats_per_row, _, _, _, pos = _read_header(view)
+    row_bytes = (seats_per_row + 7) // 8
+    if pos + 2 * rows * row_bytes > len(view):
+        raise SnapshotError("Snapshot is truncated.")
+    masks = [
+        int.from_bytes(view[pos + i * row_bytes:pos + (i + 1) * row_bytes], "little") for i in range(2 * rows)
+    ]
+    return rows, seats_per_row, masks[:rows], masks[rows:]
+
+def _decode(data):
+    """Decode a snapshot; return (title, rows, seats_per_row, layout, [(ID, status, seats), ...])."""
+    view, _ = _checked_view(data)
+    flags, rows, seats_per_row, count, title, layout, pos = _read_header(view)
+    typecode = "I" if flags & FLAG_WIDE_INDEX else "H"
+    pos += 2 * rows * ((seats_per_row + 7) // 8)  # bitmaps, see read_occupancy
+    id_lengths, pos = _read_array("B", view, pos, count)
+    ids_end = pos + sum(id_lengths)
+    ids = bytes(view[pos:ids_end])
+    statuses = bytes(view[ids_end:ids_end + count]).decode("ascii")
+    counts, pos = _read_array(typecode, view, ids_end + count, count)
+    seats, pos = _read_array(typecode, view, pos, sum(counts))
+    seat_labels = list(map(_labels(rows, seats_per_row).__getitem__, seats))
+    text = ids.decode()
+    ascii_ids = len(text) == len(ids)  # byte offsets are character offsets
+
+    bookings = []
+    id_pos = seat_pos = 0
+    for id_length, status, seat_count in zip(id_lengths, statuses, counts):
+        id_end = id_pos + id_length
+        seat_end = seat_pos + seat_count
+        booking_id = text[id_pos:id_end] if ascii_ids else ids[id_pos:id_end].decode()
+        bookings.append((booking_id, status, seat_labels[seat_pos:seat_end]))
+        id_pos, seat_pos = id_end, seat_end
+    return title, rows, seats_per_row, layout, bookings
+
+def decode_snapshot_dict(data):
+    """
+    Decode a snapshot into the Movie.to_dict() form.
+    Args:
+        data (bytes): The snapshot.
+    Returns:
+        dict: The movie dictionary.
+    Raises:
+        SnapshotError: If the data is not a complete snapshot of a supported version.
+    """
+    title, rows, seats_per_row, layout, bookings = _decode(data)
+    data = {
+        "title": title,
+        "row": rows,
+        "seats_per_row": seats_per_row,
+        "bookings": [{"ID": i, "status": status, "seats": seats} for i, status, seats in bookings],
+    }
+    if layout is not None:
+        data["layout"] = layout
+    return data
+
+def decode_snapshot(data):
+    """
+    Decode a snapshot into a Movie instance.
+    Args:
+        data (bytes): The snapshot.
+    Returns:
+        Movie: The movie.
+    Raises:
+        SnapshotError: If the data is not a complete snapshot of a supported version.
+    """
+    title, rows, seats_per_row, layout, bookings = _decode(data)
+    layout = HallLayout.from_dict(rows, seats_per_row, layout) if layout is not None else None
+    return Movie(title, rows, seats_per_row, bookings=list(starmap(Booking, bookings)), layout=layout)
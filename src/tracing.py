@@ -0,0 +1,250 @@
+"""
+tracing.py
+----------
+This module provides lightweight tracing of the booking flow with nested spans.
+Every top-level span starts a new trace (one per booking when the booking loop is the root) with a random
+trace ID; spans opened inside it, e.g. by functions decorated with @traced('name'), become its children.
+Finished traces are exported as JSON Lines, one span per line, written in one go when the root span ends.
+Tracing is off until enable() is called (python -m src.main --trace or GIC_TRACE=1); while off, a traced
+call costs one global lookup.
+Run python -m src.tracing [traces.jsonl] for a per-step latency breakdown and the steps repeated within a trace.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from src.logger import log_info
+
+DEFAULT_TRACE_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'traces.jsonl'))
+
+_tracer = None
+
+
+class Span:
+    """
+    One timed step of a trace.
+    Attributes:
+        trace_id (str): ID shared by every span of the trace.
+        span_id (str): ID of this span.
+        parent_id (str or None): ID of the enclosing span, None for the root.
+        name (str): Step name, e.g. 'booking.default_seating'.
+        attrs (dict): JSON-serialisable details, e.g. the number of tickets.
+        start (float): Unix time the span started.
+        duration (float): Seconds the span took (set when it ends).
+    """
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attrs", "start", "duration")
+
+    def __init__(self, trace_id, span_id, parent_id, name, attrs):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration = 0.0
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The span as exported, with its duration in milliseconds.
+        """
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 4),
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """
+    Records nested spans per thread and exports each finished trace to a JSON Lines file.
+    Attributes:
+        path (str): Path of the trace file.
+    """
+    def __init__(self, path=None):
+        """
+        Initialize a Tracer.
+        Args:
+            path (str, optional): Trace file path. Defaults to logs/traces.jsonl.
+        """
+        self.path = path or DEFAULT_TRACE_FILE
+        self._local = threading.local()
+
+    def _state(self):
+        """Return this thread's (open span stack, finished spans of the current trace)."""
+        local = self._local
+        if not hasattr(local, "stack"):
+            local.stack = []
+            local.finished = []
+        return local.stack, local.finished
+
+    def current(self):
+        """
+        Returns:
+            Span or None: The innermost open span of this thread.
+        """
+        stack, _ = self._state()
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        """
+        Time a block as a span, a child of the innermost open span or the root of a new trace.
+        Args:
+            name (str): Step name.
+            **attrs: JSON-serialisable span details.
+        Yields:
+            Span: The open span; attributes may be added to span.attrs while it runs.
+        """
+        stack, finished = self._state()
+        parent = stack[-1] if stack else None
+        trace_id = parent.trace_id if parent is not None else os.urandom(8).hex()
+        span = Span(trace_id, os.urandom(4).hex(), parent.span_id if parent is not None else None, name, attrs)
+        stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            stack.pop()
+            finished.append(span)
+            if parent is None:
+                self._export(finished)
+                finished.clear()
+
+    def _export(self, spans):
+        """Append the spans of a finished trace to the trace file in one write."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write("".join(json.dumps(span.to_dict()) + "\n" for span in spans))
+
+
+def enable(path=None):
+    """
+    Switch tracing on for the process.
+    Args:
+        path (str, optional): Trace file path. Defaults to logs/traces.jsonl.
+    Returns:
+        Tracer: The active tracer.
+    """
+    global _tracer
+    _tracer = Tracer(path)
+    log_info(f"Tracing enabled; spans are written to {_tracer.path}.")
+    return _tracer
+
+def disable():
+    """
+    Switch tracing off. Spans still open are discarded.
+    """
+    global _tracer
+    _tracer = None
+
+def span(name, **attrs):
+    """
+    Time a block as a span of the active tracer; does nothing while tracing is off.
+    Args:
+        name (str): Step name.
+        **attrs: JSON-serialisable span details.
+    Returns:
+        A context manager yielding the Span, or None while tracing is off.
+    """
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.span(name, **attrs)
+
+def traced(name):
+    """
+    Decorator recording each call of a function as a span named 'name'.
+    Args:
+        name (str): Step name, e.g. 'booking.default_seating'.
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_spans(path=None):
+    """
+    Read exported spans back.
+    Args:
+        path (str, optional): Trace file path. Defaults to logs/traces.jsonl.
+    Returns:
+        list: Span dicts in export order; an unfinished last line is skipped.
+    """
+    path = path or DEFAULT_TRACE_FILE
+    if not os.path.exists(path):
+        return []
+    spans = []
+    with open(path) as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+def summarise(spans):
+    """
+    Break down latency per step.
+    A step's self time is its duration minus the durations of its direct children.
+    Args:
+        spans (list): Span dicts, as returned by load_spans.
+    Returns:
+        dict: Step name -> {'count', 'total_ms', 'self_ms', 'mean_ms', 'max_ms', 'per_trace'},
+        where per_trace is the largest number of times the step ran within one trace.
+    """
+    child_ms = {}
+    for s in spans:
+        if s["parent_id"] is not None:
+            key = (s["trace_id"], s["parent_id"])
+            child_ms[key] = child_ms.get(key, 0.0) + s["duration_ms"]
+    per_trace = {}
+    summary = {}
+    for s in spans:
+        entry = summary.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += s["duration_ms"]
+        entry["self_ms"] += s["duration_ms"] - child_ms.get((s["trace_id"], s["span_id"]), 0.0)
+        entry["max_ms"] = max(entry["max_ms"], s["duration_ms"])
+        key = (s["trace_id"], s["name"])
+        per_trace[key] = per_trace.get(key, 0) + 1
+    for (_, name), count in per_trace.items():
+        summary[name]["per_trace"] = max(summary[name].get("per_trace", 0), count)
+    for entry in summary.values():
+        entry["mean_ms"] = entry["total_ms"] / entry["count"]
+    return summary
+
+def format_summary(summary):
+    """
+    Format a summary as a table sorted by self time.
+    Args:
+        summary (dict): As returned by summarise.
+    Returns:
+        str: The table.
+    """
+    lines = [f"{'step':<45} {'count':>7} {'self ms':>10} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'max/trace':>9}"]
+    for name, e in sorted(summary.items(), key=lambda item: -item[1]["self_ms"]):
+        lines.append(f"{name:<45} {e['count']:>7} {e['self_ms']:>10.3f} {e['total_ms']:>10.3f} "
+                     f"{e['mean_ms']:>9.3f} {e['max_ms']:>9.3f} {e['per_trace']:>9}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_summary(summarise(load_spans(sys.argv[1] if len(sys.argv) > 1 else None))))
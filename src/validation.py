@@ -1,14 +1,22 @@
-
 """
 validation.py
 -------------
 This module contains validation functions for the GIC CBS application.
 """
 
+import re
+
 from src.logger import log_info, log_warning, log_error
 from src.movie import movie_available_seats
 from src.movie_classes import Movie
+from src.tracing import traced
 
+# One item of a seat selection: a seat ('C7') or a same-row range ('A1-A4' or 'A1-4'), then a comma or the end.
+# Seat numbers have at most four digits; their bounds are checked before a range is expanded
+SEAT_SELECTION_ITEM = re.compile(r"\s*([A-Z])([1-9]\d{0,3})(?:\s*-\s*([A-Z])?([1-9]\d{0,3}))?\s*(,|$)")
+# Largest hall accepted by movie_validation
+MAX_ROWS = 26
+MAX_SEATS_PER_ROW = 50
 
 
 def is_positive_integer(value):
@@ -75,6 +83,7 @@ def movie_validation(user_input):
     log_info("Movie input validated successfully.")
     return True
 
+@traced("validation.ticket_num_validation")
 def ticket_num_validation(ticket_input, movie_json):
     """
     Validate the ticket input for booking.
@@ -107,19 +116,22 @@ def ticket_num_validation(ticket_input, movie_json):
     log_info("Ticket number validated successfully.")
     return True
 
+@traced("validation.is_valid_seat")
 def is_valid_seat(movie_json, user_input):
     """
     Validate a seat input for booking.
-    Returns 'blank' if input is blank (accept default), 'valid' if seat is valid and available, 'invalid' otherwise.
+    Returns 'blank' if input is blank (accept default), 'valid' if seat is valid and available,
+    'selection' if input is a multi-seat selection (e.g. 'A1-A4,C7') whose seats are all valid and available,
+    'invalid' otherwise.
+    Seats are checked against the movie's occupancy index, so each seat costs O(1).
     Accepts only a Movie instance.
     Args:
         movie_json (Movie): The Movie instance.
         user_input (str): The seat input string.
     Returns:
-        str: 'blank', 'valid', or 'invalid'.
+        str: 'blank', 'valid', 'selection', or 'invalid'.
     """
     log_info(f"Validating seat input: '{user_input}'")
-    from src.booking import build_seat_map, get_booked_seats
     if user_input.strip() == "":
         log_info("Seat input is blank (accept default)."); return "blank"
     seat_input = user_input.strip().upper()
@@ -128,22 +140,74 @@ def is_valid_seat(movie_json, user_input):
     else:
         log_error("movie_json is not a Movie instance.")
         return "invalid"
-    seat_map = build_seat_map(movie_obj)
-    row = seat_input[0]
-    try:
-        int(seat_input[1:])
-    except (ValueError, IndexError):
-        log_warning("Seat input does not have a valid seat number."); return "invalid"
-    if row not in seat_map:
-        log_warning(f"Row '{row}' not in seat map."); return "invalid"
-    if seat_input not in seat_map[row]:
-        log_warning(f"Seat '{seat_input}' is not in row '{row}'."); return "invalid"
-    booked = get_booked_seats(movie_obj)
-    if seat_input in booked:
-        log_warning(f"Seat '{seat_input}' is already booked."); return "invalid"
+    seats = parse_seat_selection(seat_input, movie_obj.seats_per_row)
+    if seats is None:
+        log_warning(f"Seat input '{seat_input}' is not a valid seat or seat selection."); return "invalid"
+    if not is_available_selection(movie_obj, seats):
+        return "invalid"
+    if "," in seat_input or "-" in seat_input:
+        log_info(f"Seat selection '{seat_input}' is valid and available ({len(seats)} seats).")
+        return "selection"
     log_info(f"Seat '{seat_input}' is valid and available.")
     return "valid"
 
+def parse_seat_selection(user_input, seats_per_row=MAX_SEATS_PER_ROW, max_seats=MAX_ROWS * MAX_SEATS_PER_ROW):
+    """
+    Parse a seat selection such as 'A1-A4,C7,C8' into a list of seat labels in input order.
+    Ranges must stay within one row and go from a lower to a higher seat number.
+    The input is scanned once with a compiled pattern; no hall structures are built, and a range is only
+    expanded once it is known to fit in the row and in max_seats.
+    Args:
+        user_input (str): The selection string (case-insensitive).
+        seats_per_row (int, optional): Highest seat number accepted.
+        max_seats (int, optional): Most seats the selection may contain.
+    Returns:
+        list or None: Seat labels (e.g., ['A1', 'A2', 'A3', 'A4', 'C7', 'C8']), or None if the syntax
+        is invalid, a seat number exceeds seats_per_row, there are more than max_seats seats or a seat is repeated.
+    """
+    text = user_input.strip().upper()
+    seats = []
+    pos = 0
+    while pos < len(text):
+        match = SEAT_SELECTION_ITEM.match(text, pos)
+        if match is None:
+            return None
+        row, first, end_row, last, separator = match.groups()
+        first = int(first)
+        last = int(last) if last else first
+        if (end_row and end_row != row) or last < first or last > seats_per_row:
+            return None
+        if len(seats) + last - first + 1 > max_seats:
+            return None
+        seats.extend(f"{row}{n}" for n in range(first, last + 1))
+        pos = match.end()
+        if separator == "," and pos == len(text):
+            return None  # trailing comma
+    if not seats or len(set(seats)) != len(seats):
+        return None
+    return seats
+
+def is_available_selection(movie_json, seats):
+    """
+    Check that every seat is inside the hall and not booked, using the movie's occupancy index.
+    Reserved seats count as available, as they belong to the booking being edited.
+    Args:
+        movie_json (Movie): The Movie instance.
+        seats (list): Seat labels to check.
+    Returns:
+        bool: True if all seats are valid and available, False otherwise.
+    """
+    booked = movie_json.occupancy.booked
+    layout = movie_json.layout
+    for seat in seats:
+        row_idx = ord(seat[0]) - ord('A')
+        num = int(seat[1:])
+        if not layout.has_seat(row_idx, num):
+            log_warning(f"Seat '{seat}' is not in the seating map."); return False
+        if booked[row_idx] >> (num - 1) & 1:
+            log_warning(f"Seat '{seat}' is already booked."); return False
+    return True
+
 def is_valid_booking(movie_json, booking_id):
     """
     Check if a booking ID exists in the movie's bookings.
@@ -0,0 +1,196 @@
+"""
+waitlist.py
+-----------
+This module provides a waitlist for full showings.
+Waiting parties are kept in one FIFO heap per party size. When seats are released (e.g. by a cancellation),
+only the free runs containing the released seats are examined: for each run the largest waiting party that
+fits is popped from its bucket, so releasing seats costs O(log n) heap work per seated party instead of
+re-running the allocator for every waiting party. A party whose preferences rule out the run is popped,
+passed over and pushed back once the bucket has been tried, so the parties queued behind it are tried in
+arrival order at O(log n) each; withdrawn requests are dropped lazily as they are popped.
+"""
+
+import heapq
+import itertools
+
+from src.booking import get_booking_id
+from src.centrality import best_block_start
+from src.logger import log_info, log_event
+from src.metrics import increment
+from src.movie_classes import Movie, Booking
+
+
+class WaitRequest:
+    """
+    A party waiting for seats.
+    Attributes:
+        request_id (str): Identifier returned to the customer.
+        party_size (int): Number of adjacent seats needed.
+        preferences (dict): Optional 'first_row'/'last_row' letters and 'category' (seat category name).
+    """
+    def __init__(self, request_id, party_size, preferences=None):
+        """
+        Initialize a WaitRequest.
+        Args:
+            request_id (str): Identifier of the request.
+            party_size (int): Number of adjacent seats needed.
+            preferences (dict, optional): Seating preferences.
+        """
+        self.request_id = request_id
+        self.party_size = party_size
+        self.preferences = dict(preferences or {})
+
+    def accepts_row(self, row_idx):
+        """
+        Check the row range preference.
+        Args:
+            row_idx (int): Row index (0 is row A).
+        Returns:
+            bool: True if the party accepts seats in this row.
+        """
+        first = self.preferences.get("first_row")
+        last = self.preferences.get("last_row")
+        if first and row_idx < ord(first.upper()) - ord('A'):
+            return False
+        if last and row_idx > ord(last.upper()) - ord('A'):
+            return False
+        return True
+
+
+class Waitlist:
+    """
+    Waiting parties bucketed by party size, first come first served within a bucket.
+    Attributes:
+        buckets (dict): Party size -> heap of (arrival order, WaitRequest).
+    """
+    def __init__(self):
+        """
+        Initialize an empty Waitlist.
+        """
+        self.buckets = {}
+        self._order = itertools.count()
+        self._waiting = set()
+        self._withdrawn = set()
+
+    def __len__(self):
+        return len(self._waiting)
+
+    def add(self, party_size, preferences=None):
+        """
+        Put a party on the waitlist.
+        Args:
+            party_size (int): Number of adjacent seats needed.
+            preferences (dict, optional): 'first_row'/'last_row' letters and 'category'.
+        Returns:
+            WaitRequest: The queued request.
+        """
+        order = next(self._order)
+        request = WaitRequest(f"W{order + 1:04d}", party_size, preferences)
+        heapq.heappush(self.buckets.setdefault(party_size, []), (order, request))
+        self._waiting.add(request.request_id)
+        log_info(f"Waitlisted {request.request_id}: party of {party_size}, preferences {request.preferences}.")
+        return request
+
+    def withdraw(self, request_id):
+        """
+        Remove a request from the waitlist (lazily: it is skipped when it reaches the head of its bucket).
+        Args:
+            request_id (str): The request identifier.
+        """
+        if request_id in self._waiting:
+            self._waiting.discard(request_id)
+            self._withdrawn.add(request_id)
+
+    def _head(self, party_size):
+        """Return the oldest live request of a bucket, discarding withdrawn ones, or None."""
+        bucket = self.buckets.get(party_size)
+        while bucket and bucket[0][1].request_id in self._withdrawn:
+            self._withdrawn.discard(heapq.heappop(bucket)[1].request_id)
+        return bucket[0][1] if bucket else None
+
+    def _take_first(self, party_size, place):
+        """
+        Pop the oldest live request of a bucket for which place(request) returns a result other than None.
+        Requests passed over are pushed back afterwards, so each request tried costs O(log n).
+        Returns:
+            tuple or None: (request, result), or None if no request of the bucket can be placed.
+        """
+        bucket = self.buckets.get(party_size)
+        passed = []
+        try:
+            while bucket:
+                entry = heapq.heappop(bucket)
+                request = entry[1]
+                if request.request_id in self._withdrawn:
+                    self._withdrawn.discard(request.request_id)
+                    continue
+                result = place(request)
+                if result is not None:
+                    return request, result
+                passed.append(entry)
+            return None
+        finally:
+            for entry in passed:
+                heapq.heappush(bucket, entry)
+
+    def match_released(self, movie: Movie, seats):
+        """
+        Seat waiting parties in the free runs that contain the released seats, and book them.
+        For each run the largest waiting party that fits (and whose preferences allow the run) is seated
+        in the run's most central block, then the rest of the run is offered again.
+        Args:
+            movie (Movie): The Movie instance whose seats were released.
+            seats (list): The released seat labels.
+        Returns:
+            list: (WaitRequest, booking ID, seat labels) for every party seated.
+        """
+        seated = []
+        if not self._waiting:
+            return seated
+        layout = movie.layout
+        for row_idx in sorted({ord(seat[0]) - ord('A') for seat in seats}):
+            released = 0
+            for seat in seats:
+                if ord(seat[0]) - ord('A') == row_idx:
+                    released |= 1 << (int(seat[1:]) - 1)
+            while self._waiting:
+                occupied = movie.occupancy.booked[row_idx] | movie.occupancy.reserved[row_idx]
+                match = self._match_row(movie, row_idx, ~occupied & layout.seat_masks[row_idx], released)
+                if match is None:
+                    break
+                request, block = match
+                booking_id = get_booking_id(movie)
+                movie.add_booking(Booking(booking_id, "B", block))
+                seated.append((request, booking_id, block))
+                increment("waitlist.seated")
+                log_event("waitlist.seated", request_id=request.request_id, booking_id=booking_id,
+                          movie=movie.title, seats=block)
+        return seated
+
+    def _match_row(self, movie, row_idx, free, released):
+        """Pop the oldest of the largest fitting requests for a run of free seats touching the released ones; return (request, seats)."""
+        layout = movie.layout
+        for first, last in layout.runs(row_idx, free):
+            run = ((1 << (last - first + 1)) - 1) << (first - 1)
+            if not run & released:
+                continue
+            for size in sorted((s for s in self.buckets if s <= last - first + 1), reverse=True):
+
+                def place(request):
+                    """Return the start of the block the request would take in the run, or None."""
+                    if not request.accepts_row(row_idx):
+                        return None
+                    usable = run
+                    category = request.preferences.get("category")
+                    if category is not None:
+                        usable &= layout.category_masks.get(category, (0,) * layout.rows)[row_idx]
+                    return best_block_start(layout.block_starts(row_idx, usable, size), movie.seats_per_row, size)
+
+                match = self._take_first(size, place)
+                if match is None:
+                    continue
+                request, start = match
+                self._waiting.discard(request.request_id)
+                row_letter = chr(ord('A') + row_idx)
+                return request, [f"{row_letter}{n}" for n in range(start, start + size)]
+        return None
@@ -0,0 +1,66 @@
+"""
+test_analytics.py
+-----------------
+Unit tests for the analytics module, checking the vectorized reports against the per-movie functions.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analytics import (
+    OccupancyStack, fill_ratio, row_fill, seat_heatmap, stranded_singles,
+    centrality_weighted_occupancy, revenue_summary, centrality_weights,
+)
+from src.booking_advanced import count_stranded_seats
+from src.hall_layout import HallLayout
+from src.movie import movie_available_seats
+from src.movie_classes import Movie, Booking
+
+def make_showings():
+    small = Movie("Inception", 2, 4)
+    small.add_booking(Booking("GIC0001", "B", ["A1", "A3"]))
+    small.add_booking(Booking("GIC0002", "R", ["B4"]))
+    hall = HallLayout(3, 6, aisles=[3], removed=["C6"], categories={"premium": ["C"]})
+    large = Movie("Avatar", 3, 6, layout=hall)
+    large.add_booking(Booking("GIC0001", "B", ["A2", "C1", "C2"]))
+    empty = Movie("Avatar", 3, 6, layout=hall)
+    return [small, large, empty]
+
+def test_stack_shapes_and_padding():
+    stack = OccupancyStack.from_movies(make_showings(), ["S1", "S2", "S3"])
+    assert len(stack) == 3
+    assert stack.booked.shape == (3, 3, 6)
+    assert stack.seats[0].sum() == 8
+    assert not stack.seats[1, 2, 5]
+    assert stack.booked[0, 0, 0] and stack.booked[0, 0, 2] and stack.reserved[0, 1, 3]
+
+def test_reports_match_per_movie_functions():
+    movies = make_showings()
+    stack = OccupancyStack.from_movies(movies)
+    for i, movie in enumerate(movies):
+        capacity = movie.layout.capacity
+        assert fill_ratio(stack)[i] == pytest.approx(1 - movie_available_seats(movie) / capacity)
+        assert stranded_singles(stack)[i] == count_stranded_seats(movie)
+    assert row_fill(stack)[0].tolist() == [0.5, 0.25, 0.0]
+    assert seat_heatmap(stack)[2, 0] == 0.5
+    assert seat_heatmap(stack)[2, 5] == 0.0
+
+def test_centrality_weighting():
+    assert centrality_weights(4).tolist() == [0.4, 1.0, 1.0, 0.4]
+    assert centrality_weights(3, width=4).tolist() == [0.5, 1.0, 0.5, 0.0]
+    middle = Movie("Inception", 1, 4, bookings=[Booking("GIC0001", "B", ["A2"])])
+    edge = Movie("Inception", 1, 4, bookings=[Booking("GIC0001", "B", ["A1"])])
+    weighted = centrality_weighted_occupancy(OccupancyStack.from_movies([middle, edge]))
+    assert weighted.tolist() == [pytest.approx(1 / 2.8), pytest.approx(0.4 / 2.8)]
+
+def test_revenue_summary():
+    stack = OccupancyStack.from_movies(make_showings())
+    revenue = revenue_summary(stack, {"premium": 20.0, "standard": 10.0})
+    assert revenue["booked"].tolist() == [20.0, 50.0, 0.0]
+    assert revenue["reserved"].tolist() == [10.0, 0.0, 0.0]
+    assert revenue["potential"].tolist() == [80.0, 220.0, 220.0]
+
+def test_empty_stack():
+    stack = OccupancyStack.from_movies([])
+    assert fill_ratio(stack).shape == (0,)
@@ -0,0 +1,51 @@
+"""
+test_availability.py
+--------------------
+Unit tests for the availability module, covering summaries, row-range search and live updates.
+"""
+
+from src.availability import AvailabilityIndex, summarise_availability
+from src.hall_layout import HallLayout
+from src.movie_classes import Movie, Booking
+
+def test_summarise_availability_counts_reserved_and_aisles():
+    movie = Movie("Inception", 2, 8, layout=HallLayout(2, 8, aisles=[4]))
+    movie.add_booking(Booking("GIC0001", "R", ["B1"]))
+    movie.add_booking(Booking("GIC0002", "B", ["A6"]))
+    assert summarise_availability(movie) == {"free": 14, "blocks": [4, 4]}
+
+def test_longest_run_matches_runs():
+    layout = HallLayout(1, 10, aisles=[3], removed=["A7"])
+    for free in (0, 0b1111111111, 0b1011101101, 0b0000011000):
+        expected = max((last - first + 1 for first, last in layout.runs(0, free)), default=0)
+        assert layout.longest_run(0, free) == expected
+
+def test_find_by_block_size_and_row_range():
+    index = AvailabilityIndex()
+    index.update("S1", {"free": 9, "blocks": [1, 5, 3]})
+    index.update("S2", {"free": 12, "blocks": [6, 2, 4]})
+    index.update("S3", {"free": 0, "blocks": [0, 0, 0]})
+    assert index.find(5) == ["S1", "S2"]
+    assert index.find(4, first_row="B") == ["S1", "S2"]
+    assert index.find(5, first_row="c") == []
+    assert index.find(3, first_row="B", last_row="B") == ["S1"]
+    assert index.find(0) == []
+
+def test_tracked_showing_stays_current():
+    index = AvailabilityIndex()
+    movie = Movie("Inception", 2, 6)
+    index.track("S1", movie)
+    assert index.find(6) == ["S1"]
+    booking = Booking("GIC0001", "R", ["A3", "A4"])
+    movie.add_booking(booking)
+    assert index.summaries["S1"] == {"free": 10, "blocks": [2, 6]}
+    assert index.find(6, last_row="A") == []
+    booking.seats = ["B1"]
+    assert index.summaries["S1"] == {"free": 11, "blocks": [6, 5]}
+    booking.status = "B"
+    assert index.summaries["S1"]["free"] == 11
+    index.untrack("S1")
+    movie.add_booking(Booking("GIC0002", "B", ["A1"]))
+    assert index.summaries["S1"]["free"] == 11
+    index.remove("S1")
+    assert index.find(1) == []
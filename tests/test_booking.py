@@ -354,6 +354,15 @@ def test_book_ticket_adds_booking():
     assert booking.status == "B"
     assert len(booking.seats) == 2
 
+def test_book_ticket_renders_from_display_cache():
+    from src import movie as movie_module
+    movie = create_movie("Inception 8 10")
+    with patch.object(builtins, 'input', lambda *a, **k: ""), patch("src.booking.save_movie"), \
+            patch("src.booking.movie_display", wraps=movie_module.movie_display) as display:
+        book_ticket(movie, 2)
+    assert display.call_args.args[0] is movie
+    assert movie in movie_module._DISPLAY_CACHES
+
 def test_default_seating_first_booking_single():
     movie = create_movie("Inception 8 10")
     with patch.object(builtins, 'input', lambda *a, **k: ""):
@@ -440,4 +449,145 @@ def test_fill_prev_rows_by_centrality_with_booked():
     seat_map = {'A': ['A1', 'A2', 'A3'], 'B': ['B1', 'B2', 'B3'], 'C': ['C1', 'C2', 'C3']}
     row_letters = ['A', 'B', 'C']
     result = fill_prev_rows_by_centrality(2, row_letters, seat_map, 3, {'B2', 'A2'}, ['B1'])
-    assert result == ['B3', 'A3', 'A1']
\ No newline at end of file
+    assert result == ['B3', 'A3', 'A1']
+# --- Tests for book_tickets_bulk ---
+def test_book_tickets_bulk_matches_sequential_default_seating():
+    from src.booking import book_tickets_bulk
+    sequential = create_movie("Inception 4 10")
+    with patch.object(builtins, 'input', lambda *a, **k: ""):
+        for size in [3, 4, 2, 6, 1]:
+            sequential = book_ticket(sequential, size)
+    bulk = create_movie("Inception 4 10")
+    with patch("src.booking.save_movie"):
+        results = book_tickets_bulk(bulk, [3, 4, 2, 6, 1])
+    assert [bid for bid, _ in results] == ["GIC0001", "GIC0002", "GIC0003", "GIC0004", "GIC0005"]
+    assert bulk.to_dict() == sequential.to_dict()
+
+def test_book_tickets_bulk_with_start_seat():
+    from src.booking import book_tickets_bulk
+    movie = create_movie("Inception 3 5")
+    with patch("src.booking.save_movie"):
+        results = book_tickets_bulk(movie, [(2, "b4"), 3, (3, None)])
+    assert results[0] == ("GIC0001", ["B4", "B5"])
+    assert results[1] == ("GIC0002", ["A3", "A4", "A2"])
+    assert results[2] == ("GIC0003", ["A5", "A1", "B3"])
+    assert all(b.status == "B" for b in movie.bookings)
+
+def test_book_tickets_bulk_saves_once():
+    from src.booking import book_tickets_bulk
+    movie = create_movie("Inception 8 10")
+    with patch("src.booking.save_movie") as mock_save:
+        book_tickets_bulk(movie, [2] * 20)
+    assert mock_save.call_count == 1
+    assert len(movie.bookings) == 20
+
+def test_book_tickets_bulk_continues_existing_ids_and_skips_reserved():
+    from src.booking import book_tickets_bulk
+    from src.movie_classes import Booking
+    movie = create_movie("Inception 1 5")
+    movie.bookings = [Booking("GIC0007", "R", ["A3"])]
+    with patch("src.booking.save_movie"):
+        results = book_tickets_bulk(movie, [2])
+    assert results == [("GIC0008", ["A4", "A2"])]
+
+def test_book_tickets_bulk_rejects_over_capacity():
+    from src.booking import book_tickets_bulk
+    movie = create_movie("Inception 2 3")
+    with patch("src.booking.save_movie") as mock_save:
+        results = book_tickets_bulk(movie, [4, 3])
+    assert results == []
+    assert movie.bookings == []
+    mock_save.assert_not_called()
+
+def test_book_tickets_bulk_rejects_invalid_requests():
+    from src.booking import book_tickets_bulk
+    movie = create_movie("Inception 2 3")
+    with patch("src.booking.save_movie"):
+        assert book_tickets_bulk(movie, [1, (1, "Z9")]) == []
+        assert book_tickets_bulk(movie, [0]) == []
+        assert book_tickets_bulk(movie, [(1, "A4")]) == []
+        assert book_tickets_bulk(movie, [(2, 5)]) == []
+        assert book_tickets_bulk(movie, [(1, "A1", 0)]) == []
+        assert book_tickets_bulk(movie, [(1,)]) == []
+        assert book_tickets_bulk(movie, [True]) == []
+        assert book_tickets_bulk(movie, [(True, "A1")]) == []
+    assert movie.bookings == []
+
+def test_book_ticket_with_seat_selection():
+    movie = create_movie("Inception 3 10")
+    inputs = iter(["A1-A2,C7", "A1-A3,C7", ""])
+    with patch.object(builtins, 'input', lambda *a, **k: next(inputs)):
+        movie = book_ticket(movie, 4)
+    assert movie.bookings[0].seats == ["A1", "A2", "A3", "C7"]
+    assert movie.bookings[0].status == "B"
+
+def test_seating_skips_removed_seats():
+    from src.movie_classes import Movie
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 2, 5, layout=HallLayout(2, 5, removed=["A3", "B1"]))
+    assert build_seat_map(movie) == {"A": ["A1", "A2", "A4", "A5"], "B": ["B2", "B3", "B4", "B5"]}
+    assert default_seating(movie, 3) == ["A4", "A2", "A5"]
+    assert custom_seating(movie, 3, "A2") == ["A2", "A4", "A5"]
+    assert custom_seating(movie, 6, "A4") == ["A4", "A5", "B3", "B4", "B2", "B5"]
+
+def test_seating_by_category():
+    from src.movie_classes import Movie, Booking
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 3, 6, layout=HallLayout(3, 6, categories={"premium": ["B", "C"]}))
+    movie.add_booking(Booking("GIC0001", "B", ["B3", "B4"]))
+    assert default_seating(movie, 4, category="premium") == ["B5", "B2", "B6", "B1"]
+    assert default_seating(movie, 2, category="standard") == ["A4", "A3"]
+    assert custom_seating(movie, 3, "B5", category="premium") == ["B5", "B6", "C4"]
+
+# --- Tests for cancel_booking and rebook_booking ---
+def test_cancel_booking_releases_seats_and_journals(tmp_path):
+    from src.booking import cancel_booking, CANCELLED
+    from src.journal import BookingJournal
+    from src.movie import movie_available_seats, build_seat_display_map
+    from src.movie_classes import Movie, Booking
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    movie = Movie("Inception", 2, 4)
+    movie.add_booking(Booking("GIC0001", "B", ["A2", "A3"]))
+    movie.add_booking(Booking("GIC0002", "B", ["B1"]))
+    assert build_seat_display_map(movie)["A"] == [".", "#", "#", "."]
+    with patch("src.booking.save_movie"):
+        assert cancel_booking(movie, "GIC0001", journal) == ["A2", "A3"]
+        assert cancel_booking(movie, "GIC0001", journal) is None
+        assert cancel_booking(movie, "GIC0404", journal) is None
+    assert movie.get_booking("GIC0001").status == CANCELLED
+    assert movie_available_seats(movie) == 7
+    assert build_seat_display_map(movie)["A"] == [".", ".", ".", "."]
+    assert default_seating(movie, 2) == ["A3", "A2"]
+    assert get_booking_id(movie) == "GIC0003"
+    events = journal.replay()
+    assert [(e["event"], e["booking_id"], e["seats"]) for e in events] == [("cancel", "GIC0001", ["A2", "A3"])]
+
+def test_rebook_booking_moves_seats(tmp_path):
+    from src.booking import rebook_booking, cancel_booking
+    from src.journal import BookingJournal
+    from src.movie import build_seat_display_map
+    from src.movie_classes import Movie, Booking
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    movie = Movie("Inception", 2, 4)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2"]))
+    movie.add_booking(Booking("GIC0002", "R", ["B4"]))
+    build_seat_display_map(movie)
+    with patch("src.booking.save_movie"):
+        assert rebook_booking(movie, "GIC0001", ["a2", "A3"], journal) == ["A2", "A3"]
+        assert rebook_booking(movie, "GIC0001", ["B4", "B3"], journal) is None
+        assert rebook_booking(movie, "GIC0001", ["C1", "A4"], journal) is None
+        assert rebook_booking(movie, "GIC0001", ["B2", "B2"], journal) is None
+        assert rebook_booking(movie, "GIC0001", [], journal) is None
+        assert rebook_booking(movie, "GIC0001", ["B1", "B2", "B3"], journal) is None
+        assert rebook_booking(movie, "GIC0001", ["B1", 2], journal) is None
+        assert rebook_booking(movie, "GIC0001", [None, "B2"], journal) is None
+        assert rebook_booking(movie, "GIC0001", "B1", journal) is None
+        assert movie.get_booking("GIC0001").seats == ["A2", "A3"]
+        assert rebook_booking(movie, "GIC0404", ["A4"], journal) is None
+        cancel_booking(movie, "GIC0002", journal)
+        assert rebook_booking(movie, "GIC0002", ["A4"], journal) == ["A4"]
+    assert movie.get_booking("GIC0002").status == "B"
+    assert movie.occupancy.booked == [0b1110, 0]
+    assert build_seat_display_map(movie) == {"A": [".", "#", "#", "#"], "B": [".", ".", ".", "."]}
+    assert [e["event"] for e in journal.replay()] == ["rebook", "cancel", "rebook"]
+    assert journal.replay("rebook")[0]["previous"] == ["A1", "A2"]
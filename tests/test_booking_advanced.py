@@ -76,6 +76,16 @@ def test_book_ticket_advanced_valid(monkeypatch, capsys):
     result = book_ticket_advanced(movie_obj, 2)
     assert result is movie_obj
 
+def test_book_ticket_advanced_renders_from_display_cache(monkeypatch):
+    from src import movie as movie_module
+    movie_obj = create_movie("Inception 2 4")
+    monkeypatch.setattr("builtins.input", lambda _: "")
+    with patch("src.booking_advanced.save_movie"), \
+            patch("src.booking_advanced.movie_display", wraps=movie_module.movie_display) as display:
+        book_ticket_advanced(movie_obj, 2)
+    assert display.call_args.args[0] is movie_obj
+    assert movie_obj in movie_module._DISPLAY_CACHES
+
 def test__find_best_block_in_row_multiple_blocks():
     # Multiple blocks, only one big enough
     available = ["A1", "A2", "A4", "A5", "A6"]
@@ -366,4 +376,82 @@ def test_assign_single_seat_advanced():
     assigned = ['A2', 'A3', 'A4', 'B1', 'B2', 'B3', 'B4']
     result = assign_single_seat_advanced(rows, seat_map, booked, assigned, seats_per_row)
     # Only A1 is free
-    assert result == ['A1']
\ No newline at end of file
+    assert result == ['A1']
+## Tests for default_seating_optimised and fragmentation helpers
+def test_count_stranded_seats():
+    from src.booking_advanced import count_stranded_seats
+    movie = create_movie("TestMovie 2 6")
+    movie.bookings = [Booking("GIC0001", "B", ["A2", "A4", "B1", "B2"]), Booking("GIC0002", "R", ["B5"])]
+    # A1 and A3 are isolated; reserved seats are not counted as unavailable
+    assert count_stranded_seats(movie) == 2
+
+def test_default_seating_optimised_empty_hall_matches_greedy():
+    from src.booking_advanced import default_seating_optimised
+    movie = create_movie("TestMovie 3 10")
+    for size in [1, 2, 3, 4]:
+        assert default_seating_optimised(movie, size) == default_seating_advanced(movie, size)
+
+def test_default_seating_optimised_prefers_exact_fit():
+    from src.booking_advanced import default_seating_optimised
+    movie = create_movie("TestMovie 1 6")
+    movie.bookings = [Booking("GIC0001", "B", ["A3"])]
+    # Greedy takes the central A4-A5 and strands A6; the exact-fit run A1-A2 strands nothing
+    assert default_seating_advanced(movie, 2) == ["A4", "A5"]
+    assert default_seating_optimised(movie, 2) == ["A1", "A2"]
+
+def test_default_seating_optimised_moves_back_rather_than_strand():
+    from src.booking_advanced import default_seating_optimised
+    movie = create_movie("TestMovie 2 7")
+    movie.bookings = [Booking("GIC0001", "B", ["A4"])]
+    # Every pair in row A would leave a single seat behind
+    assert default_seating_optimised(movie, 2) == ["B4", "B5"]
+
+def test_default_seating_optimised_falls_back_when_no_block_fits():
+    from src.booking_advanced import default_seating_optimised
+    movie = create_movie("TestMovie 2 4")
+    movie.bookings = [Booking("GIC0001", "B", ["A2", "A3", "B1"])]
+    assert default_seating_optimised(movie, 4) == default_seating_advanced(movie, 4)
+
+def test_book_ticket_advanced_optimised_strategy():
+    movie = create_movie("TestMovie 1 6")
+    movie.bookings = [Booking("GIC0001", "B", ["A3"])]
+    with patch.object(builtins, 'input', lambda *a, **k: ""):
+        movie = book_ticket_advanced(movie, 2, strategy="optimised")
+    assert movie.bookings[-1].seats == ["A1", "A2"]
+    assert movie.bookings[-1].status == "B"
+
+def test_find_contiguous_blocks_respects_aisles():
+    from src.hall_layout import HallLayout
+    layout = HallLayout(1, 6, aisles=[3])
+    available = ["A1", "A2", "A3", "A4", "A5", "A6"]
+    assert find_contiguous_blocks(available) == [available]
+    assert find_contiguous_blocks(available, layout) == [["A1", "A2", "A3"], ["A4", "A5", "A6"]]
+
+def test_advanced_seating_with_layout():
+    from src.movie_classes import Movie
+    from src.hall_layout import HallLayout
+    from src.booking_advanced import default_seating_optimised
+    movie = Movie("TestMovie", 2, 8, layout=HallLayout(2, 8, aisles=[4], removed=["B1"]))
+    assert default_seating_advanced(movie, 4) == ["A1", "A2", "A3", "A4"]
+    # No block of 5 crosses the aisle, so the group cannot sit together
+    split = sorted(default_seating_advanced(movie, 5), key=lambda s: int(s[1:]))
+    assert len(find_contiguous_blocks(split, movie.layout)) == 2
+    # B1 is removed, so B2-B4 is an exact fit that strands nothing
+    movie.bookings = [Booking("GIC0001", "B", ["A3", "A4", "A5", "A6"])]
+    assert default_seating_optimised(movie, 3) == ["B2", "B3", "B4"]
+
+def test_default_seating_advanced_by_category():
+    from src.movie_classes import Movie
+    from src.hall_layout import HallLayout
+    movie = Movie("TestMovie", 3, 8, layout=HallLayout(3, 8, categories={"premium": ["C"]}))
+    assert default_seating_advanced(movie, 4, category="premium") == ["C3", "C4", "C5", "C6"]
+    assert default_seating_advanced(movie, 4) == ["A3", "A4", "A5", "A6"]
+
+def test_default_seating_optimised_respects_category():
+    from src.booking_advanced import default_seating_optimised
+    from src.hall_layout import HallLayout
+    from src.movie_classes import Movie
+    layout = HallLayout(2, 6, categories={"premium": ["B"]})
+    movie = Movie("TestMovie", 2, 6, layout=layout)
+    assert default_seating_optimised(movie, 2, category="premium")[0].startswith("B")
+    assert default_seating_optimised(movie, 2) == default_seating_advanced(movie, 2)
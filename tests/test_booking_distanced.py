@@ -0,0 +1,43 @@
+"""
+test_booking_distanced.py
+-------------------------
+Unit tests for the social-distancing seating mode.
+"""
+
+from src.booking_distanced import default_seating_distanced, distanced_capacity, distanced_free_masks
+from src.movie import create_movie
+from src.movie_classes import Booking
+
+def test_distanced_seating_empty_hall_is_central():
+    movie = create_movie("Inception 3 10")
+    assert default_seating_distanced(movie, 3) == ["A4", "A5", "A6"]
+
+def test_distanced_seating_keeps_buffer_seats():
+    movie = create_movie("Inception 1 10")
+    movie.bookings = [Booking("GIC0001", "B", ["A4", "A5", "A6"])]
+    # A3 and A7 are buffers, so a pair goes to A8-A9 (rightmost of the two equally central options)
+    assert default_seating_distanced(movie, 2) == ["A8", "A9"]
+    assert default_seating_distanced(movie, 2, buffer_seats=2) == ["A9", "A10"]
+    assert default_seating_distanced(movie, 2, buffer_seats=3) == []
+    assert default_seating_distanced(movie, 1, buffer_seats=3) == ["A10"]
+
+def test_distanced_seating_buffer_rows():
+    movie = create_movie("Inception 3 5")
+    movie.bookings = [Booking("GIC0001", "B", ["A3"])]
+    # Row B is only partly blocked without a row buffer, fully blocked around B2-B4 with one
+    assert default_seating_distanced(movie, 3) == ["B2", "B3", "B4"]
+    assert default_seating_distanced(movie, 3, buffer_rows=1) == ["C2", "C3", "C4"]
+
+def test_distanced_seating_ignores_reserved_and_never_splits():
+    movie = create_movie("Inception 2 4")
+    movie.bookings = [Booking("GIC0001", "B", ["A2", "B3"]), Booking("GIC0002", "R", ["A4"])]
+    assert default_seating_distanced(movie, 2, buffer_seats=0) == ["A3", "A4"]
+    assert default_seating_distanced(movie, 3) == []
+
+def test_distanced_capacity():
+    movie = create_movie("Inception 2 5")
+    assert distanced_capacity(movie) == 10
+    movie.bookings = [Booking("GIC0001", "B", ["A3"])]
+    assert distanced_capacity(movie) == 7
+    assert distanced_capacity(movie, buffer_rows=1) == 4
+    assert distanced_free_masks(movie, buffer_rows=1) == [0b10001, 0b10001]
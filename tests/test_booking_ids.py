@@ -0,0 +1,52 @@
+"""
+test_booking_ids.py
+-------------------
+Unit tests for the booking_ids module, covering sequential, leased and sharded allocators.
+"""
+
+from unittest.mock import patch
+
+from src.booking import get_booking_id, book_tickets_bulk
+from src.booking_ids import (
+    SequentialIdAllocator, LeasedBlockAllocator, FileLeaseSource, legacy_booking_number, set_allocator, get_allocator,
+)
+from src.movie_classes import Movie, Booking
+
+def test_legacy_booking_number():
+    assert legacy_booking_number("GIC0042") == 42
+    assert legacy_booking_number("GIC12345") == 12345
+    assert legacy_booking_number("GIC-00000001") is None
+    assert legacy_booking_number("XYZ0001") is None
+
+def test_sequential_ids_continue_past_9999_without_scanning():
+    movie = Movie("Inception", 2, 4, bookings=[Booking("GIC9999", "B", ["A1"]), Booking("GICXX", "B", ["A2"])])
+    assert movie.last_booking_number == 9999
+    assert get_booking_id(movie) == "GIC10000"
+    movie.add_booking(Booking("GIC10000", "B", ["A3"]))
+    assert movie.last_booking_number == 10000
+    assert SequentialIdAllocator(width=8).next_ids(movie, 2) == ["GIC00010001", "GIC00010002"]
+
+def test_leased_blocks_are_disjoint_across_workers(tmp_path):
+    source_path = str(tmp_path / "lease")
+    first = LeasedBlockAllocator(FileLeaseSource(source_path), block_size=3)
+    second = LeasedBlockAllocator(FileLeaseSource(source_path), block_size=3)
+    ids = first.next_ids(count=2) + second.next_ids(count=2) + first.next_ids(count=2)
+    assert ids == [
+        "GIC-00000001", "GIC-00000002", "GIC-00000004", "GIC-00000005", "GIC-00000003", "GIC-00000007",
+    ]
+    assert len(set(ids)) == len(ids)
+    restarted = LeasedBlockAllocator(FileLeaseSource(source_path), block_size=3)
+    assert restarted.next_ids() == ["GIC-00000010"]
+    assert LeasedBlockAllocator(FileLeaseSource(str(tmp_path / "eu")), shard="EU", width=4).next_ids() == ["GICEU-0001"]
+
+def test_bulk_booking_uses_configured_allocator(tmp_path):
+    previous = get_allocator()
+    set_allocator(LeasedBlockAllocator(FileLeaseSource(str(tmp_path / "lease")), block_size=10))
+    try:
+        movie = Movie("Inception", 2, 4, bookings=[Booking("GIC0001", "B", ["A1"])])
+        with patch("src.booking.save_movie"):
+            results = book_tickets_bulk(movie, [2, 1])
+        assert [bid for bid, _ in results] == ["GIC-00000001", "GIC-00000002"]
+        assert get_booking_id(movie) == "GIC-00000003"
+    finally:
+        set_allocator(previous)
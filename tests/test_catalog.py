@@ -0,0 +1,94 @@
+"""
+test_catalog.py
+---------------
+Unit tests for the catalog module, covering showing listing, lazy loading and LRU write-back.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.catalog import MovieCatalog
+from src.movie_classes import Movie, Booking
+
+def make_catalog(tmp_path, capacity=2):
+    catalog = MovieCatalog(str(tmp_path), capacity=capacity)
+    catalog.add_showing("S1", Movie("Inception", 2, 4), showtime="2024-05-01 21:00")
+    catalog.add_showing("S2", Movie("Inception", 2, 4), showtime="2024-05-01 18:00")
+    catalog.add_showing("S3", Movie("Avatar", 3, 5), showtime="2024-05-01 19:00")
+    return catalog
+
+def test_catalog_lists_movies_and_showings(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert catalog.list_movies() == ["Avatar", "Inception"]
+    assert [s["showing_id"] for s in catalog.list_showings()] == ["S2", "S3", "S1"]
+    assert [s["showing_id"] for s in catalog.list_showings("Inception")] == ["S2", "S1"]
+
+def test_catalog_cache_is_bounded_lru(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert catalog.cached_showings() == ["S2", "S3"]
+    catalog.get("S2")
+    assert catalog.cached_showings() == ["S3", "S2"]
+    movie = catalog.get("S1")
+    assert movie.title == "Inception"
+    assert catalog.cached_showings() == ["S2", "S1"]
+    assert catalog.get("missing") is None
+
+def test_catalog_writes_back_dirty_showing_on_eviction(tmp_path):
+    catalog = make_catalog(tmp_path)
+    movie = catalog.get("S3")
+    movie.add_booking(Booking("GIC0001", "B", ["A1"]))
+    catalog.get("S1")
+    catalog.get("S2")  # evicts S3
+    assert "S3" not in catalog.cached_showings()
+    with open(os.path.join(str(tmp_path), "S3.json")) as f:
+        assert json.load(f)["bookings"] == [{"ID": "GIC0001", "status": "B", "seats": ["A1"]}]
+    assert catalog.get("S3").bookings[0].seats == ["A1"]
+
+def test_catalog_flush_and_reopen(tmp_path):
+    catalog = make_catalog(tmp_path, capacity=10)
+    catalog.get("S1").add_booking(Booking("GIC0001", "B", ["B2"]))
+    catalog.flush()
+    reopened = MovieCatalog(str(tmp_path))
+    assert reopened.cached_showings() == []
+    assert len(reopened.list_showings()) == 3
+    assert reopened.get("S1").bookings[0].seats == ["B2"]
+
+def test_catalog_finds_showings_without_loading(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.get("S2").add_booking(Booking("GIC0001", "B", ["A2", "B3"]))
+    assert [s["showing_id"] for s in catalog.find_showings(4)] == ["S3", "S1"]
+    assert [s["showing_id"] for s in catalog.find_showings(2, title="Inception")] == ["S2", "S1"]
+    assert [s["showing_id"] for s in catalog.find_showings(5, first_row="C")] == ["S3"]
+    catalog.flush()
+    reopened = MovieCatalog(str(tmp_path))
+    assert [s["showing_id"] for s in reopened.find_showings(4)] == ["S3", "S1"]
+    assert reopened.cached_showings() == []
+
+def test_catalog_rejects_showing_ids_outside_storage(tmp_path):
+    catalog = MovieCatalog(str(tmp_path / "catalog"))
+    for showing_id in ["../escape", "a/b", "..", "", "S1.json", None]:
+        with pytest.raises(ValueError):
+            catalog.add_showing(showing_id, Movie("Inception", 2, 4))
+    assert catalog.list_showings() == []
+    assert os.listdir(tmp_path) == []
+    catalog.add_showing("Late-Show_2", Movie("Inception", 2, 4))
+    assert os.path.exists(tmp_path / "catalog" / "Late-Show_2.json")
+
+def test_catalog_index_never_runs_ahead_of_showing_files(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.get("S2").add_booking(Booking("GIC0001", "B", ["A2", "B3"]))
+    catalog.add_showing("S4", Movie("Avatar", 2, 4))  # writes the index with S2's new summary
+    reopened = MovieCatalog(str(tmp_path))
+    assert [s["showing_id"] for s in reopened.find_showings(4, title="Inception")] == ["S1"]
+    assert reopened.get("S2").bookings[0].seats == ["A2", "B3"]
+
+def test_catalog_stops_watching_evicted_showings(tmp_path):
+    catalog = make_catalog(tmp_path)
+    evicted = catalog.get("S3")
+    catalog.get("S1")
+    catalog.get("S2")  # evicts S3
+    evicted.add_booking(Booking("GIC0001", "B", ["A1"]))
+    catalog.flush()
+    assert MovieCatalog(str(tmp_path)).get("S3").bookings == []
@@ -0,0 +1,56 @@
+"""
+test_centrality.py
+------------------
+Unit tests for the centrality module, covering the pure-Python engine and, when NumPy is installed, checking that
+the NumPy engine matches it.
+"""
+
+import importlib.util
+import random
+
+import pytest
+
+from src.booking import seat_sort_order
+from src.centrality import rank_seats, best_block_start, set_engine, get_engine
+from src.hall_layout import HallLayout
+
+# Only the NumPy engine tests need NumPy; the pure-Python engine is always tested
+requires_numpy = pytest.mark.skipif(importlib.util.find_spec("numpy") is None, reason="NumPy is not installed")
+
+def test_python_engine_rankings():
+    assert rank_seats([1, 2, 3, 4, 5], 5, engine="python") == [2, 3, 1, 4, 0]
+    assert best_block_start(0b111111, 6, 2, engine="python") == 3
+    assert best_block_start(0b100001, 6, 1, engine="python") == 1
+    assert best_block_start(0, 6, 2, engine="python") is None
+
+@requires_numpy
+def test_engines_agree_on_random_rows():
+    rng = random.Random(7)
+    for _ in range(300):
+        seats_per_row = rng.randint(1, 80)
+        free = rng.getrandbits(seats_per_row)
+        nums = [n for n in range(1, seats_per_row + 1) if free >> (n - 1) & 1]
+        labels = [f"A{n}" for n in nums]
+        assert rank_seats(nums, seats_per_row, engine="numpy") == rank_seats(nums, seats_per_row, engine="python")
+        assert rank_seats(nums, seats_per_row, labels, engine="numpy") == rank_seats(nums, seats_per_row, labels, engine="python")
+        layout = HallLayout.shared(1, seats_per_row, aisles=[seats_per_row // 3])
+        for width in (1, 2, 3, 5):
+            starts = layout.block_starts(0, free, width)
+            assert best_block_start(starts, seats_per_row, width, engine="numpy") == \
+                best_block_start(starts, seats_per_row, width, engine="python")
+
+@requires_numpy
+def test_set_engine_routes_callers():
+    seats = [f"B{n}" for n in range(1, 9)]
+    expected = seat_sort_order(seats, 8)
+    set_engine("numpy")
+    try:
+        assert get_engine() == "numpy"
+        assert seat_sort_order(seats, 8) == expected
+    finally:
+        set_engine("python")
+
+def test_set_engine_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        set_engine("fortran")
+    assert get_engine() == "python"
@@ -0,0 +1,94 @@
+"""
+test_hall_layout.py
+-------------------
+Unit tests for the hall_layout module, covering layout compilation, adjacency and block search.
+"""
+
+from src.hall_layout import HallLayout, centrality_key
+import copy
+import pickle
+
+import pytest
+
+from src.occupancy import mask_to_seat_nums
+
+def test_rectangular_layout():
+    layout = HallLayout(2, 5)
+    assert layout.is_rectangular()
+    assert layout.capacity == 10
+    assert layout.seat_masks == (0b11111, 0b11111)
+    assert layout.runs(0, 0b11011) == [(1, 2), (4, 5)]
+
+def test_layout_compiles_removed_and_wheelchair():
+    layout = HallLayout(2, 6, removed=["a1", "B6", "Z9"], wheelchair=["A2", "A1"])
+    assert not layout.is_rectangular()
+    assert layout.removed == {"A1", "B6"}
+    assert layout.wheelchair == {"A2"}
+    assert layout.capacity == 10
+    assert not layout.has_seat(0, 1)
+    assert layout.has_seat(0, 2)
+    assert not layout.has_seat(2, 1)
+    assert layout.wheelchair_masks == (0b10, 0)
+
+def test_layout_aisles_break_adjacency():
+    layout = HallLayout(1, 8, aisles=[4])
+    assert layout.is_adjacent(0, 3)
+    assert not layout.is_adjacent(0, 4)
+    assert not layout.is_adjacent(0, 8)
+    assert layout.runs(0, layout.full_mask) == [(1, 4), (5, 8)]
+    assert mask_to_seat_nums(layout.block_starts(0, layout.full_mask, 3)) == [1, 2, 5, 6]
+    assert layout.block_starts(0, layout.full_mask, 5) == 0
+    assert mask_to_seat_nums(layout.block_starts(0, 0b10011000, 1)) == [4, 5, 8]
+
+def test_layout_removed_seat_breaks_runs():
+    layout = HallLayout(1, 6, removed=["A3"])
+    assert layout.runs(0, layout.full_mask) == [(1, 2), (4, 6)]
+    assert mask_to_seat_nums(layout.block_starts(0, layout.full_mask, 2)) == [1, 4, 5]
+
+def test_layout_dict_round_trip():
+    layout = HallLayout(3, 10, aisles=[3, 7], removed=["C1"], wheelchair=["A4"])
+    data = layout.to_dict()
+    assert data == {"aisles": [3, 7], "removed": ["C1"], "wheelchair": ["A4"]}
+    again = HallLayout.from_dict(3, 10, data)
+    assert again.seat_masks == layout.seat_masks
+    assert again.link_masks == layout.link_masks
+
+def test_layout_categories():
+    layout = HallLayout(3, 4, removed=["C4"], wheelchair=["A1"], categories={"premium": ["C", "B4"]})
+    assert layout.category_masks["premium"] == (0, 0b1000, 0b0111)
+    assert layout.category_masks["accessible"] == (0b0001, 0, 0)
+    assert layout.category_masks["standard"] == (0b1110, 0b0111, 0)
+    assert layout.category_capacity == {"premium": 4, "accessible": 1, "standard": 6}
+    assert layout.seat_category(1, 4) == "premium"
+    assert layout.seat_category(0, 1) == "accessible"
+    assert layout.seat_category(2, 4) is None
+    assert layout.category_seats("premium") == {"B4", "C1", "C2", "C3"}
+    assert layout.category_seats("unknown") == frozenset()
+    again = HallLayout.from_dict(3, 4, layout.to_dict())
+    assert again.category_masks == layout.category_masks
+
+def test_shared_layout_is_interned():
+    a = HallLayout.shared(3, 6, aisles=[3], removed=["a1"])
+    b = HallLayout.shared(3, 6, aisles=(3,), removed=["A1"])
+    assert a is b
+    assert HallLayout.from_dict(3, 6, a.to_dict()) is a
+    assert HallLayout.shared(3, 6) is not a
+    assert copy.deepcopy(a) is a
+    assert pickle.loads(pickle.dumps(a)) is a
+
+def test_layout_is_immutable():
+    layout = HallLayout.shared(2, 4)
+    with pytest.raises(AttributeError):
+        layout.capacity = 3
+    with pytest.raises(TypeError):
+        layout.category_masks["vip"] = (0, 0)
+    with pytest.raises(TypeError):
+        layout.seat_masks[0] = 0
+
+def test_layout_precomputed_labels_and_order():
+    layout = HallLayout(2, 5, removed=["B3"])
+    assert layout.labels == (("A1", "A2", "A3", "A4", "A5"), ("B1", "B2", "B4", "B5"))
+    assert layout.row_order[0] == ("A3", "A4", "A2", "A5", "A1")
+    assert layout.row_order[1] == ("B4", "B2", "B5", "B1")
+    assert layout.centrality_order[:5] == layout.row_order[0]
+    assert centrality_key(5, 10) == (0, -5) and centrality_key(6, 10) == (0, -6)
@@ -0,0 +1,108 @@
+"""
+test_idempotency.py
+-------------------
+Unit tests for the idempotency module, covering TTL and size eviction, journal persistence and booking commands.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.booking import book_tickets_bulk, cancel_booking, rebook_booking
+from src.idempotency import IdempotencyCache, IdempotencyConflict
+from src.journal import BookingJournal
+from src.movie_classes import Movie, Booking
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_cache_expires_and_is_bounded():
+    clock = FakeClock()
+    cache = IdempotencyCache(ttl=10, max_entries=2, clock=clock)
+    cache.put("k1", "bulk", [1])
+    cache.put("k2", "bulk", [2])
+    cache.put("k3", "bulk", [3])
+    assert len(cache) == 2
+    assert cache.get("k1", "bulk") == (False, None)
+    assert cache.get("k3", "bulk") == (True, [3])
+    with pytest.raises(IdempotencyConflict):
+        cache.get("k3", "cancel")
+    clock.now += 10
+    assert cache.get("k2", "bulk") == (False, None)
+    assert len(cache) == 0
+
+def test_run_skips_failed_commands():
+    cache = IdempotencyCache()
+    calls = []
+    assert cache.run("k", "cancel", lambda: calls.append(1)) is None
+    assert cache.run("k", "cancel", lambda: calls.append(2) or ["A1"]) == ["A1"]
+    assert cache.run("k", "cancel", lambda: calls.append(3) or ["B1"]) == ["A1"]
+    assert calls == [1, 2]
+
+def test_bulk_booking_is_deduplicated_across_restarts(tmp_path):
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    movie = Movie("Inception", 2, 5)
+    with patch("src.booking.save_movie"):
+        first = book_tickets_bulk(movie, [2, 3], idempotency_key="batch-1", dedup=IdempotencyCache(journal))
+        restarted = IdempotencyCache(journal)
+        assert restarted.load() == 1
+        again = book_tickets_bulk(movie, [2, 3], idempotency_key="batch-1", dedup=restarted)
+    assert again == first
+    assert len(movie.bookings) == 2
+
+def test_cancel_is_deduplicated(tmp_path):
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    cache = IdempotencyCache(journal)
+    movie = Movie("Inception", 1, 4, bookings=[Booking("GIC0001", "B", ["A1"])])
+    with patch("src.booking.save_movie"):
+        assert cancel_booking(movie, "GIC0001", journal, idempotency_key="c-1", dedup=cache) == ["A1"]
+        assert cancel_booking(movie, "GIC0001", journal, idempotency_key="c-1", dedup=cache) == ["A1"]
+        assert cancel_booking(movie, "GIC0001", journal) is None
+    assert [e["event"] for e in journal.replay()] == ["cancel", "idempotency"]
+
+def test_key_reused_for_another_movie_or_payload_conflicts(tmp_path):
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    cache = IdempotencyCache(journal)
+    movie_a = Movie("Inception", 2, 5)
+    movie_b = Movie("Avatar", 2, 5)
+    with patch("src.booking.save_movie"):
+        first = book_tickets_bulk(movie_a, [2], idempotency_key="k", dedup=cache)
+        with pytest.raises(IdempotencyConflict):
+            book_tickets_bulk(movie_b, [4], idempotency_key="k", dedup=cache)
+        with pytest.raises(IdempotencyConflict):
+            book_tickets_bulk(movie_a, [3], idempotency_key="k", dedup=cache)
+        with pytest.raises(IdempotencyConflict):
+            cancel_booking(movie_a, first[0][0], journal, idempotency_key="k", dedup=cache)
+        assert book_tickets_bulk(movie_a, [2], idempotency_key="k", dedup=cache) == first
+        rebook_booking(movie_a, first[0][0], ["B1", "B2"], journal, idempotency_key="r", dedup=cache)
+        with pytest.raises(IdempotencyConflict):
+            rebook_booking(movie_a, first[0][0], ["B3", "B4"], journal, idempotency_key="r", dedup=cache)
+    assert movie_b.bookings == []
+    assert len(movie_a.bookings) == 1
+    restarted = IdempotencyCache(journal)
+    restarted.load()
+    with pytest.raises(IdempotencyConflict):
+        with patch("src.booking.save_movie"):
+            book_tickets_bulk(movie_b, [4], idempotency_key="k", dedup=restarted)
+
+def test_key_reused_for_another_showing_of_the_same_film_conflicts():
+    cache = IdempotencyCache()
+    small = Movie("Inception", 2, 5)
+    large = Movie("Inception", 8, 10)
+    with patch("src.booking.save_movie"):
+        book_tickets_bulk(small, [2], idempotency_key="k", dedup=cache)
+        with pytest.raises(IdempotencyConflict):
+            book_tickets_bulk(large, [2], idempotency_key="k", dedup=cache)
+    assert large.bookings == []
+
+def test_get_raises_on_conflict():
+    cache = IdempotencyCache()
+    cache.put("k", "bulk", [1], fingerprint="a")
+    assert cache.get("k", "bulk", "a") == (True, [1])
+    assert cache.get("k", "bulk") == (True, [1])
+    with pytest.raises(IdempotencyConflict):
+        cache.get("k", "bulk", "b")
@@ -0,0 +1,69 @@
+"""
+test_imports.py
+---------------
+Import-time regression tests: importing the application must stay cheap and free of side effects.
+Each check runs in a fresh interpreter, as the application does for every terminal session.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_MODULES = sorted(f"src.{name[:-3]}" for name in os.listdir(os.path.join(ROOT, 'src'))
+                     if name.endswith('.py') and name != '__init__.py')
+# Only loaded on demand: optional engines, the metrics endpoint and the profiling mode
+DEFERRED_MODULES = ("numpy", "http.server", "cProfile", "tracemalloc")
+# Generous ceiling for 'import src.main' (about 0.1 s today) that still catches a heavy import slipping in
+IMPORT_BUDGET_US = 500_000
+
+
+def run_python(*args):
+    """Run the interpreter in the project root and return the completed process."""
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=60)
+
+def test_main_import_defers_heavy_modules_and_stays_fast():
+    result = run_python("-X", "importtime", "-c", "import src.main")
+    assert result.returncode == 0, result.stderr
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative)
+    for module in DEFERRED_MODULES:
+        assert module not in timings, f"'import src.main' loads {module}"
+    assert timings["src.main"] < IMPORT_BUDGET_US, f"'import src.main' took {timings['src.main']} us"
+
+def test_imports_have_no_side_effects():
+    script = (
+        "import logging, os\n"
+        "calls = []\n"
+        "os.makedirs = lambda *a, **k: calls.append(a)\n"
+        "os.mkdir = lambda *a, **k: calls.append(a)\n"
+        f"for name in {SRC_MODULES!r}:\n"
+        "    __import__(name)\n"
+        "assert not calls, calls\n"
+        "assert not logging.getLogger().handlers, logging.getLogger().handlers\n"
+    )
+    result = run_python("-c", script)
+    assert result.returncode == 0, result.stderr
+
+def test_modules_import_in_any_order():
+    # A circular import shows up as an ImportError depending on which module of the cycle is imported first,
+    # so every module is imported first once, with the project's modules unloaded in between
+    script = (
+        "import importlib, sys\n"
+        f"names = {SRC_MODULES!r}\n"
+        "for first in names:\n"
+        "    for loaded in [m for m in sys.modules if m == 'src' or m.startswith('src.')]:\n"
+        "        del sys.modules[loaded]\n"
+        "    for name in [first] + names:\n"
+        "        importlib.import_module(name)\n"
+    )
+    result = run_python("-c", script)
+    assert result.returncode == 0, result.stderr
+
+def test_validation_does_not_import_booking():
+    result = run_python("-c", "import sys, src.validation; assert 'src.booking' not in sys.modules")
+    assert result.returncode == 0, result.stderr
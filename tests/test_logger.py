@@ -100,4 +100,110 @@ def test_log_error_file_content():
     assert re.search(r'\[ERROR\]', content), 'Log level [ERROR] not found in log file.'
     mylogger.logger.removeHandler(file_handler)
     file_handler.close()
-    os.remove(test_log_file)
\ No newline at end of file
+    os.remove(test_log_file)
+
+
+def _record(message, created):
+    import logging
+    record = logging.LogRecord("gic-cbs", logging.INFO, __file__, 0, message, None, None)
+    record.created = created
+    return record
+
+def test_rotation_by_size_compresses_in_background(tmp_path):
+    import gzip
+    import logging
+    from datetime import datetime
+    from src.logger import LogCompressor, RotatingDailyFileHandler
+    now = datetime(2026, 3, 1, 12, 0)
+    compressor = LogCompressor(retention_days=None)
+    handler = RotatingDailyFileHandler(str(tmp_path), max_bytes=100, compressor=compressor, now=now)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for i in range(7):  # 41-byte lines, so three per file
+        handler.handle(_record(f"message {i} " + "x" * 30, now.timestamp()))
+    compressor.join()
+    handler.close()
+    names = sorted(os.listdir(tmp_path))
+    assert names == ['2026-03-01.1.log.gz', '2026-03-01.2.log.gz', '2026-03-01.log']
+    with gzip.open(tmp_path / '2026-03-01.1.log.gz', 'rt') as f:
+        assert f.read().startswith("message 0 ")
+    assert (tmp_path / '2026-03-01.log').read_text().startswith("message 6 ")
+
+def test_rotation_at_midnight_and_retention(tmp_path):
+    import logging
+    from datetime import datetime, date
+    from src.logger import LogCompressor, RotatingDailyFileHandler, prune_logs
+    (tmp_path / '2026-02-01.3.log.gz').write_bytes(b"old")
+    (tmp_path / 'notes.txt').write_text("kept")
+    day = datetime(2026, 3, 1, 23, 59)
+    compressor = LogCompressor(retention_days=None)
+    handler = RotatingDailyFileHandler(str(tmp_path), max_bytes=None, compressor=compressor, now=day)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler.handle(_record("before midnight", day.timestamp()))
+    handler.handle(_record("after midnight", datetime(2026, 3, 2, 0, 1).timestamp()))
+    compressor.join()
+    handler.close()
+    assert (tmp_path / '2026-03-01.1.log.gz').exists()
+    assert (tmp_path / '2026-03-02.log').read_text() == "after midnight\n"
+    deleted = prune_logs(str(tmp_path), retention_days=14, today=date(2026, 3, 2))
+    assert deleted == ['2026-02-01.3.log.gz']
+    assert sorted(os.listdir(tmp_path)) == ['2026-03-01.1.log.gz', '2026-03-02.log', 'notes.txt']
+
+def test_leftover_logs_of_earlier_days_are_compressed(tmp_path):
+    from datetime import datetime
+    from src.logger import LogCompressor, RotatingDailyFileHandler
+    (tmp_path / '2026-02-27.log').write_text("from a process that never rolled over\n")
+    (tmp_path / '2026-02-28.1.log').write_text("rotated, not yet compressed\n")
+    compressor = LogCompressor(retention_days=None)
+    handler = RotatingDailyFileHandler(str(tmp_path), compressor=compressor, now=datetime(2026, 3, 1))
+    compressor.join()
+    handler.close()
+    assert sorted(os.listdir(tmp_path)) == ['2026-02-27.1.log.gz', '2026-02-28.1.log.gz', '2026-03-01.log']
+
+def _capture(formatter):
+    import io
+    import logging
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+    mylogger.logger.addHandler(handler)
+    mylogger.logger.setLevel(logging.INFO)
+    return stream, handler
+
+def test_log_event_json_lines():
+    import json
+    stream, handler = _capture(mylogger.JsonFormatter())
+    try:
+        mylogger.log_event("booking.confirmed", booking_id="GIC0001", movie="Inception", seats=["A1", "A2"])
+        mylogger.log_info("free text")
+    finally:
+        mylogger.logger.removeHandler(handler)
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["event"] == "booking.confirmed" and first["level"] == "INFO"
+    assert first["booking_id"] == "GIC0001" and first["seats"] == ["A1", "A2"]
+    assert second["event"] == "message" and second["msg"] == "free text"
+
+def test_log_event_text_and_sampling(monkeypatch):
+    import logging
+    stream, handler = _capture(logging.Formatter('%(message)s'))
+    monkeypatch.setattr(mylogger, "_sample_rates", {})
+    try:
+        mylogger.set_sample_rate("noisy", 0.25)
+        values = iter([0.1, 0.9, 0.3, 0.2])
+        monkeypatch.setattr(mylogger.random, "random", lambda: next(values))
+        for i in range(4):
+            mylogger.log_event("noisy", n=i)
+        mylogger.set_sample_rate("muted", 0)
+        mylogger.log_event("muted", n=9)
+        mylogger.log_event("booking.cancelled", booking_id="GIC0002")
+    finally:
+        mylogger.logger.removeHandler(handler)
+    assert stream.getvalue().splitlines() == [
+        "noisy n=0 sample_rate=0.25",
+        "noisy n=3 sample_rate=0.25",
+        "booking.cancelled booking_id=GIC0002",
+    ]
+
+def test_parse_sample_rates():
+    assert mylogger.parse_sample_rates("a=0.5, b=1,broken,c=x") == {"a": 0.5, "b": 1.0}
+    assert mylogger.parse_sample_rates(None) == {}
+    assert mylogger.DEFAULT_SAMPLE_RATES["advanced.block_center"] < 1
@@ -219,4 +219,77 @@ def test_check_booking_loop_no_bookings(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert "There are currently no bookings." in captured.out
     # Should not prompt for booking ID
-    assert "Enter booking ID" not in captured.out
\ No newline at end of file
+    assert "Enter booking ID" not in captured.out
+def test_main_does_not_register_metrics_dump(monkeypatch):
+    from src import main as main_module
+    monkeypatch.setattr("builtins.input", mock.Mock(side_effect=["Inception 2 2", "3"]))
+    with mock.patch("src.metrics.REGISTRY.dump_on_exit") as dump_on_exit:
+        main_module.main()
+    dump_on_exit.assert_not_called()
+
+def test_metrics_port_from_env(monkeypatch):
+    from src import main as main_module
+    monkeypatch.delenv("GIC_METRICS_PORT", raising=False)
+    assert main_module.metrics_port_from_env() is None
+    monkeypatch.setenv("GIC_METRICS_PORT", "9100")
+    assert main_module.metrics_port_from_env() == 9100
+    for bad in ["abc", "-1", "70000", "9100.5"]:
+        monkeypatch.setenv("GIC_METRICS_PORT", bad)
+        with mock.patch("src.logger.log_warning") as warn:
+            assert main_module.metrics_port_from_env() is None
+        warn.assert_called_once()
+
+def test_invalid_metrics_port_does_not_stop_session(monkeypatch, capsys):
+    from src import main as main_module
+    monkeypatch.setenv("GIC_METRICS_PORT", "not-a-port")
+    monkeypatch.setattr("builtins.input", mock.Mock(side_effect=["Inception 2 2", "3"]))
+    with mock.patch("src.metrics_server.start_metrics_server") as start:
+        main_module.main()
+    start.assert_not_called()
+    assert "Welcome to the GIC CBS application!" in capsys.readouterr().out
+
+def test_group_commit_delay_from_env(monkeypatch):
+    from src import main as main_module
+    monkeypatch.delenv("GIC_GROUP_COMMIT_MS", raising=False)
+    assert main_module.group_commit_delay_from_env() is None
+    monkeypatch.setenv("GIC_GROUP_COMMIT_MS", "5")
+    assert main_module.group_commit_delay_from_env() == 0.005
+    monkeypatch.setenv("GIC_GROUP_COMMIT_MS", "0")
+    assert main_module.group_commit_delay_from_env() == 0
+    for bad in ["abc", "-1", "inf", "nan"]:
+        monkeypatch.setenv("GIC_GROUP_COMMIT_MS", bad)
+        with mock.patch("src.logger.log_warning") as warn:
+            assert main_module.group_commit_delay_from_env() is None
+        warn.assert_called_once()
+
+def test_invalid_group_commit_window_does_not_stop_session(monkeypatch, capsys):
+    from src import main as main_module
+    monkeypatch.setenv("GIC_GROUP_COMMIT_MS", "fast")
+    monkeypatch.setattr("builtins.input", mock.Mock(side_effect=["Inception 2 2", "3"]))
+    with mock.patch("src.persistence.enable_group_commit") as enable:
+        main_module.main()
+    enable.assert_not_called()
+    assert "Welcome to the GIC CBS application!" in capsys.readouterr().out
+
+def test_seating_strategy_from_env(monkeypatch):
+    from src import main as main_module
+    monkeypatch.delenv("GIC_SEATING_STRATEGY", raising=False)
+    assert main_module.seating_strategy_from_env() == "greedy"
+    monkeypatch.setenv("GIC_SEATING_STRATEGY", "Optimised")
+    assert main_module.seating_strategy_from_env() == "optimised"
+    monkeypatch.setenv("GIC_SEATING_STRATEGY", "best")
+    with mock.patch("src.logger.log_warning") as warn:
+        assert main_module.seating_strategy_from_env() == "greedy"
+    warn.assert_called_once()
+
+def test_advanced_booking_uses_optimised_strategy_from_env(monkeypatch):
+    from src import main as main_module
+    from src.movie_classes import Movie, Booking
+    movie_obj = Movie("Inception", 1, 6)
+    movie_obj.add_booking(Booking("GIC0001", "B", ["A3"]))
+    monkeypatch.setenv("GIC_SEATING_STRATEGY", "optimised")
+    inputs = iter(["2", ""])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    with mock.patch("src.booking_advanced.save_movie"):
+        main_module.booking_tickets_loop(movie_obj, mode="advanced")
+    assert movie_obj.bookings[-1].seats == ["A1", "A2"]
@@ -0,0 +1,63 @@
+"""
+test_metrics.py
+---------------
+Unit tests for the metrics module, covering histograms, the timed decorator and dumps.
+"""
+
+import json
+
+import pytest
+
+from src.metrics import Histogram, MetricsRegistry, REGISTRY
+from src.movie_classes import Movie
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(bounds=(1, 2, 5))
+    for value in (0.5, 1, 1.5, 4, 9):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.quantile(0.4) == 1
+    assert histogram.quantile(0.99) == 9
+    data = histogram.to_dict()
+    assert data["buckets"] == {"1": 2, "2": 3, "5": 4, "+Inf": 5}
+    assert data["count"] == 5 and data["sum"] == 16 and data["max"] == 9
+    assert Histogram().quantile(0.5) == 0.0
+
+def test_timed_records_calls_errors_and_latency():
+    registry = MetricsRegistry()
+
+    @registry.timed("op")
+    def op(fail=False):
+        """Docstring kept."""
+        if fail:
+            raise ValueError("boom")
+        return 42
+
+    assert op() == 42
+    with pytest.raises(ValueError):
+        op(fail=True)
+    assert op.__doc__ == "Docstring kept."
+    assert registry.counters == {"op.calls": 2, "op.errors": 1}
+    assert registry.histograms["op"].count == 2
+
+def test_dump_to_file(tmp_path):
+    registry = MetricsRegistry()
+    registry.increment("bookings", 3)
+    registry.observe("latency", 0.002)
+    path = registry.dump_to(str(tmp_path / "metrics.json"))
+    with open(path) as f:
+        data = json.load(f)
+    assert data["counters"] == {"bookings": 3}
+    assert data["histograms"]["latency"]["count"] == 1
+    registry.reset()
+    assert registry.dump() == {"counters": {}, "histograms": {}}
+
+def test_instrumented_operations_report_to_registry():
+    from src.booking import default_seating
+    from src.movie import movie_display
+    before = REGISTRY.counters.get("booking.default_seating.calls", 0)
+    movie = Movie("Inception", 2, 4)
+    default_seating(movie, 2)
+    movie_display(movie)
+    assert REGISTRY.counters["booking.default_seating.calls"] == before + 1
+    assert REGISTRY.histograms["movie.movie_display"].count >= 1
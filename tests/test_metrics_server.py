@@ -0,0 +1,71 @@
+"""
+test_metrics_server.py
+----------------------
+Unit tests for the metrics_server module, covering the Prometheus text rendering and the HTTP endpoint.
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.metrics import MetricsRegistry
+from src.metrics_server import metric_name, render, seat_counts, start_metrics_server, watch_movie
+from src.movie_classes import Movie, Booking
+
+def test_metric_name_sanitises_registry_names():
+    assert metric_name("booking.default_seating") == "gic_booking_default_seating"
+    assert metric_name("a-b c") == "gic_a_b_c"
+
+def test_render_counters_and_histograms():
+    registry = MetricsRegistry()
+    registry.increment("bookings.confirmed", 2)
+    registry.observe("booking.default_seating", 0.00003)
+    registry.observe("booking.default_seating", 20.0)
+    text = render(registry, movies=[])
+    assert "# TYPE gic_bookings_confirmed_total counter\ngic_bookings_confirmed_total 2\n" in text
+    assert "# TYPE gic_booking_default_seating_seconds histogram" in text
+    assert 'gic_booking_default_seating_seconds_bucket{le="2.5e-05"} 0' in text
+    assert 'gic_booking_default_seating_seconds_bucket{le="5e-05"} 1' in text
+    assert 'gic_booking_default_seating_seconds_bucket{le="10.0"} 1' in text
+    assert 'gic_booking_default_seating_seconds_bucket{le="+Inf"} 2' in text
+    assert "gic_booking_default_seating_seconds_count 2" in text
+    assert "gic_log_queue_depth 0" in text
+
+def test_seat_gauges_per_movie():
+    movie = Movie('Say "Hi"', 2, 4)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2"]))
+    movie.add_booking(Booking("GIC0002", "R", ["B1"]))
+    movie.add_booking(Booking("GIC0003", "C", ["B2"]))
+    assert seat_counts(movie) == {"free": 5, "reserved": 1, "booked": 2}
+    text = render(MetricsRegistry(), movies=[movie])
+    assert 'gic_seats{movie="Say \\"Hi\\"",state="free"} 5' in text
+    assert 'gic_seats{movie="Say \\"Hi\\"",state="booked"} 2' in text
+
+def test_endpoint_serves_metrics_for_watched_movies():
+    registry = MetricsRegistry()
+    registry.increment("bookings.cancelled")
+    movie = Movie("Inception", 2, 4)
+    watch_movie(movie)
+    server = start_metrics_server(port=0, host="127.0.0.1", registry=registry)
+    assert server is not None
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            body = response.read().decode()
+        assert "gic_bookings_cancelled_total 1" in body
+        assert 'gic_seats{movie="Inception",state="free"} 8' in body
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_port_in_use_returns_none():
+    server = start_metrics_server(port=0, host="127.0.0.1")
+    try:
+        assert start_metrics_server(port=server.server_address[1], host="127.0.0.1") is None
+    finally:
+        server.shutdown()
+        server.server_close()
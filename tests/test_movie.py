@@ -217,4 +217,59 @@ def test_mark_seats_on_map_empty():
     seat_map = {'A': ['.'] * 2}
     mark_seats_on_map(seat_map, 'R', [])
     mark_seats_on_map(seat_map, 'B', [])
-    assert seat_map['A'] == ['.', '.']
\ No newline at end of file
+    assert seat_map['A'] == ['.', '.']
+def test_movie_display_with_layout():
+    from src.movie_classes import Movie, Booking
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 2, 6, layout=HallLayout(2, 6, aisles=[3], removed=["B6"], wheelchair=["A1"]))
+    movie.bookings.append(Booking("GIC0001", "B", ["A4"]))
+    output = movie_display(movie)
+    expected = (
+        "Selected seats:\n"
+        "\n"
+        "  S C R E E N   \n"
+        "----------------\n"
+        "B . . .   . .  \n"
+        "A W . .   # . .\n"
+        "  1 2 3   4 5 6"
+    )
+    assert output == expected
+    # The dict form carries the layout too
+    assert movie_display(movie.to_dict()) == expected
+
+def test_movie_available_seats_with_layout():
+    from src.movie_classes import Movie, Booking
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 2, 6, layout=HallLayout(2, 6, removed=["B6", "B5"]))
+    movie.bookings.append(Booking("GIC0001", "B", ["A4"]))
+    assert movie_available_seats(movie) == 9
+
+def test_movie_layout_round_trip():
+    from src.movie_classes import Movie
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 2, 6, layout=HallLayout(2, 6, aisles=[3]))
+    data = movie.to_dict()
+    assert data["layout"] == {"aisles": [3], "removed": [], "wheelchair": []}
+    assert Movie.from_dict(data).layout.aisles == (3,)
+    assert "layout" not in Movie("Inception", 2, 6).to_dict()
+
+def test_movie_available_seats_by_category():
+    from src.movie_classes import Movie, Booking
+    from src.hall_layout import HallLayout
+    movie = Movie("Inception", 2, 5, layout=HallLayout(2, 5, wheelchair=["A1"], categories={"premium": ["B"]}))
+    movie.add_booking(Booking("GIC0001", "B", ["B2", "B3"]))
+    assert movie_available_seats(movie) == 8
+    assert movie_available_seats(movie, "premium") == 3
+    assert movie_available_seats(movie, "accessible") == 1
+    assert movie_available_seats(movie, "standard") == 4
+
+def test_showings_share_layout_but_not_occupancy():
+    from src.movie_classes import Movie, Booking
+    evening = Movie("Inception", 3, 8)
+    late = Movie("Inception", 3, 8)
+    assert evening.layout is late.layout
+    evening.add_booking(Booking("GIC0001", "B", ["A1", "A2"]))
+    assert movie_available_seats(evening) == 22
+    assert movie_available_seats(late) == 24
+    data = {"title": "Tenet", "row": 2, "seats_per_row": 6, "bookings": [], "layout": {"aisles": [3]}}
+    assert Movie.from_dict(data).layout is Movie.from_dict(data).layout
@@ -0,0 +1,106 @@
+"""
+test_occupancy.py
+-----------------
+Unit tests for the occupancy module, covering seat bitmask helpers and the OccupancyGrid.
+"""
+
+from src.occupancy import seat_position, popcount, mask_to_seat_nums, block_starts, dilate_row, dilate_masks, OccupancyGrid
+from src.movie_classes import Movie, Booking
+
+def test_seat_position():
+    assert seat_position("A1") == (0, 1)
+    assert seat_position("C12") == (2, 12)
+
+def test_popcount_and_mask_to_seat_nums():
+    assert popcount(0b1011) == 3
+    assert mask_to_seat_nums(0b1011) == [1, 2, 4]
+    assert mask_to_seat_nums(0) == []
+
+def test_block_starts():
+    free = 0b1110111  # seats 1-3 and 5-7 free
+    assert mask_to_seat_nums(block_starts(free, 1)) == [1, 2, 3, 5, 6, 7]
+    assert mask_to_seat_nums(block_starts(free, 2)) == [1, 2, 5, 6]
+    assert mask_to_seat_nums(block_starts(free, 3)) == [1, 5]
+    assert block_starts(free, 4) == 0
+
+def test_block_starts_matches_naive_scan():
+    free = 0b110111101111110111
+    for width in range(1, 10):
+        naive = [n for n in range(1, 19) if all(free >> (m - 1) & 1 for m in range(n, n + width))]
+        assert mask_to_seat_nums(block_starts(free, width)) == naive
+
+def test_dilate_row_clips_to_row():
+    full = 0b11111
+    assert dilate_row(0b00001, 1, full) == 0b00011
+    assert dilate_row(0b00100, 2, full) == 0b11111
+    assert dilate_row(0b10000, 0, full) == 0b10000
+
+def test_dilate_masks_rows():
+    full = 0b1111
+    masks = [0, 0b0100, 0, 0]
+    assert dilate_masks(masks, 1, 0, full) == [0, 0b1110, 0, 0]
+    assert dilate_masks(masks, 1, 1, full) == [0b1110, 0b1110, 0b1110, 0]
+
+def test_occupancy_grid_from_movie():
+    movie = Movie("Inception", 2, 4, bookings=[
+        Booking("GIC0001", "B", ["A1", "B4"]),
+        Booking("GIC0002", "R", ["A2"]),
+    ])
+    grid = OccupancyGrid.from_movie(movie)
+    assert grid.booked == [0b0001, 0b1000]
+    assert grid.reserved == [0b0010, 0]
+    assert grid.occupied_masks(include_reserved=True) == [0b0011, 0b1000]
+    grid.remove_seats("B", ["B4"])
+    assert grid.occupied_masks() == [0b0001, 0]
+
+def test_movie_occupancy_tracks_booking_changes():
+    movie = Movie("Inception", 2, 4)
+    movie.add_booking(Booking("GIC0001", "R", ["A1", "A2"]))
+    assert movie.occupancy.reserved == [0b0011, 0]
+    booking = movie.get_booking("GIC0001")
+    booking.seats = ["B3"]
+    assert movie.occupancy.reserved == [0, 0b0100]
+    booking.status = "B"
+    assert movie.occupancy.reserved == [0, 0]
+    assert movie.occupancy.booked == [0, 0b0100]
+    movie.add_booking(Booking("GIC0002", "B", ["A4"]))
+    assert movie.occupancy.booked == [0b1000, 0b0100]
+
+def test_movie_occupancy_rebuilds_after_direct_list_changes():
+    movie = Movie("Inception", 1, 4)
+    assert movie.occupancy.booked == [0]
+    movie.bookings.append(Booking("GIC0001", "B", ["A2"]))
+    assert movie.occupancy.booked == [0b0010]
+    movie.remove_booking("GIC0001")
+    assert movie.occupancy.booked == [0]
+
+def test_occupancy_grid_category_counters():
+    from src.hall_layout import HallLayout
+    layout = HallLayout(2, 4, categories={"premium": ["B"]})
+    movie = Movie("Inception", 2, 4, layout=layout)
+    movie.add_booking(Booking("GIC0001", "R", ["B1", "B2", "A1"]))
+    grid = movie.occupancy
+    assert grid.available() == 5
+    assert grid.available("premium") == 2
+    assert grid.available("standard") == 3
+    movie.get_booking("GIC0001").status = "B"
+    assert grid.available("premium") == 2
+    assert grid.free_masks("premium") == [0, 0b1100]
+    movie.get_booking("GIC0001").seats = ["A1"]
+    assert grid.available("premium") == 4
+    assert grid.available() == 7
+    assert grid.available("unknown") == 0
+
+def test_remove_booking_updates_index_in_place():
+    movie = Movie("Inception", 1, 4)
+    movie.add_booking(Booking("GIC0001", "B", ["A1"]))
+    movie.add_booking(Booking("GIC0002", "R", ["A3"]))
+    bookings = movie.bookings
+    grid = movie.occupancy
+    movie.remove_booking("GIC0001")
+    movie.remove_booking("GIC0404")
+    assert movie.bookings is bookings and len(bookings) == 1
+    assert movie.occupancy is grid
+    assert grid.booked == [0] and grid.available() == 3
+    assert movie.get_booking("GIC0001") is None
+    assert movie.get_booking("GIC0002").seats == ["A3"]
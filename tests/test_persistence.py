@@ -0,0 +1,147 @@
+"""
+test_persistence.py
+-------------------
+Unit tests for the persistence module, covering atomic writes, clean-up of interrupted writes and group commit.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import persistence
+from src.movie import save_movie, load_movie
+from src.movie_classes import Movie, Booking
+from src.persistence import atomic_write, remove_temp_files, GroupCommitWriter
+from src.snapshot import SnapshotError
+
+def test_atomic_write_replaces_contents(tmp_path):
+    path = str(tmp_path / "state" / "movie.json")
+    atomic_write(path, "first")
+    atomic_write(path, b"second")
+    with open(path, "rb") as f:
+        assert f.read() == b"second"
+    assert os.listdir(tmp_path / "state") == ["movie.json"]
+
+def test_atomic_write_failure_keeps_old_file(tmp_path):
+    path = str(tmp_path / "movie.json")
+    atomic_write(path, "old")
+    with patch("src.persistence.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            atomic_write(path, "new")
+    with open(path) as f:
+        assert f.read() == "old"
+    assert os.listdir(tmp_path) == ["movie.json"]
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+def test_remove_temp_files_only_removes_interrupted_writes(tmp_path):
+    (tmp_path / f".movie.json.{dead_pid()}.0.tmp").write_text("partial")
+    (tmp_path / "movie.json").write_text("{}")
+    (tmp_path / "2024-01-01.1.log.gz.tmp").write_text("log")
+    assert remove_temp_files(str(tmp_path)) == 1
+    assert sorted(os.listdir(tmp_path)) == ["2024-01-01.1.log.gz.tmp", "movie.json"]
+
+def test_remove_temp_files_keeps_live_writers_until_stale(tmp_path):
+    live = tmp_path / f".movie.json.{os.getpid()}.0.tmp"
+    live.write_text("in flight")
+    (tmp_path / ".movie.json.tmp").write_text("no pid")
+    assert remove_temp_files(str(tmp_path)) == 0
+    assert remove_temp_files(str(tmp_path), now=time.time() + persistence.STALE_TEMP_AGE + 1) == 2
+    assert os.listdir(tmp_path) == []
+
+def test_group_commit_coalesces_saves_of_a_path(tmp_path):
+    path = str(tmp_path / "movie.json")
+    writer = GroupCommitWriter(delay=10)
+    try:
+        with patch("src.persistence.atomic_write", wraps=atomic_write) as write:
+            for i in range(20):
+                writer.submit(path, str(i))
+            writer.flush()
+        assert write.call_count == 1
+        with open(path) as f:
+            assert f.read() == "19"
+    finally:
+        writer.close()
+
+def test_group_commit_wait_returns_once_durable(tmp_path):
+    path = str(tmp_path / "movie.json")
+    writer = GroupCommitWriter(delay=0.001)
+    try:
+        writer.submit(path, "done", wait=True)
+        with open(path) as f:
+            assert f.read() == "done"
+    finally:
+        writer.close()
+
+def test_group_commit_shares_batches_between_threads(tmp_path):
+    writer = GroupCommitWriter(delay=0.05)
+    batches = []
+    original = writer._commit
+    writer._commit = lambda batch: batches.append(len(batch)) or original(batch)
+    try:
+        threads = [
+            threading.Thread(target=writer.submit, args=(str(tmp_path / f"{i}.json"), "x", True)) for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(batches) == 8
+        assert len(batches) < 8
+        assert len(os.listdir(tmp_path)) == 8
+    finally:
+        writer.close()
+
+def test_group_commit_wait_raises_write_error(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    writer = GroupCommitWriter(delay=0.001)
+    try:
+        with pytest.raises(OSError):
+            writer.submit(str(blocker / "movie.json"), "x", wait=True)
+    finally:
+        writer.close()
+
+def test_close_flushes_and_rejects_new_writes(tmp_path):
+    path = str(tmp_path / "movie.json")
+    writer = GroupCommitWriter(delay=10)
+    writer.submit(path, "last")
+    writer.close()
+    with open(path) as f:
+        assert f.read() == "last"
+    with pytest.raises(RuntimeError):
+        writer.submit(path, "late")
+
+def test_save_and_load_movie_with_group_commit(tmp_path):
+    path = str(tmp_path / "movie.gics")
+    movie = Movie("Inception", 8, 10)
+    persistence.enable_group_commit(delay=10)
+    try:
+        save_movie(movie, path)
+        movie.add_booking(Booking("GIC0001", "B", ["A1", "A2"]))
+        save_movie(movie, path)
+        assert not os.path.exists(path)  # still queued
+        assert load_movie(path).to_dict() == movie.to_dict()
+    finally:
+        persistence.disable_group_commit()
+    persistence.write(path, b"sync")
+    with open(path, "rb") as f:
+        assert f.read() == b"sync"
+
+def test_load_movie_rejects_torn_snapshot(tmp_path):
+    path = str(tmp_path / "movie.gics")
+    save_movie(Movie("Inception", 8, 10), path)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-3])
+    with pytest.raises(SnapshotError):
+        load_movie(path)
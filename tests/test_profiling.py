@@ -0,0 +1,69 @@
+"""
+test_profiling.py
+-----------------
+Unit tests for the profiling module and the profiling mode of the application.
+"""
+
+import cProfile
+import pstats
+
+from src import profiling
+from src.main import main, parse_args
+from src.profiling import SessionProfiler, collapsed_stacks, frame_label
+
+def _leaf(n):
+    return sum(range(n))
+
+def _branch():
+    return _leaf(20000) + _leaf(20000)
+
+def test_frame_label():
+    assert frame_label(("/x/src/booking.py", 42, "default_seating")) == "booking.py:default_seating:42"
+    assert frame_label(("~", 0, "<built-in method builtins.sum>")) == "built-in method builtins.sum"
+
+def test_collapsed_stacks_follow_call_paths():
+    profile = cProfile.Profile()
+    profile.enable()
+    _branch()
+    profile.disable()
+    lines = collapsed_stacks(pstats.Stats(profile).stats)
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    leaf_paths = [stack for stack in stacks if stack.endswith("builtins.sum")]
+    assert leaf_paths and all("_branch" in stack and "_leaf" in stack for stack in leaf_paths)
+    assert all(value > 0 for value in stacks.values())
+
+def test_session_profiler_writes_reports(tmp_path):
+    with SessionProfiler(out_dir=str(tmp_path), memory=True, top=5) as profiler:
+        data = [list(range(100)) for _ in range(50)]
+        _branch()
+    assert set(profiler.paths) == {"pstats", "collapsed", "summary", "allocations"}
+    assert "_leaf" in open(profiler.paths["collapsed"]).read()
+    assert "by cumulative time" in open(profiler.paths["summary"]).read()
+    assert "test_profiling.py" in open(profiler.paths["allocations"]).read()
+    pstats.Stats(profiler.paths["pstats"])  # loads back
+    assert data
+
+def test_parse_args_flags_and_environment(monkeypatch):
+    monkeypatch.delenv("GIC_PROFILE", raising=False)
+    monkeypatch.delenv("GIC_PROFILE_MEMORY", raising=False)
+    assert not parse_args(None).profile
+    options = parse_args(["--profile-memory", "--replay", "session.txt"])
+    assert options.profile and options.profile_memory and options.replay == "session.txt"
+    monkeypatch.setenv("GIC_PROFILE", "1")
+    assert parse_args([]).profile
+
+def test_profiled_replay_session(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(profiling, "LOG_DIR", str(tmp_path))
+    # Keep the saved state, the temp file sweep and the metrics dump out of the real logs/ directory
+    monkeypatch.setattr("src.movie.DEFAULT_MOVIE_FILE", str(tmp_path / "movie.json"))
+    monkeypatch.setattr("src.metrics.DEFAULT_METRICS_FILE", str(tmp_path / "metrics.json"))
+    replay = tmp_path / "session.txt"
+    replay.write_text("Inception 4 6\n1\n2\n\n2\nGIC0001\n\n")  # inputs run out before exit
+    main(["--profile", "--replay", str(replay)])
+    out = capsys.readouterr().out
+    assert "Booking ID: GIC0001 confirmed." in out
+    collapsed = list(tmp_path.glob("profile-*.collapsed"))
+    assert len(collapsed) == 1
+    assert "booking.py:default_seating" in collapsed[0].read_text()
+    assert not list(tmp_path.glob("*-allocations.txt"))
+    assert (tmp_path / "movie.json").exists()
@@ -0,0 +1,112 @@
+"""
+test_shared_occupancy.py
+------------------------
+Unit tests for the shared_occupancy module, covering publishing, counts, conflicting takes, confirmation,
+release, read-only attachments and booking from several worker processes.
+"""
+
+import multiprocessing
+
+import pytest
+
+from src.hall_layout import HallLayout
+from src.movie_classes import Movie, Booking
+from src.shared_occupancy import SharedOccupancyStore
+
+@pytest.fixture
+def store():
+    store = SharedOccupancyStore.create(slots=2, max_rows=8, max_seats_per_row=10)
+    yield store
+    store.close()
+    store.unlink()
+
+def make_movie():
+    movie = Movie("Inception", 8, 10)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2"]))
+    movie.add_booking(Booking("GIC0002", "R", ["H10"]))
+    return movie
+
+def test_publish_round_trips_occupancy(store):
+    movie = make_movie()
+    version = store.publish(0, movie)
+    assert version == store.version(0) and version % 2 == 0
+    assert store.read_masks(0) == (version, movie.occupancy.booked, movie.occupancy.reserved)
+    assert store.counts(0) == {"version": version, "free": 77, "reserved": 1, "booked": 2}
+    assert store.is_taken(0, "A2") and store.is_taken(0, "H10") and not store.is_taken(0, "A3")
+    assert store.counts(1)["free"] == 0  # untouched slot
+
+def test_publish_rejects_hall_larger_than_slots(store):
+    with pytest.raises(ValueError):
+        store.publish(0, Movie("Big", 9, 10))
+
+def test_try_take_is_all_or_nothing(store):
+    store.publish(0, make_movie())
+    before = store.version(0)
+    assert store.try_take(0, ["A3", "A2"]) is None
+    assert store.version(0) == before
+    assert not store.is_taken(0, "A3")
+    version = store.try_take(0, ["A3", "A4", "A4"], status="R")
+    assert version > before
+    assert store.counts(0) == {"version": version, "free": 75, "reserved": 3, "booked": 2}
+
+def test_confirm_and_release(store):
+    store.publish(0, make_movie())
+    store.confirm(0, ["H10", "A5"])
+    counts = store.counts(0)
+    assert (counts["reserved"], counts["booked"]) == (0, 3)
+    store.release(0, ["A1", "H10", "A5"])
+    counts = store.counts(0)
+    assert (counts["free"], counts["reserved"], counts["booked"]) == (79, 0, 1)
+    _, booked, reserved = store.read_masks(0)
+    assert booked[0] == 0b10 and not any(reserved)
+
+def test_invalid_seat_and_slot_raise(store):
+    store.publish(0, make_movie())
+    with pytest.raises(ValueError):
+        store.try_take(0, ["I1"])
+    with pytest.raises(IndexError):
+        store.counts(2)
+
+def test_removed_layout_seats_cannot_be_taken(store):
+    layout = HallLayout.shared(8, 10, removed=["A5", "C1"])
+    store.publish(0, Movie("Layout", 8, 10, layout=layout))
+    before = store.version(0)
+    for call in (lambda: store.try_take(0, ["A4", "A5"]), lambda: store.confirm(0, ["C1"]),
+                 lambda: store.release(0, ["C1"]), lambda: store.is_taken(0, "A5")):
+        with pytest.raises(ValueError):
+            call()
+    assert store.version(0) == before
+    assert not store.is_taken(0, "A4")
+    assert store.counts(0)["free"] == 78
+    store.publish(0, make_movie())  # the full hall replaces the layout's seat bitmap
+    assert store.try_take(0, ["A5", "C1"]) is not None
+
+def test_attach_without_lock_is_read_only(store):
+    store.publish(0, make_movie())
+    reader = SharedOccupancyStore.attach(store.name)
+    try:
+        assert not reader.writable
+        assert reader.counts(0) == store.counts(0)
+        with pytest.raises(RuntimeError):
+            reader.try_take(0, ["B1"])
+    finally:
+        reader.close()
+
+def take_seats(store, worker, results):
+    """Worker process: try to take every seat of rows A-D, one at a time."""
+    taken = [
+        f"{row}{n}" for row in "ABCD" for n in range(1, 11) if store.try_take(0, [f"{row}{n}"]) is not None
+    ]
+    results.put((worker, taken))
+
+def test_workers_never_double_book(store):
+    store.publish(0, Movie("Shared", 8, 10))
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=take_seats, args=(store, i, results)) for i in range(3)]
+    for w in workers:
+        w.start()
+    taken = [seat for _ in workers for seat in results.get(timeout=30)[1]]
+    for w in workers:
+        w.join(timeout=30)
+    assert sorted(taken) == sorted(f"{row}{n}" for row in "ABCD" for n in range(1, 11))
+    assert store.counts(0)["booked"] == 40
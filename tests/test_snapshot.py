@@ -0,0 +1,132 @@
+"""
+test_snapshot.py
+----------------
+Unit tests for the snapshot module, covering round trips, occupancy bitmaps, the wide index flag, checksums and
+rejection of damaged or older snapshots.
+"""
+
+import json
+import struct
+
+import pytest
+
+from src.hall_layout import HallLayout
+from src.movie import save_movie, load_movie
+from src.movie_classes import Movie, Booking
+from src.snapshot import (
+    encode_snapshot, decode_snapshot, decode_snapshot_dict, read_occupancy, SnapshotError, HEADER, MAGIC,
+    FLAG_WIDE_INDEX, CHECKSUM, verify_snapshot,
+)
+
+def make_movie():
+    movie = Movie("Inception", 8, 10)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2", "H10"]))
+    movie.add_booking(Booking("GIC0002", "R", ["C5"]))
+    movie.add_booking(Booking("GIC0003", "C", ["D4", "D5"]))
+    return movie
+
+def test_round_trip_matches_to_dict():
+    movie = make_movie()
+    decoded = decode_snapshot(encode_snapshot(movie))
+    assert isinstance(decoded, Movie)
+    assert decoded.to_dict() == movie.to_dict()
+    assert decoded.occupancy.booked == movie.occupancy.booked
+
+def test_movie_and_dict_encode_identically():
+    movie = make_movie()
+    assert encode_snapshot(movie) == encode_snapshot(movie.to_dict())
+    assert decode_snapshot_dict(encode_snapshot(movie.to_dict())) == movie.to_dict()
+
+def test_snapshot_smaller_than_json():
+    movie = Movie("Full", 26, 50)
+    labels = [f"{chr(ord('A') + r)}{n}" for r in range(26) for n in range(1, 51)]
+    for i in range(0, len(labels), 4):
+        movie.add_booking(Booking(f"GIC{i:04d}", "B", labels[i:i + 4]))
+    assert len(encode_snapshot(movie)) < len(json.dumps(movie.to_dict())) / 2
+
+def test_round_trip_layout_hall():
+    layout = HallLayout.shared(3, 8, aisles=[4], removed=["C1"])
+    movie = Movie("Layout", 3, 8, layout=layout)
+    movie.add_booking(Booking("GIC0001", "B", ["A4", "A5"]))
+    decoded = decode_snapshot(encode_snapshot(movie))
+    assert decoded.layout is layout
+    assert decoded.to_dict() == movie.to_dict()
+
+def test_round_trip_non_ascii_ids_and_title():
+    movie = Movie("Amélie", 2, 5)
+    movie.add_booking(Booking("GIC0001", "B", ["A1"]))
+    movie.add_booking(Booking("GICé02", "R", ["B2", "B3"]))
+    assert decode_snapshot(encode_snapshot(movie)).to_dict() == movie.to_dict()
+
+def test_wide_index_flag_for_large_halls():
+    movie = Movie("Arena", 26, 3000)
+    movie.add_booking(Booking("GIC0001", "B", ["Z3000", "A1"]))
+    data = encode_snapshot(movie)
+    assert HEADER.unpack_from(data)[2] & FLAG_WIDE_INDEX
+    assert decode_snapshot_dict(data)["bookings"][0]["seats"] == ["Z3000", "A1"]
+
+def test_read_occupancy_without_bookings():
+    movie = make_movie()
+    rows, seats_per_row, booked, reserved = read_occupancy(encode_snapshot(movie))
+    assert (rows, seats_per_row) == (8, 10)
+    assert booked == movie.occupancy.booked
+    assert reserved == movie.occupancy.reserved
+    assert booked[0] == 0b11 and booked[7] == 1 << 9 and reserved[2] == 1 << 4
+
+def test_empty_movie_round_trip():
+    movie = Movie("Empty", 1, 1)
+    assert decode_snapshot(encode_snapshot(movie)).to_dict() == movie.to_dict()
+
+def test_invalid_seat_raises():
+    data = make_movie().to_dict()
+    data["bookings"][0]["seats"].append("K1")
+    with pytest.raises(ValueError):
+        encode_snapshot(data)
+
+def test_truncated_snapshot_rejected():
+    data = encode_snapshot(make_movie())
+    for cut in (3, HEADER.size + 2, len(data) - 1):
+        with pytest.raises(SnapshotError):
+            decode_snapshot(data[:cut])
+
+def test_bad_magic_and_version_rejected():
+    data = encode_snapshot(make_movie())
+    with pytest.raises(SnapshotError):
+        decode_snapshot(b"JSON" + data[4:])
+    with pytest.raises(SnapshotError):
+        decode_snapshot(MAGIC + struct.pack("<H", 99) + data[6:])
+
+def test_save_and_load_snapshot_file(tmp_path):
+    movie = make_movie()
+    path = str(tmp_path / "movie.gics")
+    save_movie(movie, path)
+    with open(path, "rb") as f:
+        assert f.read(4) == MAGIC
+    assert load_movie(path).to_dict() == movie.to_dict()
+
+def test_save_and_load_json_file_unchanged(tmp_path):
+    movie = make_movie()
+    path = str(tmp_path / "movie.json")
+    save_movie(movie, path)
+    with open(path) as f:
+        assert json.load(f) == movie.to_dict()
+    assert load_movie(path).to_dict() == movie.to_dict()
+
+def test_checksum_detects_torn_and_corrupted_snapshots():
+    data = encode_snapshot(make_movie())
+    assert verify_snapshot(data)
+    corrupted = bytearray(data)
+    corrupted[HEADER.size + 3] ^= 0xFF
+    for bad in (bytes(corrupted), data[:-1], data[:len(data) // 2] + bytes(len(data) - len(data) // 2)):
+        assert not verify_snapshot(bad)
+        with pytest.raises(SnapshotError):
+            decode_snapshot(bad)
+    with pytest.raises(SnapshotError):
+        read_occupancy(bytes(corrupted))
+
+def test_version_1_snapshot_without_checksum_still_reads():
+    movie = make_movie()
+    data = encode_snapshot(movie)
+    legacy = MAGIC + struct.pack("<H", 1) + data[6:-CHECKSUM.size]
+    assert verify_snapshot(legacy)
+    assert decode_snapshot(legacy).to_dict() == movie.to_dict()
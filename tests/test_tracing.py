@@ -0,0 +1,77 @@
+"""
+test_tracing.py
+---------------
+Unit tests for the tracing module, covering nested spans, JSON Lines export and the latency breakdown.
+"""
+
+import pytest
+
+from src import tracing
+from src.movie_classes import Movie
+
+@pytest.fixture
+def tracer(tmp_path):
+    active = tracing.enable(str(tmp_path / "traces.jsonl"))
+    yield active
+    tracing.disable()
+
+def test_spans_nest_and_export_per_trace(tracer):
+    with tracing.span("booking", tickets=2) as root:
+        with tracing.span("step") as child:
+            assert tracer.current() is child
+        assert tracing.load_spans(tracer.path) == []  # written when the root ends
+    spans = tracing.load_spans(tracer.path)
+    assert [s["name"] for s in spans] == ["step", "booking"]
+    assert spans[0]["trace_id"] == spans[1]["trace_id"] == root.trace_id
+    assert spans[0]["parent_id"] == root.span_id and spans[1]["parent_id"] is None
+    assert spans[1]["attrs"] == {"tickets": 2}
+    assert spans[1]["duration_ms"] >= spans[0]["duration_ms"]
+    with tracing.span("booking"):
+        pass
+    assert len({s["trace_id"] for s in tracing.load_spans(tracer.path)}) == 2
+
+def test_traced_decorator_is_inert_when_disabled(tmp_path):
+    tracing.disable()
+
+    @tracing.traced("op")
+    def op():
+        return 7
+
+    assert op() == 7
+    with tracing.span("ignored") as span:
+        assert span is None
+
+def test_span_recorded_when_function_raises(tracer):
+    @tracing.traced("op")
+    def op():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        op()
+    assert [s["name"] for s in tracing.load_spans(tracer.path)] == ["op"]
+
+def test_booking_flow_spans_and_summary(tracer, monkeypatch, tmp_path):
+    from src.main import booking_tickets_loop
+    monkeypatch.setattr("src.movie.DEFAULT_MOVIE_FILE", str(tmp_path / "movie.json"))
+    movie = Movie("Inception", 3, 5)
+    inputs = iter(["2", ""])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    booking_tickets_loop(movie, mode="standard")
+    spans = tracing.load_spans(tracer.path)
+    assert len({s["trace_id"] for s in spans}) == 1
+    names = {s["name"] for s in spans}
+    assert {"main.booking_tickets_loop", "validation.ticket_num_validation", "booking.book_ticket",
+            "booking.default_seating", "movie.save_movie", "movie.movie_display"} <= names
+    summary = tracing.summarise(spans)
+    assert summary["main.booking_tickets_loop"]["count"] == 1
+    assert summary["movie.save_movie"]["per_trace"] >= 2  # saved before and after confirmation
+    root = summary["main.booking_tickets_loop"]
+    assert root["self_ms"] <= root["total_ms"]
+    assert "movie.save_movie" in tracing.format_summary(summary)
+    assert (tmp_path / "movie.json").exists()
+
+def test_load_spans_skips_torn_line(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    path.write_text('{"name": "a"}\n{"name": ')
+    assert tracing.load_spans(str(path)) == [{"name": "a"}]
+    assert tracing.load_spans(str(tmp_path / "missing.jsonl")) == []
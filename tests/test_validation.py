@@ -135,4 +135,57 @@ def test_is_valid_booking_false_for_random_inputs():
         ]
     )
     for invalid in [None, "", "booking01", "GIC", "0001", 123, [], {}, "GIC9999"]:
-        assert is_valid_booking(movie, invalid) is False
\ No newline at end of file
+        assert is_valid_booking(movie, invalid) is False
+def test_parse_seat_selection():
+    from src.validation import parse_seat_selection
+    assert parse_seat_selection("A1-A4,C7,C8") == ["A1", "A2", "A3", "A4", "C7", "C8"]
+    assert parse_seat_selection(" b2 - 4 , a9 ") == ["B2", "B3", "B4", "A9"]
+    assert parse_seat_selection("D5") == ["D5"]
+
+def test_parse_seat_selection_invalid():
+    from src.validation import parse_seat_selection
+    assert parse_seat_selection("") is None
+    assert parse_seat_selection("A1-B4") is None  # ranges stay in one row
+    assert parse_seat_selection("A4-A1") is None
+    assert parse_seat_selection("A1,,A2") is None
+    assert parse_seat_selection("A1,") is None
+    assert parse_seat_selection("A0") is None
+    assert parse_seat_selection("A1-A3,A2") is None  # repeated seat
+    assert parse_seat_selection("*") is None
+
+def test_parse_seat_selection_bounds_ranges_before_expanding():
+    import time
+    from src.validation import parse_seat_selection
+    start = time.perf_counter()
+    assert parse_seat_selection("A1-A20000000") is None  # too many digits
+    assert parse_seat_selection("A1-A9999") is None
+    assert time.perf_counter() - start < 0.1
+    assert parse_seat_selection("A1-A10", seats_per_row=8) is None
+    assert parse_seat_selection("A1-A8", seats_per_row=8) == [f"A{n}" for n in range(1, 9)]
+    assert parse_seat_selection("A1-A3,B1-B3", max_seats=5) is None
+    assert parse_seat_selection("A1-A3,B1-B2", max_seats=5) == ["A1", "A2", "A3", "B1", "B2"]
+
+def test_is_valid_seat_selection():
+    from src.validation import is_valid_seat
+    from src.movie import create_movie
+    from src.movie_classes import Booking
+    movie = create_movie("Inception 3 10")
+    movie.bookings.append(Booking("GIC0001", "B", ["B5"]))
+    movie.bookings.append(Booking("GIC0002", "R", ["A2"]))
+    assert is_valid_seat(movie, "a1-a4,c7") == "selection"
+    assert is_valid_seat(movie, "B4-B6") == "invalid"  # B5 is booked
+    assert is_valid_seat(movie, "C9-C11") == "invalid"  # C11 is outside the hall
+    assert is_valid_seat(movie, "D1,A1") == "invalid"
+
+def test_is_valid_seat_uses_live_occupancy():
+    from src.validation import is_valid_seat
+    from src.movie import create_movie
+    from src.movie_classes import Booking
+    movie = create_movie("Inception 2 5")
+    movie.add_booking(Booking("GIC0001", "R", ["A3"]))
+    assert is_valid_seat(movie, "A3") == "valid"
+    movie.get_booking("GIC0001").status = "B"
+    assert is_valid_seat(movie, "A3") == "invalid"
+    movie.get_booking("GIC0001").seats = ["B1"]
+    assert is_valid_seat(movie, "A3") == "valid"
+    assert is_valid_seat(movie, "B1") == "invalid"
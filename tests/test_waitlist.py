@@ -0,0 +1,94 @@
+"""
+test_waitlist.py
+----------------
+Unit tests for the waitlist module, covering bucketed FIFO order, preferences and matching on released seats.
+"""
+
+from unittest.mock import patch
+
+from src.booking import cancel_booking
+from src.hall_layout import HallLayout
+from src.journal import BookingJournal
+from src.movie_classes import Movie, Booking
+from src.waitlist import Waitlist
+
+def full_movie():
+    movie = Movie("Inception", 2, 6)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2", "A3", "A4", "A5", "A6"]))
+    movie.add_booking(Booking("GIC0002", "B", ["B1", "B2", "B3"]))
+    movie.add_booking(Booking("GIC0003", "B", ["B4", "B5", "B6"]))
+    return movie
+
+def test_largest_fitting_party_is_seated_first():
+    movie = full_movie()
+    waitlist = Waitlist()
+    pair = waitlist.add(2)
+    five = waitlist.add(5)
+    trio = waitlist.add(3)
+    movie.get_booking("GIC0001").status = "C"
+    seated = waitlist.match_released(movie, ["A1", "A2", "A3", "A4", "A5", "A6"])
+    assert [(r.request_id, bid, seats) for r, bid, seats in seated] == [
+        (five.request_id, "GIC0004", ["A1", "A2", "A3", "A4", "A5"]),
+    ]
+    assert len(waitlist) == 2
+    movie.get_booking("GIC0003").status = "C"
+    seated = waitlist.match_released(movie, ["B4", "B5", "B6"])
+    assert [r.request_id for r, _, _ in seated] == [trio.request_id]
+    assert seated[0][2] == ["B4", "B5", "B6"]
+    assert waitlist._head(2) is pair
+
+def test_fifo_within_bucket_and_withdraw():
+    movie = full_movie()
+    waitlist = Waitlist()
+    first = waitlist.add(3)
+    second = waitlist.add(3)
+    waitlist.withdraw(first.request_id)
+    waitlist.withdraw(first.request_id)
+    waitlist.withdraw("W9999")
+    assert len(waitlist) == 1
+    movie.get_booking("GIC0002").status = "C"
+    seated = waitlist.match_released(movie, ["B1", "B2", "B3"])
+    assert [r.request_id for r, _, _ in seated] == [second.request_id]
+    assert len(waitlist) == 0
+
+def test_preferences_restrict_rows_and_category():
+    layout = HallLayout(2, 4, categories={"premium": ["B"]})
+    movie = Movie("Inception", 2, 4, layout=layout)
+    movie.add_booking(Booking("GIC0001", "B", ["A1", "A2", "B1", "B2"]))
+    waitlist = Waitlist()
+    back_rows = waitlist.add(2, {"first_row": "B"})
+    premium = waitlist.add(1, {"category": "premium"})
+    movie.get_booking("GIC0001").seats = ["B1", "B2"]
+    assert waitlist.match_released(movie, ["A1", "A2"]) == []
+    movie.get_booking("GIC0001").seats = []
+    seated = waitlist.match_released(movie, ["B1", "B2"])
+    assert [(r.request_id, s) for r, _, s in seated] == [(back_rows.request_id, ["B2", "B3"]), (premium.request_id, ["B1"])]
+    assert len(waitlist) == 0
+
+def test_rejected_head_does_not_block_bucket():
+    movie = full_movie()
+    waitlist = Waitlist()
+    row_b_only = waitlist.add(2, {"first_row": "B"})
+    withdrawn = waitlist.add(2)
+    row_b_too = waitlist.add(2, {"first_row": "B"})
+    anywhere = waitlist.add(2)
+    waitlist.withdraw(withdrawn.request_id)
+    movie.get_booking("GIC0001").status = "C"
+    # Passed-over heads are popped and pushed back, never found by sorting or re-heapifying the bucket
+    with patch("src.waitlist.heapq.heapify", side_effect=AssertionError):
+        seated = waitlist.match_released(movie, ["A1", "A2", "A3", "A4", "A5", "A6"])
+    assert [r.request_id for r, _, _ in seated] == [anywhere.request_id]
+    assert len(waitlist) == 2
+    assert [entry[1] for entry in sorted(waitlist.buckets[2])] == [row_b_only, row_b_too]
+    assert waitlist._head(2) is row_b_only
+
+def test_cancel_booking_offers_seats_to_waitlist(tmp_path):
+    movie = full_movie()
+    journal = BookingJournal(str(tmp_path / "journal.jsonl"))
+    waitlist = Waitlist()
+    request = waitlist.add(2)
+    with patch("src.booking.save_movie"):
+        cancel_booking(movie, "GIC0002", journal, waitlist)
+    assert movie.get_booking("GIC0004").seats == ["B2", "B3"]
+    assert [e["event"] for e in journal.replay()] == ["cancel", "waitlist"]
+    assert journal.replay("waitlist")[0]["request_id"] == request.request_id